@@ -0,0 +1,89 @@
+"""Hammer the hospital.frontdesk operations from many threads.
+
+Every thread books appointments with a few shared doctors, then takes,
+frees and bills a bed for each of its patients. Afterwards the run checks that no slot or
+bed was handed out twice, then reports throughput with the default lock
+stripes and with everything behind a single stripe.
+
+Run from the repository root:  python benchmarks/bench_contention.py [threads] [ops]
+"""
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hospital import frontdesk
+from hospital.locks import StripedLocks
+from hospital.output import SilentSink, set_sink
+
+DOCTORS = 4
+DAY = datetime(2030, 1, 1, 8, 0)
+
+
+def load():
+    frontdesk.reset_state()
+    return vars(frontdesk)
+
+
+def worker(g, thread_id, ops, start):
+    rng = random.Random(thread_id)
+    slots = [DAY + timedelta(minutes=30 * i) for i in range(ops)]
+    wards = list(g["rooms"])
+    start.wait()
+    for i in range(ops):
+        patient_id = 1_000_000 + thread_id * ops + i
+        g["patient"][patient_id] = g["Patient"](name=f"Patient {patient_id}", insurance_info={})
+        doctor_id = 900 + rng.randrange(DOCTORS)
+        when = rng.choice(slots).strftime("%d-%m-%Y %H:%M")
+        g["book_if_free"](patient_id, doctor_id, when, "Checkup")
+        if g["assign_room"](patient_id, rng.choice(wards), DAY, 2) is not None:
+            g["manage_discharge_process"](patient_id, DAY, DAY + timedelta(days=1), "Rest")
+            g["process_billing"](patient_id, {"Consultation": 500}, 80)
+
+
+def check(g):
+    for doctor_id, index in g["appointment_index"].items():
+        assert len(index) == len(g["appointment"][doctor_id]), f"doctor {doctor_id}: lost or doubled booking"
+        for end, start in zip(index.ends, index.starts[1:]):
+            assert end <= start, f"doctor {doctor_id}: overlapping appointments"
+    beds = g["beds"]
+    for ward in beds.wards():
+        occupied = sum(1 for bed in beds._occupant if bed.startswith(ward + "/"))
+        assert occupied + beds.free_count(ward) == beds.capacity(ward), f"{ward}: bed counts do not add up"
+
+
+def run(threads, ops, stripes):
+    g = load()
+    set_sink(SilentSink())
+    g["locks"] = StripedLocks(stripes)
+    for doctor in range(DOCTORS):
+        g["medical_staffs"][900 + doctor] = g["Staff"](name=f"Dr. {doctor}", specialization="General")
+    start = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(g, t, ops, start)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    check(g)
+    booked = sum(len(index) for index in g["appointment_index"].values())
+    return threads * ops / elapsed, booked
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    for stripes in (64, 1):
+        rate, booked = run(threads, ops, stripes)
+        print(f"{threads} threads, {stripes:>2} stripes: {rate:10.0f} patients/s, {booked} appointments booked, checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare dict entities with the slotted records in hospital/records.py.
+
+Run from the repository root:  python benchmarks/bench_records.py [count]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hospital.records import Bill, Patient
+
+
+def make_dict_patient(i):
+    return {"name": f"Patient {i}", "personal_info": {"age": i % 90},
+            "medical_history": "None", "insurance_info": {"company": "Star Health"}}
+
+
+def make_record_patient(i):
+    return Patient(name=f"Patient {i}", personal_info={"age": i % 90},
+                   medical_history="None", insurance_info={"company": "Star Health"})
+
+
+def make_dict_bill(i):
+    return {"service_list": {"Room": 1500, "Doctor": 2000}, "insurance_coverage": 80}
+
+
+def make_record_bill(i):
+    return Bill(services={"Room": 1500, "Doctor": 2000}, insurance_coverage=80)
+
+
+def measure_memory(factory, count):
+    tracemalloc.start()
+    items = [factory(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / count
+
+
+def main(count=100_000):
+    print(f"{'entity':<10}{'dict B/obj':>12}{'record B/obj':>14}")
+    for label, as_dict, as_record in (("patient", make_dict_patient, make_record_patient),
+                                      ("bill", make_dict_bill, make_record_bill)):
+        print(f"{label:<10}{measure_memory(as_dict, count):>12.0f}{measure_memory(as_record, count):>14.0f}")
+
+    dict_bills = [make_dict_bill(i) for i in range(count)]
+    record_bills = [make_record_bill(i) for i in range(count)]
+    by_key = timeit.timeit(lambda: sum(b["insurance_coverage"] for b in dict_bills), number=10)
+    by_attr = timeit.timeit(lambda: sum(b.insurance_coverage for b in record_bills), number=10)
+    by_accessor = timeit.timeit(lambda: sum(b["insurance_coverage"] for b in record_bills), number=10)
+    print(f"\nbilling field access over {count} bills (10 passes)")
+    print(f"dict key:          {by_key:.3f}s")
+    print(f"record attribute:  {by_attr:.3f}s")
+    print(f"record dict-style: {by_accessor:.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,49 @@
+"""Drive hospital.core across 1, 2 and 4 shard processes.
+
+Each run registers, admits, bills and reports on the same set of patients,
+sending every step as one batch that the shards work through in parallel,
+and prints operations per second. Throughput only grows with the shard count
+when there are at least that many CPU cores.
+
+Run from the repository root:  python benchmarks/bench_sharding.py [patients]
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hospital.output import SilentSink, set_sink
+from hospital.shard import ShardedHospital
+
+WARD = "general room"
+
+
+def run(shards, patients):
+    ids = [f"P{n:06d}" for n in range(patients)]
+    with ShardedHospital(shards) as hospital:
+        hospital.add_room(WARD, patients)
+        began = time.perf_counter()
+        hospital.call_many("register_patient", [
+            (pid, {"name": f"Patient {pid}", "age": 40}, ["none"], {"provider": "HealthCare Inc", "policy_number": pid})
+            for pid in ids])
+        hospital.call_many("assign_room", [(pid, WARD, "2030-01-01", 3) for pid in ids])
+        hospital.call_many("process_billing", [(pid, [{"name": "Consultation", "cost": 150}], 0.8) for pid in ids])
+        hospital.call_many("generate_patient_report", [(pid, "dashboard") for pid in ids])
+        hospital.write_ward_reports(WARD, io.StringIO(), format="csv")
+        elapsed = time.perf_counter() - began
+    return 4 * patients / elapsed
+
+
+def main():
+    patients = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    set_sink(SilentSink())
+    print(f"{os.cpu_count()} CPUs, {patients} patients")
+    for shards in (1, 2, 4):
+        print(f"{shards} shard(s): {run(shards, patients):10.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
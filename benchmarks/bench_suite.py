@@ -0,0 +1,244 @@
+"""Throughput and p50/p99 latency of the hospital.core and hospital.frontdesk operations.
+
+For each size and module the stores are emptied and filled from a seeded
+Workload: wards, tariffs and staff first, then every timed operation runs
+once per record (efficiency queries run a fixed number of times). The
+front-desk run gets the same records in its own argument shapes, with the
+beds each admission needs added to its standard wards. Results go to a
+JSON file; pass an earlier one with --compare to see what changed.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py [--sizes 1000,10000,100000] [--seed 0]
+                                     [--out bench_results.json] [--compare old.json] [--metrics]
+Sizes up to 1e7 work but need several GB of memory and a long wait.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from array import array
+from datetime import date, datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hospital import core as hospital
+from hospital import frontdesk
+from hospital.dates import DATE_FORMAT
+from hospital.output import SilentSink, set_sink
+from workload import Workload
+
+set_sink(SilentSink())
+
+EFFICIENCY_QUERIES = 1000
+FRONTDESK_METRICS = ("bed_occupancy_rate", "average_length_of_stay", "patient_throughput")
+MEDICINES = 50  # the workload prescribes "Medicine 0" to "Medicine 49"
+FRONTDESK_REPORTS = {"blood_test": "Blood Test", "xray": "X-Ray", "ecg": "ECG"}
+
+
+def timed(function, calls):
+    """Call function(*args) for every args in calls; return throughput and latency figures."""
+    clock = time.perf_counter_ns
+    latencies = array("q")
+    began = clock()
+    for args in calls:
+        start = clock()
+        function(*args)
+        latencies.append(clock() - start)
+    elapsed = (clock() - began) / 1e9
+    ordered = sorted(latencies)
+    count = len(ordered)
+    if not count:
+        return {"calls": 0}
+    return {
+        "calls": count,
+        "seconds": round(elapsed, 6),
+        "ops_per_sec": round(count / elapsed, 1),
+        "p50_us": ordered[count // 2] / 1000,
+        "p99_us": ordered[min(count - 1, count * 99 // 100)] / 1000,
+        "max_us": ordered[-1] / 1000,
+    }
+
+
+def _efficiency_calls(workload):
+    for n, (period,) in enumerate(workload.periods(EFFICIENCY_QUERIES)):
+        yield ("appointments" if n % 2 == 0 else "admissions", period)
+
+
+def run(size, seed):
+    workload = Workload(size, seed)
+    hospital.reset_state()
+    for ward, count in workload.beds():
+        hospital.add_room(ward, count)
+    for code, price, name in workload.tariffs():
+        hospital.set_tariff(code, price, name)
+    for args in workload.staff():
+        hospital.add_medical_staff(*args)
+
+    results = {}
+    results["register_patient"] = timed(hospital.register_patient, workload.patients())
+    results["schedule_appointment"] = timed(hospital.schedule_appointment, workload.appointments())
+    for args in workload.medical_records():
+        hospital.create_medical_record(*args)
+    results["assign_room"] = timed(hospital.assign_room, workload.admissions())
+    results["process_billing"] = timed(hospital.process_billing, workload.bills())
+    report_calls = ((workload.patient_id(n), "dashboard") for n in range(size))
+    results["generate_patient_report"] = timed(hospital.generate_patient_report, report_calls)
+    results["analyze_hospital_efficiency"] = timed(hospital.analyze_hospital_efficiency, _efficiency_calls(workload))
+    return [{"size": size, "module": "core", "op": op, **figures} for op, figures in results.items()]
+
+
+def _day(iso, fmt=DATE_FORMAT):
+    return date.fromisoformat(iso).strftime(fmt)
+
+
+def _frontdesk_patients(workload):
+    for patient_id, personal, history, insurance in workload.patients():
+        personal = dict(personal)
+        yield (patient_id, personal.pop("name"), personal, ", ".join(history),
+               {"company": insurance["provider"], "policy_no": insurance["policy_number"]} if insurance else {})
+
+
+def _frontdesk_appointments(workload):
+    # Daytime half-hour slots, so most land inside a shift and some collide.
+    for n, (patient_id, doctor_id, day, kind) in enumerate(workload.appointments()):
+        yield patient_id, doctor_id, f"{_day(day)} {8 + n % 12:02d}:{n // 12 % 2 * 30:02d}", kind
+
+
+def _frontdesk_records(booked):
+    for n, (patient_id, doctor_id) in enumerate(booked):
+        prescription = [{"medicine": f"Medicine {n % MEDICINES}", "dosage": "1 tablet", "frequency": "Twice daily"}]
+        yield patient_id, "Viral fever", "Treatment plan", prescription, doctor_id
+
+
+def _frontdesk_admissions(workload):
+    for patient_id, ward, admitted, stay in workload.admissions():
+        yield patient_id, ward, _day(admitted), stay
+
+
+def _frontdesk_discharges(workload):
+    for patient_id, _, admitted, stay in workload.admissions():
+        discharged = (date.fromisoformat(admitted) + timedelta(days=stay)).isoformat()
+        yield patient_id, _day(admitted), _day(discharged), "Follow up in 2 weeks"
+
+
+def _frontdesk_bills(workload, admitted):
+    for patient_id, services, coverage in workload.bills():
+        if patient_id in admitted:
+            yield patient_id, services, round(coverage * 100)
+
+
+def _frontdesk_efficiency_calls(workload):
+    for n, (period,) in enumerate(workload.periods(EFFICIENCY_QUERIES)):
+        days = sorted(period)
+        yield FRONTDESK_METRICS[n % len(FRONTDESK_METRICS)], (_day(days[0]), _day(days[-1]))
+
+
+def run_frontdesk(size, seed):
+    workload = Workload(size, seed)
+    frontdesk.reset_state()
+    for ward, count in workload.beds():
+        frontdesk.beds.add_ward(ward, count)
+    for code, price, name in workload.tariffs():
+        frontdesk.set_tariff(code, price, name)
+    for args in workload.staff():
+        frontdesk.add_medical_staff(*args)
+    expiry = _day((date.today() + timedelta(days=365)).isoformat())
+    for n in range(MEDICINES):
+        frontdesk.track_medication_inventory(f"Medicine {n}", size, expiry, "Bench Pharma", size // 10)
+
+    results = {}
+    results["register_patient"] = timed(frontdesk.register_patient, _frontdesk_patients(workload))
+    results["schedule_appointment"] = timed(frontdesk.schedule_appointment, _frontdesk_appointments(workload))
+    booked = {appt.patient_id: appt.doctor_id for appts in frontdesk.appointment.values() for appt in appts}
+    for args in _frontdesk_records(booked.items()):
+        frontdesk.create_medical_record(*args)
+    results["assign_room"] = timed(frontdesk.assign_room, _frontdesk_admissions(workload))
+    for args in _frontdesk_discharges(workload):
+        frontdesk.manage_discharge_process(*args)
+    bills = _frontdesk_bills(workload, frontdesk.discharged_patients)
+    results["process_billing"] = timed(frontdesk.process_billing, bills)
+    report_calls = ((workload.patient_id(n), FRONTDESK_REPORTS) for n in range(size))
+    results["generate_patient_report"] = timed(frontdesk.generate_patient_report, report_calls)
+    results["analyze_hospital_efficiency"] = timed(frontdesk.analyze_hospital_efficiency,
+                                                   _frontdesk_efficiency_calls(workload))
+    return [{"size": size, "module": "frontdesk", "op": op, **figures} for op, figures in results.items()]
+
+
+RUNS = (run, run_frontdesk)
+
+
+def _key(row):
+    # Files written before the front-desk run only hold core rows.
+    return row["size"], row.get("module", "core"), row["op"]
+
+
+def _label(row):
+    return f"{row.get('module', 'core')}.{row['op']}"
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(rows, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {_key(row): row for row in json.load(f)["results"]}
+    print(f"\nagainst {baseline_path}: throughput ratio (new/old), p99 ratio (new/old)")
+    for row in rows:
+        old = baseline.get(_key(row))
+        if old is None or not old.get("calls") or not row.get("calls"):
+            continue
+        speed = row["ops_per_sec"] / old["ops_per_sec"]
+        p99 = row["p99_us"] / old["p99_us"] if old["p99_us"] else float("nan")
+        print(f"{row['size']:>10} {_label(row):<38} {speed:>7.2f}x {p99:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma-separated record counts, e.g. 1e3,1e4,1e5")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--metrics", action="store_true", help="run with enable_metrics() on in both modules")
+    options = parser.parse_args()
+    sizes = [int(float(size)) for size in options.sizes.split(",")]
+    if options.metrics:
+        hospital.enable_metrics()
+        frontdesk.enable_metrics()
+
+    rows = []
+    print(f"{'size':>10} {'op':<38} {'ops/s':>12} {'p50 us':>9} {'p99 us':>9}")
+    for size in sizes:
+        for row in (row for each in RUNS for row in each(size, options.seed)):
+            rows.append(row)
+            print(f"{size:>10} {_label(row):<38} {row['ops_per_sec']:>12.0f} {row['p50_us']:>9.1f} {row['p99_us']:>9.1f}")
+
+    report = {
+        "commit": _commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": options.seed,
+        "metrics": options.metrics,
+        "results": rows,
+    }
+    with open(options.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {options.out}")
+    if options.compare:
+        compare(rows, options.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Seeded synthetic hospital data shaped like the calls hospital.core takes.
+
+Every stream is a generator of argument tuples, so even 10^7 records are
+produced one at a time instead of being held in memory. Each stream has its
+own random generator derived from the seed, so the patients are the same
+whether or not the appointments were drawn first.
+"""
+import random
+from datetime import date, timedelta
+
+FIRST_NAMES = ("Aarav", "Priya", "Rahul", "Sneha", "Vikram", "Ananya", "Arjun", "Kavya", "Rohan", "Meera",
+               "Alex", "Maria", "James", "Sofia", "Chen", "Fatima", "Omar", "Lena", "Ivan", "Grace")
+LAST_NAMES = ("Sharma", "Patel", "Reddy", "Iyer", "Das", "Kumar", "Singh", "Rao", "Nair", "Gupta",
+              "Smith", "Garcia", "Brown", "Wang", "Khan", "Muller", "Rossi", "Silva", "Ivanova", "Kim")
+SPECIALIZATIONS = ("General Medicine", "Cardiology", "Orthopedics", "Neurology", "Pediatrics",
+                   "Dermatology", "Oncology", "Emergency Medicine")
+INSURERS = ("Star Health", "HealthCare Inc", "TX Health", "Care Plus", None)
+HISTORIES = ("None", "Diabetes", "Hypertension", "Asthma", "Fracture", "Migraine", "Thyroid")
+DIAGNOSES = ("Hypertension", "Type 2 Diabetes", "Viral fever", "Fracture", "Bronchitis", "Migraine",
+             "Gastritis", "Anaemia")
+APPOINTMENT_TYPES = ("Consultation", "Follow Up", "Checkup", "Procedure")
+BLOOD_TYPES = ("A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-")
+GENDERS = ("Male", "Female")
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+SHIFTS = (("Morning", "08:00", "14:00"), ("Evening", "14:00", "20:00"), ("Full Day", "08:00", "20:00"),
+          ("Night", "20:00", "08:00"))
+# Wards and their share of the beds.
+WARDS = (("general room", 0.6), ("private room", 0.25), ("icu", 0.1), ("emergency room", 0.05))
+# Tariff codes, prices and how often a bill carries them.
+TARIFF = (("CONSULT", "Doctor Consultation", 2000, 0.9), ("LAB:CBC", "Blood tests", 600, 0.5),
+          ("ECG", "ECG test", 800, 0.2), ("XRAY", "X-Ray", 900, 0.2), ("MRI", "MRI Scan", 6500, 0.05))
+START = date(2025, 1, 1)
+
+
+def _rng(seed, stream):
+    return random.Random(f"{seed}:{stream}")
+
+
+class Workload:
+    """`records` patients, staff to serve them, and their appointments, stays and bills.
+
+    Days are ISO date strings spread over `days` days from START; hospital.core
+    keeps them as given, so efficiency queries take a set of such strings.
+    """
+
+    def __init__(self, records, seed=0, days=365):
+        self.records = records
+        self.seed = seed
+        self.days = days
+        self.doctors = max(8, records // 250)
+
+    def patient_id(self, n):
+        return f"P{n:08d}"
+
+    def doctor_id(self, n):
+        return f"D{n:05d}"
+
+    def day(self, n):
+        return (START + timedelta(days=n)).isoformat()
+
+    def beds(self):
+        """(ward, beds) so that every admission can get a bed."""
+        return [(ward, max(1, int(self.records * share) + 1)) for ward, share in WARDS]
+
+    def tariffs(self):
+        return [(code, price, name) for code, name, price, _ in TARIFF]
+
+    def staff(self):
+        rng = _rng(self.seed, "staff")
+        for n in range(self.doctors):
+            shifts = []
+            for weekday in WEEKDAYS:
+                if rng.random() < 0.25:
+                    shifts.append({"day": weekday, "shift": "Off", "start": "-", "end": "-", "location": "-"})
+                    continue
+                label, start, end = rng.choice(SHIFTS)
+                shifts.append({"day": weekday, "shift": label, "start": start, "end": end, "location": "OPD"})
+            yield (self.doctor_id(n), f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                   SPECIALIZATIONS[n % len(SPECIALIZATIONS)], shifts, f"98{rng.randrange(10**8):08d}")
+
+    def patients(self):
+        rng = _rng(self.seed, "patients")
+        for n in range(self.records):
+            insurer = rng.choice(INSURERS)
+            insurance = {} if insurer is None else {
+                "provider": insurer, "policy_number": f"POL{rng.randrange(10**7):07d}",
+                "coverage_percent": rng.choice((0.5, 0.7, 0.8, 0.9))}
+            yield (self.patient_id(n), {
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "age": rng.randrange(1, 95),
+                "gender": rng.choice(GENDERS),
+                "blood_type": rng.choice(BLOOD_TYPES),
+            }, [rng.choice(HISTORIES)], insurance)
+
+    def appointments(self):
+        rng = _rng(self.seed, "appointments")
+        for n in range(self.records):
+            yield (self.patient_id(rng.randrange(self.records)), self.doctor_id(rng.randrange(self.doctors)),
+                   self.day(rng.randrange(self.days)), rng.choice(APPOINTMENT_TYPES))
+
+    def medical_records(self):
+        rng = _rng(self.seed, "medical_records")
+        for n in range(self.records):
+            yield (self.patient_id(n), self.doctor_id(rng.randrange(self.doctors)), rng.choice(DIAGNOSES),
+                   "Treatment plan", [f"Medicine {rng.randrange(50)} - Twice daily"])
+
+    def admissions(self):
+        """About half the patients are admitted, each at most once."""
+        rng = _rng(self.seed, "admissions")
+        wards = [ward for ward, _ in WARDS]
+        weights = [share for _, share in WARDS]
+        for n in range(self.records):
+            if rng.random() < 0.5:
+                yield (self.patient_id(n), rng.choices(wards, weights)[0], self.day(rng.randrange(self.days)),
+                       rng.randrange(1, 15))
+
+    def bills(self):
+        rng = _rng(self.seed, "bills")
+        for n in range(self.records):
+            services = [code if rng.random() < 0.7 else (code, rng.randrange(2, 4))
+                        for code, _, _, share in TARIFF if rng.random() < share]
+            services.append({"name": "Nursing care", "cost": 400 * rng.randrange(1, 8)})
+            yield self.patient_id(n), services, rng.choice((0, 0.5, 0.7, 0.8))
+
+    def discharges(self):
+        for patient_id, _, admitted, stay in self.admissions():
+            discharged = (date.fromisoformat(admitted) + timedelta(days=stay)).isoformat()
+            yield patient_id, discharged, "Follow up in 2 weeks"
+
+    def periods(self, count, length=30):
+        """`count` sets of `length` consecutive days to ask efficiency questions about."""
+        rng = _rng(self.seed, "periods")
+        for _ in range(count):
+            first = rng.randrange(max(1, self.days - length))
+            yield ({self.day(first + i) for i in range(length)},)
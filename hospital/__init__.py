@@ -0,0 +1,15 @@
+"""Hospital management: patients, staff, wards, billing and reports.
+
+hospital.core keeps the hospital's records; hospital.frontdesk is the front
+desk, with its request server and menu. Submodules load on first use, so
+``import hospital`` costs next to nothing. ``python -m hospital`` runs the demos.
+"""
+import importlib
+
+_SUBMODULES = ("core", "demo", "frontdesk", "shard")
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
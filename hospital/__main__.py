@@ -0,0 +1,34 @@
+"""Run the hospital demos, the front-desk menu or its request server.
+
+demo        one patient through hospital.core (the default)
+frontdesk   the front-desk walkthrough
+menu        the interactive front-desk menu
+serve       the front-desk request server, until interrupted
+"""
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hospital", description=__doc__.splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="\n".join(__doc__.splitlines()[2:]))
+    parser.add_argument("command", nargs="?", default="demo", choices=("demo", "frontdesk", "menu", "serve"))
+    parser.add_argument("--host", help="address for serve (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="port for serve (default 8765)")
+    options = parser.parse_args(argv)
+    if options.command == "demo":
+        from .demo import run_core
+        run_core()
+    elif options.command == "frontdesk":
+        from .demo import run_frontdesk
+        run_frontdesk()
+    elif options.command == "menu":
+        from .frontdesk import main as menu
+        menu()
+    else:
+        from .frontdesk import serve
+        serve(options.host, options.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta
+
+from .locks import Guarded, Lock
+
+SLOT_MINUTES = 15
+DAY_SLOTS = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = 7 * DAY_SLOTS
+ALWAYS = (1 << WEEK_SLOTS) - 1
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def _minutes(clock):
+    hours, _, minutes = clock.strip().partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def shift_mask(shift_schedule):
+    """Weekly slot bitmap for a list of {"day", "start", "end"} shifts, or None.
+
+    Bit i is slot i of the week, counted from Monday 00:00. Shifts whose start
+    or end is not a clock time ("Off", "On Call") add nothing; a shift that
+    ends at or before its start runs past midnight. Anything other than a list
+    of shifts gives None, meaning the schedule is unknown.
+    """
+    if not isinstance(shift_schedule, (list, tuple)):
+        return None
+    mask = 0
+    for shift in shift_schedule:
+        try:
+            day = WEEKDAYS.index(shift["day"].strip().lower())
+            start, end = _minutes(shift["start"]), _minutes(shift["end"])
+        except (KeyError, AttributeError, ValueError):
+            continue
+        if end <= start:
+            end += 24 * 60
+        first = day * DAY_SLOTS + start // SLOT_MINUTES
+        for slot in range(first, day * DAY_SLOTS + -(-end // SLOT_MINUTES)):
+            mask |= 1 << (slot % WEEK_SLOTS)
+    return mask
+
+
+def _week_slot(when):
+    """(week number, slot in week) of a datetime; weeks start on Monday."""
+    days = when.toordinal() - 1
+    return days // 7, days % 7 * DAY_SLOTS + (when.hour * 60 + when.minute) // SLOT_MINUTES
+
+
+def _span(when, minutes):
+    """Bitmap of every slot [when, when + minutes) touches, relative to its week."""
+    _, first = _week_slot(when)
+    end = (when.hour * 60 + when.minute + minutes + SLOT_MINUTES - 1) // SLOT_MINUTES
+    count = max(1, end - (when.hour * 60 + when.minute) // SLOT_MINUTES)
+    return ((1 << count) - 1) << first
+
+
+def _runs(mask, length):
+    """Bits of mask that start a run of `length` set bits."""
+    runs = mask
+    for shift in range(1, length):
+        runs &= mask >> shift
+    return runs
+
+
+class AvailabilityBook(Guarded):
+    """Per-doctor weekly shift bitmaps intersected with booked slots.
+
+    A doctor's free slots in a week are their shift bitmap with that week's
+    booked bitmap masked out, so "is this slot free" is one AND and "first
+    free run of n slots" is a few shifts and a lowest-bit lookup per week.
+    Run bitmaps are cached per doctor and OR-ed per specialization, so a
+    search across a whole specialization is one lookup until the next booking
+    in that week. Doctors with no usable shift list are always on shift.
+    """
+
+    def __init__(self):
+        self._shifts = {}
+        self._booked = {}  # (doctor_id, week) -> bitmap of booked slots
+        self._by_specialization = {}
+        self._specializations = {}
+        self._runs = {}  # (doctor_id, week) -> {length: bitmap of free run starts}
+        self._any_runs = {}  # (specialization, week) -> {length: OR of its doctors' runs}
+        self._lock = Lock()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_runs"], state["_any_runs"] = {}, {}
+        return state
+
+    def add_doctor(self, doctor_id, specialization, shift_schedule):
+        mask = shift_mask(shift_schedule)
+        specialization = str(specialization).strip().lower()
+        with self._lock:
+            self._shifts[doctor_id] = ALWAYS if mask is None else mask
+            doctors = self._by_specialization.setdefault(specialization, [])
+            if doctor_id not in doctors:
+                doctors.append(doctor_id)
+            self._specializations.setdefault(doctor_id, set()).add(specialization)
+            self._runs.clear()
+            self._any_runs.clear()
+
+    def doctors(self, specialization):
+        return list(self._by_specialization.get(str(specialization).strip().lower(), ()))
+
+    def _shift(self, doctor_id):
+        return self._shifts.get(doctor_id, ALWAYS)
+
+    def _free(self, doctor_id, week):
+        return self._shift(doctor_id) & ~self._booked.get((doctor_id, week), 0)
+
+    def on_shift(self, doctor_id, start, minutes):
+        """True when every slot of the appointment falls inside the doctor's shifts."""
+        return self._covered(self._shift(doctor_id), _span(start, minutes))
+
+    def is_free(self, doctor_id, start, minutes):
+        week, _ = _week_slot(start)
+        with self._lock:
+            free = self._free(doctor_id, week) | self._free(doctor_id, week + 1) << WEEK_SLOTS
+        return free & _span(start, minutes) == _span(start, minutes)
+
+    @staticmethod
+    def _covered(mask, span):
+        # Appointments that run past Sunday midnight wrap to next Monday's slots.
+        wrapped = (span & ALWAYS) | (span >> WEEK_SLOTS)
+        return mask & wrapped == wrapped
+
+    def _mark(self, doctor_id, start, minutes, booked):
+        week, _ = _week_slot(start)
+        span = _span(start, minutes)
+        with self._lock:
+            for offset, part in ((0, span & ALWAYS), (1, span >> WEEK_SLOTS)):
+                if not part:
+                    continue
+                key = (doctor_id, week + offset)
+                mask = self._booked.get(key, 0)
+                mask = mask | part if booked else mask & ~part
+                if mask:
+                    self._booked[key] = mask
+                else:
+                    self._booked.pop(key, None)
+                # A week's runs may end in the next week, so the week before goes stale too.
+                for stale in (week + offset, week + offset - 1):
+                    self._runs.pop((doctor_id, stale), None)
+                    for specialization in self._specializations.get(doctor_id, ()):
+                        self._any_runs.pop((specialization, stale), None)
+
+    def book(self, doctor_id, start, minutes):
+        self._mark(doctor_id, start, minutes, True)
+
+    def release(self, doctor_id, start, minutes):
+        self._mark(doctor_id, start, minutes, False)
+
+    def _doctor_runs(self, doctor_id, week, length):
+        cached = self._runs.setdefault((doctor_id, week), {})
+        runs = cached.get(length)
+        if runs is None:
+            free = self._free(doctor_id, week) | self._free(doctor_id, week + 1) << WEEK_SLOTS
+            runs = cached[length] = _runs(free, length) & ALWAYS
+        return runs
+
+    def _specialization_runs(self, specialization, doctors, week, length):
+        cached = self._any_runs.setdefault((specialization, week), {})
+        runs = cached.get(length)
+        if runs is None:
+            runs = 0
+            for doctor_id in doctors:
+                runs |= self._doctor_runs(doctor_id, week, length)
+            cached[length] = runs
+        return runs
+
+    def _search(self, runs_of, after, minutes, weeks):
+        """(week, slot, length) of the first run start at or after `after`, or None."""
+        length = max(1, -(-minutes // SLOT_MINUTES))
+        week, slot = _week_slot(after)
+        if (after.minute % SLOT_MINUTES, after.second, after.microsecond) != (0, 0, 0):
+            slot += 1
+        for offset in range(weeks):
+            runs = runs_of(week + offset, length) >> slot << slot
+            if runs:
+                return week + offset, (runs & -runs).bit_length() - 1, length
+            slot = 0
+        return None
+
+    @staticmethod
+    def _start(week, slot):
+        day = datetime.fromordinal(week * 7 + 1 + slot // DAY_SLOTS)
+        return day + timedelta(minutes=slot % DAY_SLOTS * SLOT_MINUTES)
+
+    def earliest(self, doctor_id, after, minutes=30, weeks=52):
+        """First start at or after `after` (rounded up to a slot) with `minutes` free, or None."""
+        with self._lock:
+            found = self._search(lambda week, length: self._doctor_runs(doctor_id, week, length),
+                                 after, minutes, weeks)
+        return None if found is None else self._start(*found[:2])
+
+    def earliest_for(self, specialization, after, minutes=30, weeks=52):
+        """(start, doctor_id) of the earliest free slot among a specialization's doctors, or None.
+
+        Ties go to the doctor who was added first.
+        """
+        specialization = str(specialization).strip().lower()
+        with self._lock:
+            doctors = self._by_specialization.get(specialization, ())
+            found = self._search(lambda week, length: self._specialization_runs(specialization, doctors, week, length),
+                                 after, minutes, weeks)
+            if found is None:
+                return None
+            week, slot, length = found
+            doctor_id = next(d for d in doctors if self._doctor_runs(d, week, length) >> slot & 1)
+        return self._start(week, slot), doctor_id
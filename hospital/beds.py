@@ -0,0 +1,155 @@
+import heapq
+from bisect import bisect_right, insort
+
+from .locks import Guarded, Lock
+
+
+class BedAllocator(Guarded):
+    """Concrete beds per ward with O(1) allocate/release from per-ward free lists.
+
+    Beds can be reserved for a patient until a given time; a reservation is
+    claimed by that patient's next allocation in the ward, or returned to the
+    free list once it expires. Every occupied bed carries an expected release
+    date, which is what forecast() counts. All methods take one lock, so
+    concurrent admissions never hand out the same bed.
+    """
+
+    def __init__(self, wards=None):
+        self._lock = Lock()
+        self._free = {}
+        self._capacity = {}
+        self._ward_of = {}
+        self._occupant = {}
+        self._bed_of = {}
+        self._release_on = {}
+        self._releases = {}
+        self._reserved = {}
+        self._held = {}
+        self._expiry = []
+        for ward, count in (wards or {}).items():
+            self.add_ward(ward, count)
+
+    def add_ward(self, ward, count):
+        with self._lock:
+            free = self._free.setdefault(ward, [])
+            self._releases.setdefault(ward, [])
+            start = self._capacity.get(ward, 0)
+            new_beds = [f"{ward}/{number}" for number in range(start + 1, start + count + 1)]
+            for bed_id in new_beds:
+                self._ward_of[bed_id] = ward
+            # The free list is popped from the end, so new beds go in reversed at the front.
+            free[:0] = reversed(new_beds)
+            self._capacity[ward] = start + count
+
+    def wards(self):
+        return list(self._free)
+
+    def capacity(self, ward=None):
+        if ward is None:
+            return len(self._ward_of)
+        return self._capacity.get(ward, 0)
+
+    def free_count(self, ward):
+        return len(self._free.get(ward, ()))
+
+    def bed_of(self, patient_id):
+        return self._bed_of.get(patient_id)
+
+    def _expire(self, now):
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, bed_id = heapq.heappop(self._expiry)
+            reservation = self._reserved.get(bed_id)
+            if reservation is not None and reservation[1] == expires:
+                del self._reserved[bed_id]
+                del self._held[reservation[0]]
+                self._free[self._ward_of[bed_id]].append(bed_id)
+
+    def _occupy(self, bed_id, patient_id, expected_release):
+        self._occupant[bed_id] = patient_id
+        self._bed_of[patient_id] = bed_id
+        if expected_release is not None:
+            self._release_on[bed_id] = expected_release
+            insort(self._releases[self._ward_of[bed_id]], expected_release)
+
+    def _take(self, ward, patient_id, now, expected_release):
+        if ward not in self._free:
+            raise KeyError(f"unknown ward: {ward!r}")
+        if now is not None:
+            self._expire(now)
+        bed_id = self._held.get(patient_id)
+        if bed_id is not None and self._ward_of[bed_id] == ward:
+            del self._held[patient_id]
+            del self._reserved[bed_id]
+        else:
+            free = self._free[ward]
+            if not free:
+                return None
+            bed_id = free.pop()
+        self._occupy(bed_id, patient_id, expected_release)
+        return bed_id
+
+    def allocate(self, ward, patient_id, now=None, expected_release=None):
+        """Give patient_id a bed in ward and return its id, or None if the ward is full."""
+        with self._lock:
+            if patient_id in self._bed_of:
+                return None
+            return self._take(ward, patient_id, now, expected_release)
+
+    def claim(self, bed_id, patient_id, expected_release=None):
+        """Give patient_id this particular free bed and return its id, or None if it is taken."""
+        with self._lock:
+            ward = self._ward_of.get(bed_id)
+            if ward is None:
+                raise KeyError(f"unknown bed: {bed_id!r}")
+            if patient_id in self._bed_of or bed_id in self._occupant or bed_id in self._reserved:
+                return None
+            self._free[ward].remove(bed_id)
+            self._occupy(bed_id, patient_id, expected_release)
+            return bed_id
+
+    def allocate_first(self, wards, patient_id, now=None, expected_release=None):
+        """Try wards in order; return (ward, bed_id) for the first with a free bed, or None."""
+        with self._lock:
+            if patient_id in self._bed_of:
+                return None
+            for ward in wards:
+                bed_id = self._take(ward, patient_id, now, expected_release)
+                if bed_id is not None:
+                    return ward, bed_id
+            return None
+
+    def release(self, patient_id):
+        """Free the patient's bed and return its id, or None if they had none."""
+        with self._lock:
+            bed_id = self._bed_of.pop(patient_id, None)
+            if bed_id is None:
+                return None
+            del self._occupant[bed_id]
+            ward = self._ward_of[bed_id]
+            expected_release = self._release_on.pop(bed_id, None)
+            if expected_release is not None:
+                releases = self._releases[ward]
+                del releases[bisect_right(releases, expected_release) - 1]
+            self._free[ward].append(bed_id)
+            return bed_id
+
+    def reserve(self, ward, patient_id, expires):
+        """Hold a free bed in ward for patient_id until `expires`; returns the bed id or None."""
+        with self._lock:
+            free = self._free[ward]
+            if not free or patient_id in self._held:
+                return None
+            bed_id = free.pop()
+            self._held[patient_id] = bed_id
+            self._reserved[bed_id] = (patient_id, expires)
+            heapq.heappush(self._expiry, (expires, bed_id))
+            return bed_id
+
+    def expire_reservations(self, now):
+        with self._lock:
+            self._expire(now)
+
+    def forecast(self, ward, on_date):
+        """Beds expected to be free in ward on on_date, from expected release dates."""
+        with self._lock:
+            return len(self._free[ward]) + bisect_right(self._releases[ward], on_date)
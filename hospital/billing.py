@@ -0,0 +1,169 @@
+from array import array
+
+from .lazy import optional_import
+from .records import Bill
+
+FULL_COVERAGE = 10_000  # coverage is held in basis points
+NO_CAP = 2 ** 62
+# hospital.core's insurers pay whole currency units, as its process_billing always has.
+COVERAGE_UNIT = 100
+
+
+def to_cents(amount):
+    """Exact integer cents for an amount given as int, float, str or Decimal."""
+    if isinstance(amount, int):
+        return amount * 100
+    # decimal is imported by the amounts that need it, which keeps it out of the package import.
+    from decimal import ROUND_HALF_UP, Decimal
+
+    cents = (Decimal(str(amount)) * 100).quantize(Decimal(1), ROUND_HALF_UP)
+    return int(cents)
+
+
+def from_cents(cents):
+    """Whole amounts come back as int, anything with paise as an exact Decimal."""
+    cents = int(cents)
+    if cents % 100 == 0:
+        return cents // 100
+    from decimal import Decimal
+
+    return Decimal(cents).scaleb(-2)
+
+
+def coverage_bps(coverage, percent=False):
+    """Coverage in basis points, from a fraction (0.8) or, with percent=True, a percent (80)."""
+    if not coverage:
+        return 0
+    from decimal import Decimal
+
+    value = Decimal(str(coverage))
+    if percent:
+        value /= 100
+    return max(0, min(FULL_COVERAGE, int(value * FULL_COVERAGE)))
+
+
+def coverage_label(coverage, percent=False):
+    return f"{coverage_bps(coverage, percent) / 100:g}%"
+
+
+def room_charge_name(days):
+    return f"Room Charges ({days} days)"
+
+
+class BillingBatch:
+    """Service lines for many patients, kept as parallel columns.
+
+    Each patient gets one row (coverage, cap, room type and days); each service
+    line records the row it belongs to and its cost in cents. Coverage is read
+    as a fraction unless percent=True, and the insurer share is rounded down to
+    a multiple of coverage_unit cents (1 keeps it exact).
+    """
+
+    def __init__(self, percent=False, coverage_unit=COVERAGE_UNIT):
+        self.percent = percent
+        self.coverage_unit = coverage_unit
+        self.patient_ids = []
+        self._row = {}
+        self.coverage = array("q")
+        self.caps = array("q")
+        self.room_types = []
+        self.room_days = array("q")
+        self.line_rows = array("q")
+        self.line_cents = array("q")
+        self.line_names = []
+
+    def __len__(self):
+        return len(self.patient_ids)
+
+    @classmethod
+    def from_columns(cls, patient_ids, names, costs, coverage=None, caps=None, rooms=None, **options):
+        """Build a batch from parallel line columns plus per-patient coverage, caps and (room_type, days)."""
+        batch = cls(**options)
+        coverage, caps, rooms = coverage or {}, caps or {}, rooms or {}
+        for patient_id, name, cost in zip(patient_ids, names, costs):
+            if patient_id not in batch._row:
+                room_type, days = rooms.get(patient_id, (None, 0))
+                batch.add_patient(patient_id, coverage.get(patient_id, 0), caps.get(patient_id),
+                                  room_type, days)
+            batch.add_service(patient_id, name, cost)
+        return batch
+
+    def add_patient(self, patient_id, coverage=0, cap=None, room_type=None, room_days=0):
+        if patient_id in self._row:
+            raise ValueError(f"patient {patient_id!r} is already in this batch")
+        self._row[patient_id] = len(self.patient_ids)
+        self.patient_ids.append(patient_id)
+        self.coverage.append(coverage_bps(coverage, self.percent))
+        self.caps.append(NO_CAP if cap is None else to_cents(cap))
+        self.room_types.append(room_type)
+        self.room_days.append(room_days or 0)
+
+    def add_service(self, patient_id, name, cost):
+        self.line_rows.append(self._row[patient_id])
+        self.line_cents.append(to_cents(cost))
+        self.line_names.append(name)
+
+    def add_services(self, patient_id, services):
+        """Add either [{"name", "cost"}, ...] lines or a {name: cost} mapping."""
+        if hasattr(services, "items"):
+            services = ({"name": name, "cost": cost} for name, cost in services.items())
+        for service in services:
+            self.add_service(patient_id, service.get("name"), service["cost"])
+
+    def _room_cents(self, room_rates):
+        rates = {room_type: to_cents(price) for room_type, price in (room_rates or {}).items()}
+        return array("q", (rates.get(room_type, 0) if days else 0
+                           for room_type, days in zip(self.room_types, self.room_days)))
+
+    def _totals(self, room_rates):
+        """Return (room, total, covered, due) cent columns, one entry per patient."""
+        rates = self._room_cents(room_rates)
+        np = optional_import("numpy")  # without it, a plain loop over the same columns
+        if np is not None:
+            rows = np.frombuffer(self.line_rows, dtype=np.int64)
+            cents = np.frombuffer(self.line_cents, dtype=np.int64)
+            room = np.frombuffer(rates, dtype=np.int64) * np.frombuffer(self.room_days, dtype=np.int64)
+            total = room.copy()
+            np.add.at(total, rows, cents)
+            covered = total * np.frombuffer(self.coverage, dtype=np.int64) // FULL_COVERAGE
+            covered -= covered % self.coverage_unit
+            covered = np.minimum(covered, np.frombuffer(self.caps, dtype=np.int64))
+            return room.tolist(), total.tolist(), covered.tolist(), (total - covered).tolist()
+        room = [rate * days for rate, days in zip(rates, self.room_days)]
+        total = list(room)
+        for row, cents in zip(self.line_rows, self.line_cents):
+            total[row] += cents
+        covered = []
+        for amount, bps, cap in zip(total, self.coverage, self.caps):
+            share = amount * bps // FULL_COVERAGE
+            covered.append(min(share - share % self.coverage_unit, cap))
+        return room, total, covered, [t - c for t, c in zip(total, covered)]
+
+    def run(self, room_rates=None):
+        """Bill every patient in the batch; room_rates maps room type to its daily price."""
+        room, total, covered, due = self._totals(room_rates)
+        services = [[] for _ in self.patient_ids]
+        for row, (days, room_cents) in enumerate(zip(self.room_days, room)):
+            if room_cents:
+                services[row].append({"name": room_charge_name(days), "cost": from_cents(room_cents)})
+        for row, name, cents in zip(self.line_rows, self.line_names, self.line_cents):
+            services[row].append({"name": name, "cost": from_cents(cents)})
+        return [
+            Bill(
+                patient_id=patient_id,
+                services=services[row],
+                total_cost=from_cents(total[row]),
+                insurance_coverage=from_cents(covered[row]),
+                amount_due=from_cents(due[row])
+            )
+            for row, patient_id in enumerate(self.patient_ids)
+        ]
+
+
+def bill_patient(patient_id, services, coverage, cap=None, room_type=None, room_days=0, room_rates=None,
+                 **options):
+    """Bill one patient through the same arithmetic as a batch; options go to BillingBatch."""
+    batch = BillingBatch(**options)
+    batch.add_patient(patient_id, coverage, cap, room_type, room_days)
+    batch.add_services(patient_id, services)
+    return batch.run(room_rates)[0]
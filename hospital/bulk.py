@@ -0,0 +1,75 @@
+import os
+
+
+class BulkResult:
+    """Outcome of a bulk load: how many rows were accepted and why the rest were not."""
+
+    __slots__ = ("accepted", "errors")
+
+    def __init__(self, accepted=0, errors=None):
+        self.accepted = accepted
+        self.errors = [] if errors is None else errors
+
+    def __repr__(self):
+        return f"BulkResult(accepted={self.accepted!r}, errors={self.errors!r})"
+
+    def reject(self, row_number, message):
+        self.errors.append((row_number, message))
+
+
+def read_rows(source, fields, format=None):
+    """Yield (row_number, dict) from an iterable, a CSV/JSONL path or an open file.
+
+    Iterables may hold mappings or positional tuples in `fields` order. The
+    file format is taken from `format` or the file extension.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="") as f:
+            yield from read_rows(f, fields, format or _format_of(source))
+        return
+    if hasattr(source, "read"):
+        format = format or _format_of(getattr(source, "name", ""))
+        # The parsers are imported here, so only sessions that load files pay for them.
+        if format == "csv":
+            import csv
+            rows = csv.DictReader(source)
+            start = 2  # line 1 is the header
+        elif format == "jsonl":
+            import json
+            rows = (json.loads(line) for line in source if line.strip())
+            start = 1
+        else:
+            raise ValueError(f"unknown bulk file format: {format!r}")
+        yield from enumerate(rows, start)
+        return
+    for row_number, row in enumerate(source, 1):
+        yield row_number, row if hasattr(row, "keys") else dict(zip(fields, row))
+
+
+def _format_of(name):
+    name = os.fspath(name).lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def as_id(value):
+    """CSV cells arrive as text; numeric ids are stored as ints everywhere else."""
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    if value in (None, ""):
+        raise ValueError("missing id")
+    return value
+
+
+def nested(row, key, columns):
+    """Return row[key], or build it from flat CSV columns when it is absent."""
+    if key in row and row[key] not in (None, ""):
+        value = row[key]
+        if isinstance(value, str):
+            import json
+            return json.loads(value)
+        return value
+    return {column: row[column] for column in columns if row.get(column) not in (None, "")}
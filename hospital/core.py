@@ -0,0 +1,468 @@
+from .beds import BedAllocator
+from .billing import bill_patient, coverage_label
+from .dates import to_datetime, today
+from .indexes import SecondaryIndex
+from .journal import Journal, journaled
+from .locks import StripedLocks, locked
+from .output import emit
+from .pharmacy import MedicationInventory
+from .records import Appointment, Emergency, Patient, Staff
+from .search import SearchIndex
+from .report import Each, ReportCache, Template, write_reports
+from .tariff import TariffBook, rate_card
+from .triage import TriageQueue, severity_rank
+
+# Sample data stores
+patients = {}
+staff = {}
+appointments = []
+medical_records = []
+billings = []
+emergencies = []
+pharmacy = MedicationInventory()
+room_assignments = {}
+discharges = []
+beds = BedAllocator()
+DEFAULT_ROOM_BEDS = 1
+triage = TriageQueue()
+tariffs = TariffBook()
+# Secondary indexes, kept current by the functions that write the stores above.
+appointments_by_patient = SecondaryIndex()
+appointments_by_date = SecondaryIndex()
+appointments_by_doctor_date = SecondaryIndex()
+patients_by_room = SecondaryIndex()
+admissions_by_date = SecondaryIndex()
+patients_by_diagnosis = SecondaryIndex()
+search_index = SearchIndex()
+# Rendered reports; derived from the stores, so never journaled.
+report_cache = ReportCache()
+STORES = ("patients", "staff", "appointments", "medical_records", "billings", "emergencies",
+          "pharmacy", "room_assignments", "discharges", "beds", "triage", "tariffs",
+          "appointments_by_patient", "appointments_by_date", "appointments_by_doctor_date",
+          "patients_by_room", "admissions_by_date", "patients_by_diagnosis", "search_index")
+# Public operations that enable_metrics() times.
+OPERATIONS = ("register_patient", "add_medical_staff", "schedule_appointment", "create_medical_record",
+              "process_billing", "process_billing_batch", "load_rate_card", "set_tariff",
+              "manage_emergency_admission", "next_emergency", "track_medication_inventory", "add_room",
+              "assign_room", "calculate_treatment_cost", "generate_patient_report", "write_patient_reports",
+              "appointments_for_patient", "appointments_on", "admissions_on", "patients_in_room",
+              "record_vitals", "patients_with_diagnosis", "search_patients", "analyze_hospital_efficiency",
+              "manage_discharge_process")
+journal = None
+JOURNAL_OPS = {}  # op name -> journaled function, filled in by @journaled
+metrics = None
+# Per-entity lock stripes; the fixed keys guard pools shared by every patient.
+locks = StripedLocks()
+BEDS = ("beds",)
+PHARMACY = ("pharmacy",)
+TRIAGE = ("triage",)
+BILLING = ("billing",)
+TARIFFS = ("tariffs",)
+
+
+@locked(patient="patient_id")
+@journaled
+def register_patient(patient_id, personal_info, medical_history, insurance_info):
+    patients[patient_id] = Patient(
+        personal_info=personal_info,
+        medical_history=medical_history,
+        insurance_info=insurance_info,
+        records=[],
+        appointments=[],
+        vitals={},
+        medications=[]
+    )
+    search_index.index(patient_id, "name", (personal_info or {}).get("name"))
+    search_index.index(patient_id, "medical_history", medical_history)
+    report_cache.invalidate(("patient", patient_id))
+    emit("patient_registered", f"Patient {patient_id} registered successfully.", patient_id=patient_id)
+
+
+@locked(staff="staff_id")
+@journaled
+def add_medical_staff(staff_id, name, specialization, shift_schedule, contact_info):
+    staff[staff_id] = Staff(
+        name=name,
+        specialization=specialization,
+        shift_schedule=shift_schedule,
+        contact_info=contact_info
+    )
+    report_cache.invalidate(("staff", staff_id))
+    emit("staff_added", f"Staff {staff_id} added successfully.", staff_id=staff_id)
+
+
+@locked(patient="patient_id", doctor="doctor_id")
+@journaled
+def schedule_appointment(patient_id, doctor_id, appointment_date, appointment_type):
+    if doctor_id not in staff:
+        emit("doctor_unavailable", "Doctor not available.", doctor_id=doctor_id)
+        return
+    appointment = Appointment(
+        patient_id=patient_id,
+        doctor_id=doctor_id,
+        appointment_date=appointment_date,
+        appointment_type=appointment_type
+    )
+    appointments.append(appointment)
+    appointments_by_patient.add(patient_id, appointment)
+    appointments_by_date.add(appointment_date, appointment)
+    appointments_by_doctor_date.add((doctor_id, appointment_date), appointment)
+    patients[patient_id].appointments.append(appointment_date)
+    emit("appointment_scheduled", f"Appointment scheduled for patient {patient_id} with doctor {doctor_id}.",
+         patient_id=patient_id, doctor_id=doctor_id)
+
+
+@locked(patient="patient_id")
+@journaled
+def create_medical_record(patient_id, doctor_id, diagnosis, treatment, prescription):
+    record = {
+        "doctor_id": doctor_id,
+        "diagnosis": diagnosis,
+        "treatment": treatment,
+        "prescription": prescription
+    }
+    patient = patients[patient_id]
+    if not any(earlier["diagnosis"] == diagnosis for earlier in patient.records):
+        patients_by_diagnosis.add(diagnosis, patient_id)
+    patient.records.append(record)
+    patient.medications = prescription
+    for field in ("diagnosis", "treatment", "prescription"):
+        search_index.index(patient_id, field, [earlier[field] for earlier in patient.records])
+    report_cache.invalidate(("patient", patient_id))
+    medical_records.append(record)
+    emit("medical_record_created", f"Medical record created for patient {patient_id}.", patient_id=patient_id)
+
+
+def process_billing(patient_id, services_list, insurance_coverage, billed_on=None):
+    """Bill the patient at the prices in force on billed_on, today if not given."""
+    # The date is fixed here, so a journal replay on a later day prices the bill the same way.
+    return _process_billing(patient_id, services_list, insurance_coverage, billed_on or today())
+
+
+@locked(patient="patient_id")
+@journaled
+def _process_billing(patient_id, services_list, insurance_coverage, billed_on):
+    insurance = (patients[patient_id].insurance_info if patient_id in patients else None) or {}
+    services_list = tariffs.price_services(services_list, insurance.get("provider"), billed_on)
+    bill = bill_patient(patient_id, services_list, insurance_coverage)
+    bill.services = services_list
+    billings.append(bill)
+    lines = ["=== BILLING SUMMARY ===", f"Patient: {patient_id}", "Service Charges:"]
+    for service in services_list:
+        lines.append(f"{service['name']}: {service['cost']}")
+    lines.append(f"\nTotal bill: {bill.total_cost}")
+    lines.append(f"Insurance coverage({coverage_label(insurance_coverage)}): {bill.insurance_coverage}")
+    lines.append(f"Patient responsibility: {bill.amount_due}\n")
+    emit("billing_summary", "\n".join(lines), patient_id=patient_id, total_cost=bill.total_cost,
+         insurance_coverage=bill.insurance_coverage, amount_due=bill.amount_due)
+    return bill
+
+
+@locked(BILLING)
+@journaled
+def process_billing_batch(batch, room_rates=None):
+    """Bill every patient in a billing.BillingBatch at once; returns the new bills."""
+    bills = batch.run(room_rates)
+    billings.extend(bills)
+    emit("billing_batch", f"Billed {len(bills)} patients.", patients=len(bills))
+    return bills
+
+
+def load_rate_card(source):
+    """Price from a rate card; only a card given by path waits for the next lookup to be read."""
+    _load_rate_card(rate_card(source))
+
+
+@locked(TARIFFS)
+@journaled
+def _load_rate_card(card):
+    tariffs.load(card)
+    emit("rate_card_loaded", "Rate card loaded for pricing.", version=tariffs.version)
+
+
+@locked(TARIFFS)
+@journaled
+def set_tariff(code, price, name=None, insurer=None, effective_from=None):
+    tariffs.set_price(code, price, name, insurer, effective_from)
+    emit("tariff_updated", f"Tariff {code} set to {price}.", code=code, insurer=insurer)
+
+
+@locked(TRIAGE, patient="patient_id")
+@journaled
+def manage_emergency_admission(patient_id, emergency_type, severity_level):
+    severity_rank(severity_level)  # reject an unknown level before anything is recorded
+    if patient_id not in patients:
+        emit("emergency_registration", "Unregistered patient. Registering for emergency.", patient_id=patient_id)
+        register_patient(patient_id, {}, [], {})
+    emergencies.append(Emergency(
+        patient_id=patient_id,
+        emergency_type=emergency_type,
+        severity_level=severity_level
+    ))
+    triage.admit(patient_id, severity_level)
+    emit("emergency_admitted", f"Emergency admission recorded for patient {patient_id}.",
+         patient_id=patient_id, severity=severity_level)
+
+
+@locked(TRIAGE)
+@journaled
+def next_emergency():
+    if not triage:
+        emit("triage_empty", "No emergency patients waiting.")
+        return None
+    patient_id, severity_level = triage.pop_next()
+    emit("emergency_called", f"Next emergency patient: {patient_id} (severity {severity_level}).",
+         patient_id=patient_id, severity=severity_level)
+    return patient_id
+
+
+@locked(PHARMACY)
+@journaled
+def track_medication_inventory(medication_id, quantity, expiry_date, supplier, reorder_level=None):
+    if reorder_level is not None:
+        pharmacy.set_threshold(medication_id, reorder_level)
+    pharmacy.add_lot(medication_id, quantity, to_datetime(expiry_date), supplier)
+    emit("inventory_updated", f"Medication {medication_id} inventory updated.", medication_id=medication_id)
+
+
+@locked(BEDS)
+@journaled
+def add_room(room_type, bed_count):
+    beds.add_ward(room_type, bed_count)
+    emit("room_added", f"Room {room_type} now has {beds.capacity(room_type)} beds.", room_type=room_type)
+
+
+@locked(BEDS, patient="patient_id")
+@journaled
+def assign_room(patient_id, room_type, admission_date, expected_duration, bed=None):
+    """Admit the patient and return their bed, or None; `bed` names the exact bed to take."""
+    if bed is not None:
+        bed = beds.claim(bed, patient_id)
+    else:
+        if not beds.capacity(room_type):
+            beds.add_ward(room_type, DEFAULT_ROOM_BEDS)
+        bed = beds.allocate(room_type, patient_id)
+    if bed is None:
+        emit("room_unavailable", "Room occupancy conflict. No available rooms of this type.",
+             patient_id=patient_id, room_type=room_type)
+        return
+    previous = room_assignments.get(patient_id)
+    if previous is not None:
+        patients_by_room.discard(previous["room_type"], patient_id)
+        admissions_by_date.discard(previous["admission_date"], patient_id)
+    patients_by_room.add(room_type, patient_id)
+    admissions_by_date.add(admission_date, patient_id)
+    room_assignments[patient_id] = {
+        "room_type": room_type,
+        "bed": bed,
+        "admission_date": admission_date,
+        "expected_duration": expected_duration
+    }
+    report_cache.invalidate(("patient", patient_id))
+    emit("room_assigned", f"Room assigned to patient {patient_id}.", patient_id=patient_id, room_type=room_type)
+    return bed
+
+
+@locked(patient="patient_id")
+@journaled
+def record_vitals(patient_id, vitals):
+    """Merge new readings into the patient's vitals, replacing older values of the same kind."""
+    patient = patients[patient_id]
+    patient.vitals = {**(patient.vitals or {}), **vitals}
+    report_cache.invalidate(("patient", patient_id))
+    emit("vitals_recorded", f"Vitals recorded for patient {patient_id}.", patient_id=patient_id)
+
+
+def calculate_treatment_cost(patient_id, treatment_plan, insurance_details):
+    treatment_plan = tariffs.price_services(treatment_plan, insurance_details.get("provider"))
+    bill = bill_patient(patient_id, treatment_plan, insurance_details.get("coverage_percent", 0))
+    total, covered, due = bill.total_cost, bill.insurance_coverage, bill.amount_due
+    emit("treatment_cost", f"Total: {total}, Covered: {covered}, Due: {due}",
+         patient_id=patient_id, total=total, covered=covered, due=due)
+    return {
+        "total": total,
+        "covered": covered,
+        "due": due
+    }
+
+
+PATIENT_DASHBOARD = Template("dashboard", (
+    "=== PATIENT DASHBOARD ===",
+    "Patient: {name} (ID: {patient_id})",
+    "Age: {age} | Gender: {gender} | Blood Type: {blood_type}",
+    "Insurance: {insurer} (Policy: {policy_number})",
+    "Current Status: Inpatient",
+    "Room: {room_type}\nAdmitted: {admission_date}",
+    Each("attending_doctor", "Attending Doctor: {0} ({1})"),
+    "Recent Vitals:",
+    Each("vitals", "{0}: {1}"),
+    "Active Medications:",
+    Each("medications", "- {0}"),
+))
+REPORTS = {"dashboard": PATIENT_DASHBOARD}
+
+
+def _report_row(patient_id):
+    patient = patients.get(patient_id) or Patient()
+    room = room_assignments.get(patient_id, {})
+    info = patient.personal_info or {}
+    insurance = patient.insurance_info or {}
+    attending = []
+    if patient.records:
+        doctor = staff[patient.records[-1]['doctor_id']]
+        attending.append((doctor.name, doctor.specialization))
+    return {
+        "patient_id": patient_id,
+        "name": info.get("name"),
+        "age": info.get("age"),
+        "gender": info.get("gender"),
+        "blood_type": info.get("blood_type"),
+        "insurer": insurance.get("provider"),
+        "policy_number": insurance.get("policy_number"),
+        "room_type": room.get("room_type"),
+        "admission_date": room.get("admission_date"),
+        "attending_doctor": attending,
+        "vitals": patient.vitals or {},
+        "medications": patient.medications or [],
+    }
+
+
+def _report_dependencies(patient_id):
+    tags = [("patient", patient_id)]
+    patient = patients.get(patient_id)
+    if patient is not None and patient.records:
+        tags.append(("staff", patient.records[-1]["doctor_id"]))
+    return tags
+
+
+def generate_patient_report(patient_id, report_type):
+    template = REPORTS.get(report_type)
+    if template is None:
+        return
+    key = (patient_id, report_type)
+    text, stamp = report_cache.lookup(key)
+    if text is None:
+        text = template.render(_report_row(patient_id))
+        report_cache.put(key, text, _report_dependencies(patient_id), stamp)
+    emit("patient_report", text, patient_id=patient_id, report_type=report_type)
+
+
+def write_patient_reports(patient_ids, report_type, stream, format="text"):
+    """Stream reports for many patients to `stream` as text, JSON lines or CSV."""
+    return write_reports(REPORTS[report_type], map(_report_row, patient_ids), stream, format)
+
+
+def appointments_for_patient(patient_id):
+    return appointments_by_patient.get(patient_id)
+
+
+def appointments_on(appointment_date, doctor_id=None):
+    if doctor_id is None:
+        return appointments_by_date.get(appointment_date)
+    return appointments_by_doctor_date.get((doctor_id, appointment_date))
+
+
+def admissions_on(admission_date):
+    return admissions_by_date.get(admission_date)
+
+
+def patients_in_room(room_type):
+    """Everyone assigned to room_type, in the order they were assigned."""
+    return patients_by_room.get(room_type)
+
+
+def patients_with_diagnosis(diagnosis):
+    return patients_by_diagnosis.get(diagnosis)
+
+
+def search_patients(query, fields=None, fuzzy=0, limit=50):
+    """Patient ids whose name, history, diagnoses, treatments or prescriptions hold every word of query.
+
+    Words match as prefixes ("pras kum"); fuzzy=1 or 2 also forgives typos.
+    """
+    return search_index.search(query, fields, fuzzy=fuzzy, limit=limit)
+
+
+def analyze_hospital_efficiency(metrics_type, time_period):
+    if metrics_type == "appointments":
+        count = appointments_by_date.count_in(time_period)
+        emit("efficiency_metric", f"Appointments in period: {count}", metric=metrics_type, value=count)
+        return count
+    elif metrics_type == "admissions":
+        count = admissions_by_date.count_in(time_period)
+        emit("efficiency_metric", f"Admissions in period: {count}", metric=metrics_type, value=count)
+        return count
+    return 0
+
+
+@locked(BEDS, patient="patient_id")
+@journaled
+def manage_discharge_process(patient_id, discharge_date, follow_up_instructions):
+    discharge = {
+        "patient_id": patient_id,
+        "discharge_date": discharge_date,
+        "follow_up": follow_up_instructions
+    }
+    discharges.append(discharge)
+    beds.release(patient_id)
+    room = room_assignments.get(patient_id)
+    if room is not None:
+        patients_by_room.discard(room["room_type"], patient_id)
+    report_cache.invalidate(("patient", patient_id))
+    emit("patient_discharged", f"Patient {patient_id} discharged successfully.", patient_id=patient_id)
+
+
+
+def reset_state():
+    """Start every store empty again, e.g. in a shard worker or between benchmark runs."""
+    namespace = globals()
+    for name in STORES:
+        namespace[name] = type(namespace[name])()
+    report_cache.clear()
+
+
+def enable_journal(directory):
+    global journal
+    # Replayed calls must not be appended again, so the journal is only installed once restored.
+    journal = None
+    restored = Journal(directory, _stores, hold=locks.holding_all)
+    restored.restore(globals(), JOURNAL_OPS)
+    journal = restored
+    report_cache.clear()
+    return journal
+
+
+def _stores():
+    return {name: globals()[name] for name in STORES}
+
+
+def enable_metrics(slow_call_threshold=None):
+    """Time every operation in OPERATIONS; with a threshold, also sample stacks of slower calls."""
+    global metrics
+    if metrics is None:
+        from .metrics import Metrics
+
+        metrics = Metrics(_stores)
+        metrics.instrument(globals(), OPERATIONS)
+    if slow_call_threshold is not None:
+        metrics.sample_slow_calls(slow_call_threshold)
+    return metrics
+
+
+def disable_metrics():
+    """Put the untimed operations back; returns the Metrics collected so far."""
+    global metrics
+    previous, metrics = metrics, None
+    if previous is not None:
+        previous.uninstrument()
+    return previous
+
+
+def export_metrics(format="prometheus"):
+    """Prometheus text or a JSON-ready dict; store sizes are reported even with metrics off."""
+    current = metrics
+    if current is None:
+        from .metrics import Metrics
+
+        current = Metrics(_stores)
+    return current.prometheus() if format == "prometheus" else current.snapshot()
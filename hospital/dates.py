@@ -0,0 +1,34 @@
+from datetime import date, datetime
+
+DATE_FORMAT = "%d-%m-%Y"
+DATETIME_FORMAT = "%d-%m-%Y %H:%M"
+DISPLAY_DATE = "%B %d, %Y"
+PARSED_MAX = 65536
+
+# A plain dict rather than functools.lru_cache, which would import functools and
+# collections with the package; it is emptied whenever it fills up.
+_parsed = {}
+
+
+def _strptime(value, fmt):
+    try:
+        return _parsed[value, fmt]
+    except KeyError:
+        pass
+    if len(_parsed) >= PARSED_MAX:
+        _parsed.clear()
+    parsed = _parsed[value, fmt] = datetime.strptime(value, fmt)
+    return parsed
+
+
+def to_datetime(value, fmt=DATE_FORMAT):
+    """Parse a date string once; datetimes and dates pass through unchanged."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return _strptime(value, fmt)
+
+
+def today():
+    return datetime.today()
@@ -0,0 +1,154 @@
+"""The walkthroughs that used to run whenever hospital.py or main hospital.py was imported."""
+
+
+def run_core():
+    """One patient through hospital.core, from registration to discharge."""
+    from .core import (add_medical_staff, assign_room, create_medical_record, generate_patient_report,
+                       manage_discharge_process, process_billing, record_vitals, register_patient)
+
+    # Step 1: Register patient
+    register_patient("P12345", {
+        "name": "Prasanna kumar",
+        "age": 45,
+        "gender": "Male",
+        "blood_type": "B+"
+    }, [], {
+        "provider": "Star Health",
+        "policy_number": "SH789456",
+        "coverage_percent": 0.80
+    })
+
+    # Step 2: Add doctor
+    add_medical_staff("D100", "Dr. Sanjana satapathy ", "Cardiology", "Day", "1234567890")
+
+    # Step 3: Assign room
+    assign_room("P12345", "204-A (General Ward)", "March 15, 2025", 3)
+
+    # Step 4: Create medical record
+    create_medical_record("P12345", "D100", "Hypertension", "Routine monitoring", [
+        "Metoprolol 50mg - Twice daily",
+        "Aspirin 75mg - Once daily",
+        "Atorvastatin 20mg - Bedtime"
+    ])
+
+    # Step 5: Record vitals
+    record_vitals("P12345", {
+        "Blood Pressure": "130/85 mmHg",
+        "Heart Rate": "78 BPM",
+        "Temperature": "98.6°F",
+        "Oxygen Saturation": "97%"
+    })
+
+    # Step 6: Generate patient dashboard
+    generate_patient_report("P12345", "dashboard")
+
+    # Step 7: Process billing
+    process_billing("P12345", [
+        {"name": "Room Charges (3 days)", "cost": 4500},
+        {"name": "Doctor Consultation", "cost": 2000},
+        {"name": "ECG test", "cost": 800},
+        {"name": "Blood tests", "cost": 1200},
+        {"name": "Medication", "cost": 1800},
+        {"name": "Nursing care", "cost": 2400}
+    ], 0.80)
+
+    # Step 8: Discharge
+    manage_discharge_process("P12345", "March 18, 2025", "Follow up in 2 weeks")
+
+
+def run_frontdesk():
+    """The front-desk walkthrough: two patients, three doctors and one stay."""
+    from .frontdesk import (add_medical_staff, analyze_hospital_efficiency, assign_room, create_medical_record,
+                            doctors_schedule, generate_patient_report, manage_discharge_process, process_billing,
+                            register_patient, schedule_appointment)
+
+    print("--23--6--25--")
+    register_patient(123,"Romi",{"age":21,"gender":"Male","blood_type":"O+"},"Diabetes",{"company":"Star Health","policy_no":92394412})
+    register_patient(183,"Alex",{"age":27,"gender":"Male","blood_type":"A+"},"Fracture",{"company":"TX Health","policy_no":67677676})
+
+    add_medical_staff(101123,"Dr.Subhash Rao","General Doctor",[
+        {"day": "Monday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "OPD"},
+        {"day": "Tuesday", "shift": "Evening", "start": "14:00", "end": "20:00", "location": "OPD"},
+        {"day": "Wednesday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "Wards"},
+        {"day": "Thursday", "shift": "Evening", "start": "14:00", "end": "20:00", "location": "Emergency"},
+        {"day": "Friday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "OPD"},
+        {"day": "Saturday", "shift": "Full Day", "start": "08:00", "end": "20:00", "location": "OPD/Wards"},
+        {"day": "Sunday", "shift": "Off", "start": "-", "end": "-", "location": "-"}] , 9929929292)
+    add_medical_staff(101243,"Dr.Jay Kumar","emergency doctor",[
+        {"day": "Monday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "Cardiology OPD"},
+        {"day": "Tuesday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "Cardiology Ward"},
+        {"day": "Wednesday", "shift": "Evening", "start": "14:00", "end": "20:00", "location": "ICU"},
+        {"day": "Thursday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "Cath Lab"},
+        {"day": "Friday", "shift": "Full Day", "start": "08:00", "end": "20:00", "location": "OPD & Ward"},
+        {"day": "Saturday", "shift": "On Call", "start": "-", "end": "-", "location": "-"},
+        {"day": "Sunday", "shift": "Off", "start": "-", "end": "-", "location": "-"}
+    ], 8800978213)
+    add_medical_staff(101143,"Dr.Santosh","Ortho Surgeon",[
+        {"day": "Monday", "shift": "Evening", "start": "14:00", "end": "20:00", "location": "Neuro OPD"},
+        {"day": "Tuesday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "Neuro Ward"},
+        {"day": "Wednesday", "shift": "Full Day", "start": "08:00", "end": "20:00", "location": "Neurology & ICU"},
+        {"day": "Thursday", "shift": "Off", "start": "-", "end": "-", "location": "-"},
+        {"day": "Friday", "shift": "Evening", "start": "14:00", "end": "20:00", "location": "Neuro OPD"},
+        {"day": "Saturday", "shift": "Morning", "start": "08:00", "end": "14:00", "location": "Neuro Ward"},
+        {"day": "Sunday", "shift": "Off", "start": "-", "end": "-", "location": "-"}
+    ], 7800978543)
+
+    # schedule_appointment(123, 101123, '1-7-2025 8:00', "Consultation")
+    # schedule_appointment(123, 101123, '1-7-2025 9:00', "Consultation")
+    schedule_appointment(183, 101143, '1-7-2025 9:00', "Follow Up")
+
+    # doctors_schedule(101123)
+    doctors_schedule(101143)
+
+    # create_medical_record(123, "Type 2 Diabetes Mellitus", "Lifestyle changes, blood sugar monitoring, and oral medications", [
+    #     {"medicine": "Metformin", "dosage": "500mg", "frequency": "Twice a day"},
+    #     {"medicine": "Glimepiride", "dosage": "2mg", "frequency": "Once a day"},
+    # ], 101123)
+    create_medical_record(183, "hairline tratment in radius bone", "Immobilization,physiotherapy",[
+        {"medicine": "Ibuprofen", "dosage": "500mg", "frequency": "Twice a day"},
+        {"medicine": "Shelcal", "dosage": "500mg", "frequency": "Once a day"},
+    ] ,101143)
+
+    # assign_room(123,"general room","1-7-2025",4)
+    assign_room(183,"private room","2-7-2025",5)
+
+    # manage_discharge_process(123,"1-7-2025","4-7-2025","Eat oil free food")
+    manage_discharge_process(183,"2-7-2025","7-7-2025","Bed rest and physiotherapy")
+
+    # process_billing(123, {
+    #     "Room Charges(3 days)":4500,
+    #     "Doctor Charges":2000,
+    #     "Consultation": 1500,
+    #     "X-Ray": 800,
+    #     "Blood Test": 500
+    # }, 70)
+    process_billing(183, {
+        "Room Charges(5 days)":15000,
+        "Doctor Charges":2000,
+        "X-Ray": 800,
+        "Blood Test": 500,
+        "Fracture Plaster (POP)":2500
+    }, 80)
+
+    # generate_patient_report(123,{
+    #     "blood_test": "Blood Test",
+    #     "urine_test": "Urine Test",
+    #     "xray": "X-Ray",
+    #     "mri": "MRI Scan",
+    #     "ct_scan": "CT Scan",
+    #     "ultrasound": "Ultrasound",
+    #     "ecg": "ECG",
+    #     "pathology": "Pathology Report",
+    #     "surgery_summary": "Surgery Summary"
+    # })
+    generate_patient_report(183,{
+        "blood_test": "Blood Test",
+        "xray": "X-Ray",
+        "mri": "MRI Scan",
+        "ct_scan": "CT Scan",
+        "ultrasound": "Ultrasound",
+        "ecg": "ECG",
+        "surgery_summary": "Surgery Summary"
+    })
+
+    analyze_hospital_efficiency("bed_occupancy_rate",('1-7-2025','7-7-2025'))
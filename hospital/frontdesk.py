@@ -0,0 +1,1065 @@
+import io
+from datetime import timedelta
+from .availability import SLOT_MINUTES, AvailabilityBook
+from .beds import BedAllocator
+from .billing import BillingBatch, bill_patient, coverage_label, room_charge_name
+from .bulk import BulkResult, as_id, nested, read_rows
+from .dates import DATETIME_FORMAT, DISPLAY_DATE, to_datetime, today
+from .indexes import SecondaryIndex, SortedIndex
+from .interval_index import IntervalIndex
+from .journal import Journal, journaled
+from .locks import StripedLocks, locked
+from .occupancy import OccupancyCounter
+from .output import emit
+from .pharmacy import MedicationInventory
+from .records import Appointment, Emergency, Patient, Staff
+from .report import Each, Template, write_reports
+from .search import SearchIndex
+from .stay_log import StayLog
+from .tariff import TariffBook, rate_card, room_code
+from .triage import TriageQueue, severity_rank
+
+medical_staffs={}
+patient= {}
+
+
+appointment={}
+appointment_index={}
+medical_record={}
+billing={}
+
+emergency={}
+
+pharmacy=MedicationInventory()
+assigned_rooms={}
+patient_report={}
+discharged_patients={}
+
+hopspital_efficiency=[]
+stay_log=StayLog()
+occupancy=OccupancyCounter()
+triage=TriageQueue()
+availability=AvailabilityBook()
+# Secondary indexes over the stores above; dates are keyed by calendar day.
+appointments_by_patient=SecondaryIndex()
+appointments_by_date=SortedIndex()
+patients_by_room=SecondaryIndex()
+discharges_by_room=SecondaryIndex()
+admissions_by_date=SortedIndex()
+patients_by_diagnosis=SecondaryIndex()
+search_index=SearchIndex()
+STORES=("medical_staffs","patient","appointment","appointment_index","medical_record","billing","emergency",
+        "pharmacy","rooms","assigned_rooms","patient_report","discharged_patients","hopspital_efficiency",
+        "stay_log","occupancy","triage","beds","tariffs","appointments_by_patient","appointments_by_date",
+        "patients_by_room","discharges_by_room","admissions_by_date","patients_by_diagnosis","availability",
+        "search_index")
+# Public operations that enable_metrics() times.
+OPERATIONS=("register_patient","add_medical_staff","schedule_appointment","earliest_free_slot","book_first_available",
+            "doctors_schedule","write_doctor_schedules","create_medical_record","manage_emergency_admission",
+            "reprioritize_emergency","dispatch_triage","track_medication_inventory","dispense_prescription",
+            "medications_expiring","assign_room","reserve_bed","forecast_free_beds","manage_discharge_process",
+            "process_billing","load_rate_card","set_tariff","rebill_discharged","calculate_treatment_cost",
+            "generate_patient_report","write_patient_reports","write_ward_discharge_summaries",
+            "appointments_for_patient","appointments_on","admissions_between","patients_in_room",
+            "patients_with_diagnosis","search_patients","analyze_hospital_efficiency","register_patients_bulk",
+            "add_medical_staff_bulk","schedule_appointments_bulk","track_medication_inventory_bulk")
+journal=None
+JOURNAL_OPS={}  # op name -> journaled function, filled in by @journaled
+metrics=None
+# Per-entity lock stripes; BEDS and PHARMACY guard the shared bed and stock pools,
+# BILLING whole-hospital billing runs and TARIFFS the price book.
+locks=StripedLocks()
+BEDS=("beds",)
+PHARMACY=("pharmacy",)
+BILLING=("billing",)
+TARIFFS=("tariffs",)
+records=[]
+
+@locked(patient="patient_id")
+@journaled
+def register_patient(patient_id,name,personal_info, medical_history, insurance_info):
+    if patient_id in emergency:
+        patient[patient_id].update({"name":name,"personal_info":personal_info,"medical_history":medical_history,"insurance_info":insurance_info})
+        _index_patient(patient_id, name, medical_history)
+        return
+    if patient_id  not in patient:
+        patient.update({ patient_id:Patient(name=name,
+                personal_info=personal_info,
+                medical_history=medical_history,
+                insurance_info=insurance_info)
+    })
+        _index_patient(patient_id, name, medical_history)
+        emit("patient_registered", f"Registration of {patient_id} ID successfull", patient_id=patient_id)
+
+    else:
+        emit("patient_exists", "Already Registered", patient_id=patient_id)
+
+
+
+def _index_patient(patient_id, name, medical_history):
+    search_index.index(patient_id, "name", name)
+    search_index.index(patient_id, "medical_history", medical_history)
+
+
+@locked(staff="staff_id")
+@journaled
+def add_medical_staff(staff_id, name, specialization, shift_schedule, contact_info):
+ if staff_id not in medical_staffs:
+   medical_staffs.update({
+       staff_id:Staff(name=name,
+            specialization=specialization,
+            shift_schedule=shift_schedule,
+            contact_info=contact_info)
+   })
+   availability.add_doctor(staff_id, specialization, shift_schedule)
+   emit("staff_added", f"Medical Staff ('ID'{staff_id}) is added ", staff_id=staff_id)
+ else:
+     emit("staff_exists", "The Staff already exists", staff_id=staff_id)
+
+
+
+@locked(patient="patient_id", doctor="doctor_id")
+@journaled
+def schedule_appointment(patient_id, doctor_id, appointment_date, appointment_type, duration=30):
+    appt_datetime = to_datetime(appointment_date, DATETIME_FORMAT)
+    appt_end = appt_datetime + timedelta(minutes=duration)
+
+    if doctor_id not in appointment:
+        appointment[doctor_id] = []
+        appointment_index[doctor_id] = IntervalIndex()
+    if appointment_index[doctor_id].overlapping(appt_datetime, appt_end) is not None:
+        emit("appointment_conflict", "Appointment Conflict", doctor_id=doctor_id, appointment_date=appt_datetime)
+        return
+    if not availability.on_shift(doctor_id, appt_datetime, duration):
+        emit("appointment_off_shift", "The doctor is not on shift at that time", doctor_id=doctor_id, appointment_date=appt_datetime)
+        return
+
+    if patient_id in patient and doctor_id in medical_staffs:
+        appt = Appointment(
+            patient_id=patient_id,
+            doctor_id=doctor_id,
+            appointment_date=appt_datetime,
+            appointment_type=appointment_type,
+            duration=duration
+        )
+        appointment[doctor_id].append(appt)
+        appointment_index[doctor_id].add(appt_datetime, appt_end, appt)
+        availability.book(doctor_id, appt_datetime, duration)
+        appointments_by_patient.add(patient_id, appt)
+        appointments_by_date.add(appt_datetime.date(), appt)
+        emit("appointment_scheduled", f"""The appointment has been scheduled at {appointment_date}
+with {medical_staffs[doctor_id].name}""", patient_id=patient_id, doctor_id=doctor_id, appointment_date=appt_datetime)
+        patient[patient_id].update({"doctor":doctor_id})
+        return appt
+    else:
+        emit("appointment_rejected", "Register the patient or doctor first", patient_id=patient_id, doctor_id=doctor_id)
+
+
+# The check and the booking run under the patient and doctor locks, so two
+# clients can never both get the same slot.
+book_if_free=schedule_appointment
+
+
+def earliest_free_slot(specialization, after=None, duration=30):
+    """(start, doctor_id) of the first free on-shift slot in a specialization, or None."""
+    after=to_datetime(after, DATETIME_FORMAT) if after else today()
+    return availability.earliest_for(specialization, after, duration)
+
+
+def book_first_available(patient_id, specialization, appointment_type, after=None, duration=30):
+    """Book the earliest free slot with any doctor of the specialization."""
+    if patient_id not in patient:
+        emit("appointment_rejected", "Register the patient or doctor first", patient_id=patient_id)
+        return
+    while True:
+        found=earliest_free_slot(specialization, after, duration)
+        if found is None:
+            emit("no_free_slot", f"No free {specialization} slot found", patient_id=patient_id, specialization=specialization)
+            return
+        start,doctor_id=found
+        # Another client may have taken the slot first; look again after it.
+        appt=schedule_appointment(patient_id, doctor_id, start, appointment_type, duration)
+        if appt is not None:
+            return appt
+        after=start+timedelta(minutes=SLOT_MINUTES)
+
+
+DOCTOR_SCHEDULE=Template("schedule",(
+    "{doctor} - ({specialization})",
+    "{date}",
+    Each("appointments","{0} - Patient ID: {1} ({2})",
+         header=("Today's Appointments:","----------------------"),empty="No appointments today."),
+),fields=("doctor_id","doctor","specialization","date","appointments"))
+
+
+def doctor_slots(doctor_id, day):
+    """The doctor's appointments starting on day's date, in time order."""
+    if doctor_id not in appointment_index:
+        return []
+    start=to_datetime(day).replace(hour=0,minute=0,second=0,microsecond=0)
+    return appointment_index[doctor_id].starting_between(start,start+timedelta(days=1))
+
+
+def _schedule_row(doctor_id, day):
+    doctor=medical_staffs[doctor_id]
+    todays=doctor_slots(doctor_id, day)
+    return {"doctor_id":doctor_id,"doctor":doctor.name,"specialization":doctor.specialization,
+            "date":day.strftime(DISPLAY_DATE),
+            "appointments":[(a.appointment_date.strftime('%H:%M'),a.patient_id,a.appointment_type) for a in todays]}
+
+
+def doctors_schedule(doctor_id):
+    if doctor_id not in appointment or doctor_id not in medical_staffs:
+        emit("doctor_not_found", "Doctor not found or has no appointments", doctor_id=doctor_id)
+        return
+    emit("doctor_schedule", DOCTOR_SCHEDULE.render(_schedule_row(doctor_id, today())), doctor_id=doctor_id)
+
+
+def write_doctor_schedules(stream, format="text", day=None):
+    """Stream today's (or day's) schedule for every doctor with appointments."""
+    day=to_datetime(day) if day else today()
+    doctor_ids=[d for d in appointment if d in medical_staffs]
+    return write_reports(DOCTOR_SCHEDULE, (_schedule_row(d, day) for d in doctor_ids), stream, format)
+
+
+
+
+
+        
+
+
+def create_medical_record(patient_id, diagnosis, treatment, prescription,doctor_id=101243 ):
+    # Dispensing depends on the day, so it is fixed here and journaled with the call.
+    _create_medical_record(patient_id, diagnosis, treatment, prescription, doctor_id, today())
+
+
+@locked(PHARMACY, patient="patient_id")
+@journaled
+def _create_medical_record(patient_id, diagnosis, treatment, prescription, doctor_id, dispensed_on):
+    if any(app.doctor_id==doctor_id for app in appointments_by_patient.get(patient_id)):
+        if patient_id in medical_record:
+            patients_by_diagnosis.discard(medical_record[patient_id]["diagnosis"], patient_id)
+        medical_record.update({
+            patient_id:{"doctor_id":doctor_id, "diagnosis":diagnosis, "treatment":treatment, "prescription":prescription}
+        })
+        patients_by_diagnosis.add(diagnosis, patient_id)
+        search_index.index(patient_id, "diagnosis", diagnosis)
+        search_index.index(patient_id, "treatment", treatment)
+        search_index.index(patient_id, "prescription", [i["medicine"] for i in prescription])
+        emit("medical_record_created", "Medical record Created", patient_id=patient_id, doctor_id=doctor_id)
+        dispense_prescription(patient_id, prescription, dispensed_on)
+    else:
+        emit("medical_record_rejected", "Register the patient ", patient_id=patient_id, doctor_id=doctor_id)
+
+
+@locked(BEDS, patient="patient_id")
+@journaled
+def manage_emergency_admission(patient_id,admission_date,emergency_type, severity_level):
+    # Both are checked before anything is recorded.
+    severity_rank(severity_level)
+    admission_date=to_datetime(admission_date)
+    emergency.update({
+        patient_id:Emergency(patient_id=patient_id,emergency_type=emergency_type,admission_date=admission_date,severity_level=severity_level)
+    })
+    if patient_id not in patient:
+        patient.update({ patient_id:Patient(medical_history="Emergency")
+        })
+        _index_patient(patient_id, None, "Emergency")
+    triage.admit(patient_id, severity_level)
+    emit("emergency_queued", f"Emergency patient {patient_id} queued for triage", patient_id=patient_id, severity=severity_level)
+    dispatch_triage(admission_date)
+
+
+@locked(BEDS, patient="patient_id")
+@journaled
+def reprioritize_emergency(patient_id, severity_level):
+    if patient_id not in triage:
+        emit("emergency_not_waiting", f"Patient {patient_id} is not waiting in triage", patient_id=patient_id)
+        return
+    severity_rank(severity_level)
+    emergency[patient_id]["severity_level"]=severity_level
+    triage.reprioritize(patient_id, severity_level)
+
+
+def _assign(patient_id, room):
+    previous=assigned_rooms.get(patient_id)
+    if previous is not None:
+        patients_by_room.discard(previous["room_type"], patient_id)
+        admissions_by_date.discard(previous["admission_date"].date(), patient_id)
+    assigned_rooms[patient_id]=room
+    patients_by_room.add(room["room_type"], patient_id)
+    admissions_by_date.add(room["admission_date"].date(), patient_id)
+
+
+def dispatch_triage(admission_date):
+    # Give free beds to the most severe waiting patients, emergency room first.
+    admitted=[]
+    while triage:
+        patient_id,severity_level=triage.peek()
+        if beds.bed_of(patient_id) is not None:
+            triage.pop_next()
+            continue
+        taken=beds.allocate_first(EMERGENCY_ROOMS, patient_id, admission_date)
+        if taken is None:
+            break
+        triage.pop_next()
+        room_type,bed=taken
+        _assign(patient_id, {"room_type":room_type,"bed":bed,"admission_date":admission_date,"exp_duaration":None})
+        occupancy.admit(admission_date)
+        patient[patient_id]["room_type"]=room_type
+        patient[patient_id]["doctor"]=101243
+        emit("emergency_admitted", f"Emergency patient {patient_id} admitted to {room_type}",
+             patient_id=patient_id, room_type=room_type, severity=severity_level)
+        admitted.append((patient_id, room_type))
+    return admitted
+
+
+def track_medication_inventory(medication_id, quantity, expiry_date, supplier, reorder_level=None):
+    # Expiry is judged against the day of delivery, which is journaled with the call.
+    _track_medication_inventory(medication_id, quantity, expiry_date, supplier, reorder_level, today())
+
+
+@locked(PHARMACY)
+@journaled
+def _track_medication_inventory(medication_id, quantity, expiry_date, supplier, reorder_level, received_on):
+    expiry_date=to_datetime(expiry_date)
+    if reorder_level is not None:
+        pharmacy.set_threshold(medication_id, reorder_level)
+    if expiry_date<received_on:
+        emit("medication_expired", "THE MEDICINE HAS EXPIRED", medication_id=medication_id)
+    else:
+        pharmacy.add_lot(medication_id, quantity, expiry_date, supplier)
+        emit("inventory_updated", "The Medicine has been added to the inventory!", medication_id=medication_id)
+
+
+def dispense_prescription(patient_id, prescription, now=None):
+    # Prescribed medicines are looked up by name; untracked ones are left to the ward.
+    now=now or today()
+    for item in prescription:
+        name=item["medicine"]
+        if name not in pharmacy:
+            continue
+        if pharmacy.dispense(name, item.get("quantity", 1), now) is None:
+            emit("medication_short", f"Not enough {name} in stock for patient {patient_id}", patient_id=patient_id, medication_id=name)
+        elif pharmacy.is_low(name):
+            emit("medication_low", f"{name} is below its reorder level ({pharmacy.on_hand(name)} left)", medication_id=name)
+
+
+def medications_expiring(days):
+    return pharmacy.expiring_within(days, today())
+def _open_wards():
+    """The standard wards, their list prices and their beds, as (rooms, tariffs, beds)."""
+    rooms={
+            "general room":{"beds":20},
+            "private room":{"beds":15},
+            "emergency room":{"beds":10}
+        }
+    # List prices per room-day; rate cards loaded later override them per insurer and date.
+    tariffs=TariffBook([(room_code("general room"),"general room",1500,None,None),
+                        (room_code("private room"),"private room",3000,None,None),
+                        (room_code("emergency room"),"emergency room",5000,None,None)])
+    beds=BedAllocator({room_type:room["beds"] for room_type,room in rooms.items()})
+    return rooms,tariffs,beds
+
+
+rooms,tariffs,beds=_open_wards()
+TOTAL_BEDS=beds.capacity()
+EMERGENCY_ROOMS=("emergency room","general room","private room")
+@locked(BEDS, patient="patient_id")
+@journaled
+def assign_room(patient_id, room_type, admission_date, expected_duration):
+   
+    # Everything that can reject the request runs before a bed is taken.
+    room_type=room_type.lower()
+    record=patient[patient_id]
+    admission_date=to_datetime(admission_date)
+    expected_release=admission_date+timedelta(days=expected_duration) if expected_duration else None
+    bed=beds.allocate(room_type, patient_id, admission_date, expected_release)
+    if bed is not None:
+        _assign(patient_id, {"room_type":room_type,"bed":bed,"admission_date":admission_date,"exp_duaration":expected_duration})
+        occupancy.admit(admission_date)
+        record["room_type"]=room_type
+    else:
+        emit("room_unavailable", f"Currently the {room_type} is unavailable Opt for other rooms", patient_id=patient_id, room_type=room_type)
+    return bed
+
+
+@locked(BEDS, patient="patient_id")
+@journaled
+def reserve_bed(patient_id, room_type, until):
+    until=to_datetime(until)
+    bed=beds.reserve(room_type.lower(), patient_id, until)
+    if bed is None:
+        emit("room_unavailable", f"Currently the {room_type} is unavailable Opt for other rooms", patient_id=patient_id, room_type=room_type)
+    else:
+        emit("bed_reserved", f"Bed {bed} reserved for {patient_id} until {until.strftime(DISPLAY_DATE)}", patient_id=patient_id, bed=bed)
+    return bed
+
+
+def forecast_free_beds(room_type, on_date):
+    return beds.forecast(room_type.lower(), to_datetime(on_date))
+
+
+@locked(BEDS, patient="patient_id")
+@journaled
+def manage_discharge_process(patient_id,admission_date, discharge_date, follow_up_instructions):
+    admission_date=to_datetime(admission_date)
+    discharge_date=to_datetime(discharge_date)
+    if beds.release(patient_id) is not None:
+        a=patient[patient_id].pop("room_type")
+        patients_by_room.discard(a, patient_id)
+        discharges_by_room.add(a, patient_id)
+        occupancy.discharge(discharge_date)
+        emit("patient_discharged", f"The patient has been Discharged from {a} ", patient_id=patient_id, room_type=a)
+        dispatch_triage(discharge_date)
+    else:
+        occupancy.record_stay(admission_date, discharge_date)
+    discharged_patients.update({patient_id:{"discharge_date":discharge_date,"follow_up_instructions":follow_up_instructions}})
+    hopspital_efficiency.append({"patient_id":patient_id,"admission_date":admission_date,"discharge_date":discharge_date})
+    stay_log.append(admission_date, discharge_date)
+
+
+# The front desk takes coverage as a whole percent and bills the insurer's exact share.
+COVERAGE={"percent":True,"coverage_unit":1}
+
+
+@locked(patient="patient_id")
+@journaled
+def process_billing(patient_id, services_list, insurance_coverage):
+    admi_date=assigned_rooms[patient_id]["admission_date"]
+    disc_date=discharged_patients[patient_id]["discharge_date"]
+    insurer=(patient[patient_id].insurance_info or {}).get("company")
+    services_list=tariffs.price_services(services_list,insurer,disc_date)
+    bill=bill_patient(patient_id,services_list,insurance_coverage,**COVERAGE)
+    bill.services=services_list
+    billing.update({patient_id:bill})
+   
+    
+    lines=[f"""=== BILLING SUMMARY ===
+Patient: {patient[patient_id].name}
+Admission Date: {admi_date.strftime(DISPLAY_DATE)}
+Discharge Date: {disc_date.strftime(DISPLAY_DATE)}
+Service Charges:"""]
+    for service in services_list:
+        lines.append(f"{service['name']}:{service['cost']}")
+        
+    lines.append(f"Total bill : {bill.total_cost}")
+    if bill.insurance_coverage :
+        lines.append(f"Insurance ({coverage_label(insurance_coverage,percent=True)}) : {bill.insurance_coverage}")
+        lines.append(f"patient responsibility : {bill.amount_due}")
+    else:
+        lines.append("You have no insurance coverage")
+        lines.append(f"Patient Responsibility : {bill.amount_due}")
+    emit("billing_summary", "\n".join(lines), patient_id=patient_id, total_cost=bill.total_cost)
+    return bill
+
+
+def load_rate_card(source):
+    # Files and generators are read here, so the journal only ever holds a path or the rows.
+    _load_rate_card(rate_card(source))
+
+
+@locked(TARIFFS)
+@journaled
+def _load_rate_card(card):
+    tariffs.load(card)
+    emit("rate_card_loaded", "The rate card will be used for the next bills", version=tariffs.version)
+
+
+@locked(TARIFFS)
+@journaled
+def set_tariff(code, price, name=None, insurer=None, effective_from=None):
+    tariffs.set_price(code,price,name,insurer,effective_from)
+    emit("tariff_updated", f"The price of {code} is now {price}", code=code, insurer=insurer)
+
+
+# BEDS keeps discharges, which add to discharged_patients, out while it runs.
+@locked(BEDS, BILLING)
+@journaled
+def rebill_discharged(services, insurance_coverage, caps=None):
+    """Re-bill every discharged patient in one batch.
+
+    services maps patient id to {name: cost} or a list of tariff codes, and
+    insurance_coverage to its coverage percent; room-day charges are priced from the tariff
+    as of the discharge date.
+    """
+    caps=caps or {}
+    batch=BillingBatch(**COVERAGE)
+    for patient_id,discharge in discharged_patients.items():
+        insurer=(patient[patient_id].insurance_info or {}).get("company") if patient_id in patient else None
+        on=discharge["discharge_date"]
+        batch.add_patient(patient_id,insurance_coverage.get(patient_id,0),caps.get(patient_id))
+        room=assigned_rooms.get(patient_id)
+        if room is not None:
+            days=(on-room["admission_date"]).days
+            batch.add_service(patient_id,room_charge_name(days),days*tariffs.price(room_code(room["room_type"]),insurer,on))
+        batch.add_services(patient_id,tariffs.price_services(services.get(patient_id,{}),insurer,on))
+    bills=batch.run()
+    billing.update({bill.patient_id:bill for bill in bills})
+    emit("billing_batch", f"Billed {len(bills)} discharged patients", patients=len(bills))
+    return bills
+
+def calculate_treatment_cost(patient_id, treatment_plan, insurance_details):
+    ins=insurance_details
+    treatment_plan=tariffs.price_services(treatment_plan,ins.get("company"))
+    bill=bill_patient(patient_id,treatment_plan,ins["coverage"],**COVERAGE)
+    cost=bill.total_cost
+        
+    admi_date=assigned_rooms[patient_id]["admission_date"]
+    disc_date=discharged_patients[patient_id]["discharge_date"]
+    lines=[f"""=== BILLING SUMMARY ===
+Patient: {patient[patient_id].name}
+Admission Date: {admi_date.strftime(DISPLAY_DATE)}
+Discharge Date: {disc_date.strftime(DISPLAY_DATE)}""", f"The cost of the Treatment : {cost}"]
+    if ins["coverage"]:
+        lines.append(f"The insurance coverage {coverage_label(ins['coverage'],percent=True)} : {bill.insurance_coverage}")
+        lines.append(f"Patients responsibility :{bill.amount_due}")
+    else:
+        lines.append("You have no insurance coverage")
+        lines.append(f"Patients Responsibility : {cost}")
+    emit("treatment_cost", "\n".join(lines), patient_id=patient_id, total=cost)
+
+
+
+PATIENT_REPORT=Template("patient",(
+    "",
+    "---PATIENT REPORT---",
+    "Patient Name : {name} ('ID'{patient_id})",
+    "Age : {age}| Gender :{gender}| Blood Type : {blood_type}",
+    "Insurance : {insurer} ('ID'{policy_no})",
+    "Current Status : {status}",
+    "Room : {room_type}",
+    "Admitted : {admitted}",
+    "Attending Doctor : {doctor} ",
+    "Recent Vitals ({printed_at}:)",
+    Each("vitals","{0}:{1}"),
+    "Active Medications : ",
+    Each("medications","{0} ({1}) : {2}"),
+))
+DISCHARGE_SUMMARY=Template("discharge",(
+    "",
+    "---DISCHARGE SUMMARY---",
+    "Patient Name : {name} ('ID'{patient_id})",
+    "Room : {room_type} ({bed})",
+    "Admitted : {admitted}",
+    "Discharged : {discharged}",
+    "Attending Doctor : {doctor} ",
+    Each("medications","{0} ({1}) : {2}",header=("Medications : ",)),
+    "Follow up : {follow_up}",
+))
+
+
+def _report_row(patient_id, printed_at, vitals=None):
+    p=patient[patient_id]
+    info=p.personal_info or {}
+    insurance=p.insurance_info or {}
+    room=assigned_rooms.get(patient_id,{})
+    discharge=discharged_patients.get(patient_id)
+    if discharge is not None:
+        status = "Discharged"
+    elif room:
+        status = "Inpatient"
+    else :
+        status = "Outpatient"
+    record=medical_record.get(patient_id,{})
+    return {"patient_id":patient_id,"name":p.name,"age":info.get("age"),"gender":info.get("gender"),
+            "blood_type":info.get("blood_type"),"insurer":insurance.get("company"),"policy_no":insurance.get("policy_no"),
+            "status":status,"room_type":room.get("room_type"),"bed":room.get("bed"),
+            "admitted":room["admission_date"].strftime(DISPLAY_DATE) if room else None,
+            "discharged":discharge["discharge_date"].strftime(DISPLAY_DATE) if discharge else None,
+            "follow_up":discharge["follow_up_instructions"] if discharge else None,
+            "doctor":medical_staffs[p.doctor].name if p.doctor in medical_staffs else None,
+            "printed_at":printed_at,"vitals":vitals if vitals is not None else patient_report.get(patient_id,{}),
+            "medications":[(i['medicine'],i['dosage'],i['frequency']) for i in record.get("prescription",())]}
+
+
+@locked(patient="patient_id")
+@journaled
+def generate_patient_report(patient_id, report_type):
+ if patient_id in medical_record:
+    patient_report.update({patient_id:report_type})
+    row=_report_row(patient_id,today().strftime('%B %d, %Y - %H:%M %p'),report_type)
+    emit("patient_report", PATIENT_REPORT.render(row), patient_id=patient_id, status=row["status"])
+        
+ else:
+     emit("medical_record_missing", "Create the Medical Record of the pateint", patient_id=patient_id)
+
+
+def write_patient_reports(patient_ids, stream, format="text"):
+    """Stream the patient report for many patients in one pass."""
+    printed_at=today().strftime('%B %d, %Y - %H:%M %p')
+    rows=(_report_row(pid,printed_at) for pid in patient_ids if pid in medical_record)
+    return write_reports(PATIENT_REPORT, rows, stream, format)
+
+
+def write_ward_discharge_summaries(room_type, stream, format="text", discharged_on=None):
+    """Discharge summaries for everyone discharged from a ward, optionally on one day."""
+    room_type=room_type.lower()
+    day=to_datetime(discharged_on).date() if discharged_on else None
+    patient_ids=[pid for pid in discharges_by_room.get(room_type) if pid in discharged_patients
+                 and (day is None or discharged_patients[pid]["discharge_date"].date()==day)]
+    return write_reports(DISCHARGE_SUMMARY, (_report_row(pid,None) for pid in patient_ids), stream, format)
+
+
+
+
+
+def appointments_for_patient(patient_id):
+    return appointments_by_patient.get(patient_id)
+
+
+def appointments_on(day):
+    day=to_datetime(day).date()
+    return appointments_by_date.get(day)
+
+
+def admissions_between(start_date, end_date):
+    """Patient ids admitted from start_date to end_date, both days included."""
+    start=to_datetime(start_date).date()
+    end=to_datetime(end_date).date()+timedelta(days=1)
+    return admissions_by_date.between(start, end)
+
+
+def patients_in_room(room_type):
+    return patients_by_room.get(room_type.lower())
+
+
+def patients_with_diagnosis(diagnosis):
+    return patients_by_diagnosis.get(diagnosis)
+
+
+def search_patients(query, fields=None, fuzzy=0, limit=50):
+    """Patient ids matching every word of query by name, history, diagnosis, treatment or medicine."""
+    return search_index.search(query, fields, fuzzy=fuzzy, limit=limit)
+
+
+def analyze_hospital_efficiency(metrics_type, time_period):
+    start_date, end_date = time_period
+    start_date = to_datetime(start_date)
+    end_date = to_datetime(end_date)
+
+    # The occupancy counter answers in O(log n); only the stay-based metrics
+    # need the pass over the stay log.
+    occupied_bed_days = occupancy.bed_days(start_date, end_date)
+    total_patients, total_stay_days = 0, 0
+    if metrics_type != "bed_occupancy_rate":
+        total_patients, total_stay_days = stay_log.overlap(start_date, end_date)
+
+    if total_patients == 0 and occupied_bed_days == 0:
+        emit("efficiency_no_data", "No patient data available for the selected period.", time_period=time_period)
+        return
+
+    analysis_days = (end_date - start_date).days + 1
+    metrics = {
+        "average_length_of_stay": total_stay_days / total_patients if total_patients else 0.0,
+        "bed_occupancy_rate": (occupied_bed_days / (TOTAL_BEDS * analysis_days)) * 100,
+        "patient_throughput": total_patients,
+    }
+    if metrics_type == "average_length_of_stay":
+        message=f"Average Length of Stay: {metrics[metrics_type]:.2f} days"
+    elif metrics_type == "bed_occupancy_rate":
+        message=f"Bed Occupancy Rate: {metrics[metrics_type]:.2f}%"
+    elif metrics_type == "patient_throughput":
+        message=f"Patient Throughput: {total_patients} patients"
+    elif metrics_type == "all":
+        return metrics
+    else:
+        emit("efficiency_invalid_metric", "Invalid metrics type. Please choose from: 'average_length_of_stay', 'bed_occupancy_rate', 'patient_throughput' or 'all'.", metric=metrics_type)
+        return
+    emit("efficiency_metric", message, metric=metrics_type, value=metrics[metrics_type])
+    return metrics[metrics_type]
+
+
+def reset_state():
+    """Start every store empty again with the standard wards reopened, e.g. between benchmark runs."""
+    namespace=globals()
+    for name in STORES:
+        namespace[name]=type(namespace[name])()
+    namespace["rooms"],namespace["tariffs"],namespace["beds"]=_open_wards()
+
+
+def enable_journal(directory):
+    global journal
+    # Replayed calls must not be appended again, so the journal is only installed once restored.
+    journal=None
+    restored=Journal(directory, _stores, hold=locks.holding_all)
+    restored.restore(globals(), JOURNAL_OPS)
+    journal=restored
+    return journal
+
+
+def _stores():
+    return {name: globals()[name] for name in STORES}
+
+
+def enable_metrics(slow_call_threshold=None):
+    """Time every operation in OPERATIONS, server ops included; a threshold also samples slow stacks."""
+    global metrics
+    if metrics is None:
+        from .metrics import Metrics
+        metrics=Metrics(_stores)
+        metrics.instrument(globals(), OPERATIONS, tables=(SERVICE_OPS,))
+    if slow_call_threshold is not None:
+        metrics.sample_slow_calls(slow_call_threshold)
+    return metrics
+
+
+def disable_metrics():
+    global metrics
+    previous,metrics=metrics,None
+    if previous is not None:
+        previous.uninstrument()
+    return previous
+
+
+def export_metrics(format="prometheus"):
+    current=metrics
+    if current is None:
+        from .metrics import Metrics
+        current=Metrics(_stores)
+    return current.prometheus() if format=="prometheus" else current.snapshot()
+
+
+def use_patient_table(path):
+    global patient
+    from .patient_table import PatientTable
+    table=PatientTable(path)
+    for patient_id,data in patient.items():
+        if patient_id not in table:
+            table[patient_id]=data
+    patient=table
+    return table
+
+
+# Bulk loaders validate every row in one pass, collect per-row errors in a
+# BulkResult instead of printing, and journal each accepted row as the
+# equivalent single call so a replay rebuilds the same state. Each row is
+# applied and journaled under the stripes its single call would take.
+
+def _journal_row(op, *args):
+    if journal is not None:
+        journal.append(op, args, {})
+
+
+def register_patients_bulk(rows, format=None):
+    result=BulkResult()
+    fields=("patient_id","name","personal_info","medical_history","insurance_info")
+    for row_number,row in read_rows(rows, fields, format):
+        try:
+            patient_id=as_id(row["patient_id"])
+            name=row["name"]
+            personal_info=nested(row, "personal_info", ("age","gender","blood_type"))
+            if isinstance(personal_info.get("age"), str):
+                personal_info["age"]=int(personal_info["age"])
+            insurance_info=nested(row, "insurance_info", ("company","policy_no"))
+            medical_history=row.get("medical_history")
+        except (KeyError, TypeError, ValueError) as e:
+            result.reject(row_number, f"invalid row: {e!r}")
+            continue
+        with locks.holding(("patient",patient_id)):
+            if patient_id in emergency:
+                patient[patient_id].update({"name":name,"personal_info":personal_info,"medical_history":medical_history,"insurance_info":insurance_info})
+            elif patient_id in patient:
+                result.reject(row_number, f"patient {patient_id} already registered")
+                continue
+            else:
+                patient[patient_id]=Patient(name=name, personal_info=personal_info,
+                                            medical_history=medical_history, insurance_info=insurance_info)
+            _index_patient(patient_id, name, medical_history)
+            _journal_row("register_patient", patient_id, name, personal_info, medical_history, insurance_info)
+        result.accepted+=1
+    return result
+
+
+def add_medical_staff_bulk(rows, format=None):
+    result=BulkResult()
+    fields=("staff_id","name","specialization","shift_schedule","contact_info")
+    for row_number,row in read_rows(rows, fields, format):
+        try:
+            staff_id=as_id(row["staff_id"])
+            values=(row["name"], row["specialization"], row.get("shift_schedule"), row.get("contact_info"))
+        except (KeyError, ValueError) as e:
+            result.reject(row_number, f"invalid row: {e!r}")
+            continue
+        with locks.holding(("staff",staff_id)):
+            if staff_id in medical_staffs:
+                result.reject(row_number, f"staff {staff_id} already exists")
+                continue
+            medical_staffs[staff_id]=Staff(*values)
+            availability.add_doctor(staff_id, values[1], values[2])
+            _journal_row("add_medical_staff", staff_id, *values)
+        result.accepted+=1
+    return result
+
+
+def schedule_appointments_bulk(rows, format=None):
+    result=BulkResult()
+    fields=("patient_id","doctor_id","appointment_date","appointment_type","duration")
+    parsed=[]
+    for row_number,row in read_rows(rows, fields, format):
+        try:
+            patient_id=as_id(row["patient_id"])
+            doctor_id=as_id(row["doctor_id"])
+            start=to_datetime(row["appointment_date"], DATETIME_FORMAT)
+            duration=int(row.get("duration") or 30)
+            appointment_type=row["appointment_type"]
+        except (KeyError, TypeError, ValueError) as e:
+            result.reject(row_number, f"invalid row: {e!r}")
+            continue
+        parsed.append((row_number, patient_id, doctor_id, start, duration, appointment_type))
+
+    # The conflict checks and the index rebuild run under every stripe that
+    # schedule_appointment would take for these rows, so no single booking
+    # can land in between.
+    keys=[key for _,patient_id,doctor_id,*_ in parsed for key in (("doctor",doctor_id),("patient",patient_id))]
+    with locks.holding(*keys):
+        candidates={}
+        for row_number,patient_id,doctor_id,start,duration,appointment_type in parsed:
+            if patient_id not in patient or doctor_id not in medical_staffs:
+                result.reject(row_number, "patient or doctor not registered")
+                continue
+            end=start+timedelta(minutes=duration)
+            index=appointment_index.get(doctor_id)
+            if index is not None and index.overlapping(start, end) is not None:
+                result.reject(row_number, "appointment conflict")
+                continue
+            if not availability.on_shift(doctor_id, start, duration):
+                result.reject(row_number, "doctor not on shift")
+                continue
+            appt=Appointment(patient_id=patient_id, doctor_id=doctor_id, appointment_date=start,
+                             appointment_type=appointment_type, duration=duration)
+            candidates.setdefault(doctor_id, []).append((start, end, (row_number, appt)))
+
+        # One sort per doctor: drop clashes inside the batch, then rebuild the index.
+        for doctor_id,intervals in candidates.items():
+            _, rejected=IntervalIndex.build(intervals)
+            clashed={id(item) for _, _, item in rejected}
+            for _, _, (row_number, _) in rejected:
+                result.reject(row_number, "appointment conflict")
+            accepted=[(start, end, item[1]) for start, end, item in intervals if id(item) not in clashed]
+            existing=appointment_index.get(doctor_id)
+            merged=list(zip(existing.starts, existing.ends, existing.items)) if existing is not None else []
+            appointment_index[doctor_id], _=IntervalIndex.build(merged+accepted)
+            doctor_appointments=appointment.setdefault(doctor_id, [])
+            for start, end, appt in accepted:
+                doctor_appointments.append(appt)
+                availability.book(doctor_id, start, appt.duration)
+                appointments_by_patient.add(appt.patient_id, appt)
+                appointments_by_date.add(start.date(), appt)
+                patient[appt.patient_id]["doctor"]=doctor_id
+                _journal_row("schedule_appointment", appt.patient_id, doctor_id, start, appt.appointment_type, appt.duration)
+                result.accepted+=1
+    result.errors.sort()
+    return result
+
+
+def track_medication_inventory_bulk(rows, format=None):
+    result=BulkResult()
+    fields=("medication_id","quantity","expiry_date","supplier")
+    now=today()
+    for row_number,row in read_rows(rows, fields, format):
+        try:
+            medication_id=as_id(row["medication_id"])
+            quantity=int(row["quantity"])
+            expiry_date=to_datetime(row["expiry_date"])
+            supplier=row.get("supplier")
+        except (KeyError, TypeError, ValueError) as e:
+            result.reject(row_number, f"invalid row: {e!r}")
+            continue
+        if expiry_date<now:
+            result.reject(row_number, f"medication {medication_id} has expired")
+            continue
+        with locks.holding(PHARMACY):
+            pharmacy.add_lot(medication_id, quantity, expiry_date, supplier)
+            _journal_row("_track_medication_inventory", medication_id, quantity, expiry_date, supplier, None, now)
+        result.accepted+=1
+    return result
+
+
+
+# ------------------ REQUEST SERVER ------------------
+
+def list_patients():
+    return [{"patient_id":pid,"name":p.name,"room_type":p.room_type,"discharged":pid in discharged_patients,
+             "medical_history":p.medical_history} for pid,p in patient.items()]
+
+
+def list_staff():
+    return [{"staff_id":sid,"name":s.name,"specialization":s.specialization,"shift_schedule":s.shift_schedule}
+            for sid,s in medical_staffs.items()]
+
+
+def list_appointments(patient_id=None):
+    appts=appointments_by_patient.get(patient_id) if patient_id is not None else [a for appts in appointment.values() for a in appts]
+    return [{"patient_id":a.patient_id,"doctor_id":a.doctor_id,"date":a.appointment_date,"type":a.appointment_type}
+            for a in appts]
+
+
+def patient_reports_text(patient_ids, format="text"):
+    out=io.StringIO()
+    write_patient_reports(patient_ids, out, format)
+    return out.getvalue()
+
+
+SERVICE_OPS={
+    "register":register_patient,
+    "add_staff":add_medical_staff,
+    "schedule":book_if_free,
+    "admit":assign_room,
+    "emergency":manage_emergency_admission,
+    "discharge":manage_discharge_process,
+    "bill":process_billing,
+    "report":generate_patient_report,
+    "reports":patient_reports_text,
+    "patients":list_patients,
+    "staff":list_staff,
+    "appointments":list_appointments,
+    "next_slot":earliest_free_slot,
+    "book_first":book_first_available,
+    "metrics":export_metrics,
+    "search":search_patients,
+}
+HEAVY_OPS=("report","reports")
+
+
+def serve(host=None, port=None):
+    """Answer SERVICE_OPS requests until interrupted, on the server's default address unless given one."""
+    # asyncio and the server load here, so importing the front desk does not pay for them.
+    import asyncio
+    from .server import DEFAULT_HOST, DEFAULT_PORT, RequestServer
+    address=(host or DEFAULT_HOST, DEFAULT_PORT if port is None else port)
+    asyncio.run(RequestServer(SERVICE_OPS, HEAVY_OPS).serve_forever(*address))
+
+
+_client=None
+
+
+def client():
+    """The connection the menu uses; starts an in-process server on first use."""
+    global _client
+    if _client is None:
+        from .server import Client, RequestServer
+        host,port=RequestServer(SERVICE_OPS, HEAVY_OPS).start_in_thread()
+        _client=Client(host, port)
+    return _client
+
+
+def request(op, **args):
+    from .server import RequestError
+    try:
+        result,output=client().call(op, **args)
+    except RequestError as error:
+        print(error)
+        return None
+    for line in output:
+        print(line)
+    return result
+
+# ------------------ INPUT WRAPPERS ------------------
+
+def input_register_patient():
+    patient_id = int(input("Enter patient ID: "))
+    name = input("Enter name: ")
+    age = int(input("Enter age: "))
+    gender = input("Enter gender: ")
+    blood_type = input("Enter blood type: ")
+    medical_history = input("Enter medical history: ")
+    insurance_company = input("Enter insurance company: ")
+    policy_no = int(input("Enter insurance policy number: "))
+
+    personal_info = {"age": age, "gender": gender, "blood_type": blood_type}
+    insurance_info = {"company": insurance_company, "policy_no": policy_no}
+
+    request("register", patient_id=patient_id, name=name, personal_info=personal_info,
+            medical_history=medical_history, insurance_info=insurance_info)
+
+def input_discharge_patient():
+    patient_id = int(input("Enter patient ID to discharge: "))
+    admission_date = input("Enter admission date (DD-MM-YYYY): ")
+    discharge_date = input("Enter discharge date (DD-MM-YYYY): ")
+    follow_up = input("Enter follow-up instructions: ")
+    request("discharge", patient_id=patient_id, admission_date=admission_date,
+            discharge_date=discharge_date, follow_up_instructions=follow_up)
+
+def input_schedule_appointment():
+    patient_id = int(input("Enter patient ID: "))
+    doctor_id = int(input("Enter doctor ID: "))
+    appointment_date = input("Enter appointment date (DD-MM-YYYY HH:MM): ")
+    appointment_type = input("Enter appointment type: ")
+    request("schedule", patient_id=patient_id, doctor_id=doctor_id,
+            appointment_date=appointment_date, appointment_type=appointment_type)
+
+def input_add_medical_staff():
+    staff_id = int(input("Enter staff ID: "))
+    name = input("Enter staff name: ")
+    specialization = input("Enter specialization: ")
+    schedule = input("Enter work schedule: ")
+    contact = input("Enter contact number: ")
+    request("add_staff", staff_id=staff_id, name=name, specialization=specialization,
+            shift_schedule=schedule, contact_info=contact)
+
+def display_all_patients():
+    rows = request("patients") or []
+    if not rows:
+        print("No patients found.")
+    for info in rows:
+        print(f"\nPatient ID: {info['patient_id']}")
+        print(f"Name: {info['name']}")
+        print(f"Discharged: {info['discharged']}")
+        print(f"Medical History: {info['medical_history']}")
+
+def display_all_staff():
+    rows = request("staff") or []
+    if not rows:
+        print("No staff records found.")
+    for info in rows:
+        print(f"\nStaff ID: {info['staff_id']}")
+        print(f"Name: {info['name']}")
+        print(f"Specialization: {info['specialization']}")
+        print(f"Schedule: {info['shift_schedule']}")
+
+def display_all_appointments():
+    rows = request("appointments") or []
+    if not rows:
+        print("No appointments scheduled.")
+    for appt in rows:
+        print(f"\nAppointment - Patient ID: {appt['patient_id']}, Doctor ID: {appt['doctor_id']}")
+        print(f"Date: {appt['date']}, Type: {appt['type']}")
+
+# ------------------ MAIN MENU LOOP ------------------
+
+def main():
+    while True:
+        print("\n=== Hospital Management System ===")
+        print("1. Register Patient")
+        print("2. Discharge Patient")
+        print("3. Schedule Appointment")
+        print("4. Add Medical Staff")
+        print("5. View All Patients")
+        print("6. View All Staff")
+        print("7. View All Appointments")
+        print("8. Exit")
+
+        choice = input("Select an option (1-8): ")
+
+        if choice == '1':
+            input_register_patient()
+        elif choice == '2':
+            input_discharge_patient()
+        elif choice == '3':
+            input_schedule_appointment()
+        elif choice == '4':
+            input_add_medical_staff()
+        elif choice == '5':
+            display_all_patients()
+        elif choice == '6':
+            display_all_staff()
+        elif choice == '7':
+            display_all_appointments()
+        elif choice == '8':
+            print("Exiting system. Goodbye!")
+            break
+        else:
+            print("Invalid input. Please select a valid option.")
+
+
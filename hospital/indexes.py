@@ -0,0 +1,121 @@
+from bisect import bisect_left, insort
+
+from .locks import Guarded, Lock
+
+
+def _slot(value):
+    try:
+        hash(value)
+    except TypeError:
+        return object()
+    return value
+
+
+class SecondaryIndex(Guarded):
+    """key -> values that point back into a primary store.
+
+    The functions that change the store call add() and discard() alongside
+    their own writes, so lookups by key never have to scan the store. Each
+    key holds an insertion-ordered dict of its values, so add() and discard()
+    are O(1); a value already under the key is not added twice. Unhashable
+    values (records, which compare field by field) are kept under a key of
+    their own and are found by equality on discard.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def __contains__(self, key):
+        return key in self._buckets
+
+    def keys(self):
+        return list(self._buckets)
+
+    def add(self, key, value):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = bucket = {}
+                self._new_key(key)
+            bucket[_slot(value)] = value
+
+    def discard(self, key, value):
+        """Drop value from under key; missing entries are ignored."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return
+            slot = _slot(value)
+            if slot is not value:
+                slot = next((slot for slot, held in bucket.items() if held == value), None)
+            if slot not in bucket:
+                return
+            del bucket[slot]
+            if not bucket:
+                del self._buckets[key]
+                self._dropped_key(key)
+
+    def move(self, old_key, new_key, value):
+        if old_key != new_key:
+            self.discard(old_key, value)
+            self.add(new_key, value)
+
+    def get(self, key):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return list(bucket.values()) if bucket else []
+
+    def count(self, key):
+        return len(self._buckets.get(key, ()))
+
+    def count_in(self, keys):
+        """How many values sit under any key found in the `keys` container.
+
+        A single string is one key, not a container of characters. Looks up
+        each of `keys` when that is the smaller side, otherwise tests each
+        indexed key for membership, so either way the cost follows the
+        smaller of the two.
+        """
+        if isinstance(keys, str):
+            keys = (keys,)
+        with self._lock:
+            try:
+                probe = len(keys) < len(self._buckets)
+            except TypeError:
+                probe = False
+            if probe:
+                return sum(len(self._buckets.get(key, ())) for key in set(keys))
+            return sum(len(bucket) for key, bucket in self._buckets.items() if key in keys)
+
+    def _new_key(self, key):
+        pass
+
+    def _dropped_key(self, key):
+        pass
+
+
+class SortedIndex(SecondaryIndex):
+    """SecondaryIndex whose keys are also kept sorted for O(log n) range lookups."""
+
+    def __init__(self):
+        super().__init__()
+        self._keys = []
+
+    def _new_key(self, key):
+        insort(self._keys, key)
+
+    def _dropped_key(self, key):
+        del self._keys[bisect_left(self._keys, key)]
+
+    def keys(self):
+        return list(self._keys)
+
+    def between(self, start, end):
+        """Values under keys in [start, end), in key order."""
+        with self._lock:
+            keys = self._keys[bisect_left(self._keys, start):bisect_left(self._keys, end)]
+            return [value for key in keys for value in self._buckets[key].values()]
@@ -0,0 +1,58 @@
+from bisect import bisect_left, bisect_right
+
+
+class IntervalIndex:
+    """Sorted, non-overlapping [start, end) intervals with O(log n) overlap checks."""
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.items = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def overlapping(self, start, end):
+        # Intervals never overlap each other, so only the neighbours around
+        # the insertion point can collide with [start, end).
+        i = bisect_right(self.starts, start)
+        if i and self.ends[i - 1] > start:
+            return self.items[i - 1]
+        if i < len(self.starts) and self.starts[i] < end:
+            return self.items[i]
+        return None
+
+    def starting_between(self, start, end):
+        """Items whose interval starts in [start, end), in start order."""
+        return self.items[bisect_left(self.starts, start):bisect_left(self.starts, end)]
+
+    def add(self, start, end, item):
+        """Insert the interval unless it overlaps; return the clashing item or None."""
+        conflict = self.overlapping(start, end)
+        if conflict is not None:
+            return conflict
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.items.insert(i, item)
+        return None
+
+    @classmethod
+    def build(cls, intervals):
+        """Build an index from (start, end, item) triples with a single sort.
+
+        Returns the index and the triples dropped for overlapping an earlier one.
+        """
+        index = cls()
+        rejected = []
+        for start, end, item in sorted(intervals, key=lambda interval: (interval[0], interval[1])):
+            if index.ends and index.ends[-1] > start:
+                rejected.append((start, end, item))
+                continue
+            index.starts.append(start)
+            index.ends.append(end)
+            index.items.append(item)
+        return index, rejected
@@ -0,0 +1,220 @@
+import atexit
+import os
+import struct
+from contextvars import ContextVar
+
+from .lazy import wraps
+from .output import SilentSink, emit, using
+
+_FRAME = struct.Struct("<I")
+# How deep the current thread or asyncio task is in journaled calls.
+_depth = ContextVar("journal_depth", default=0)
+
+
+class Journal:
+    """Append-only write-ahead log of mutating calls, plus periodic snapshots.
+
+    Records are buffered and a background thread writes them with a single
+    fsync per batch, once `batch_size` records are pending or `flush_interval`
+    seconds after they were queued, so callers never wait on the disk. Call
+    `flush()` (or `close()`, which also runs at exit) to force the tail to
+    disk. A snapshot pickles the whole state and starts a new log generation,
+    so restart only replays the records written since then. `hold`, if given,
+    returns a context manager that keeps every writer out while the state is
+    pickled, e.g. one holding all of a module's lock stripes.
+    """
+
+    def __init__(self, directory, state, batch_size=512, flush_interval=0.05, snapshot_every=1_000_000,
+                 hold=None):
+        import threading  # only a journal needs a background thread, so not every import of the package
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.state = state
+        self.hold = hold
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.generation = 0
+        self._pending = []
+        self._since_snapshot = 0
+        self._log = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._run, name="journal-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, "snapshot.pickle")
+
+    def _log_path(self, generation):
+        return os.path.join(self.directory, f"journal-{generation}.log")
+
+    def append(self, op, args, kwargs):
+        import pickle  # imported once a journal exists, not with every import of the package
+
+        record = pickle.dumps((op, args, kwargs), pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._pending.append(_FRAME.pack(len(record)))
+            self._pending.append(record)
+            self._since_snapshot += 1
+            due = len(self._pending) >= 2 * self.batch_size or self._since_snapshot >= self.snapshot_every
+        if due:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._closed:
+                return
+            snapshot_due = self._since_snapshot >= self.snapshot_every
+            try:
+                if snapshot_due:
+                    self.snapshot()
+                else:
+                    self.flush()
+            except Exception as error:
+                # The thread must outlive a failed write: unwritten records stay
+                # pending for the next pass, and a failed snapshot is retried
+                # after another snapshot_every records.
+                if snapshot_due:
+                    with self._lock:
+                        self._since_snapshot = 0
+                emit("journal_error", f"Journal write failed: {error!r}", error=repr(error))
+
+    def _flush(self):
+        if self._pending:
+            if self._log is None:
+                self._log = open(self._log_path(self.generation), "ab")
+            self._log.write(b"".join(self._pending))
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._pending.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def snapshot(self):
+        """Write the whole state and start a new log generation.
+
+        The state is pickled while `hold` keeps writers out; the file is
+        written after they are let back in, and their records go to the new
+        generation's log, which restore() replays after this one.
+        """
+        import contextlib
+        import pickle
+
+        with self.hold() if self.hold is not None else contextlib.nullcontext():
+            with self._lock:
+                self._flush()
+                old_generation, generation = self.generation, self.generation + 1
+                data = pickle.dumps({"generation": generation, "state": self.state()}, pickle.HIGHEST_PROTOCOL)
+                if self._log is not None:
+                    self._log.close()
+                    self._log = None
+                self.generation = generation
+                self._since_snapshot = 0
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        old_log = self._log_path(old_generation)
+        if os.path.exists(old_log):
+            os.remove(old_log)
+
+    def close(self):
+        import threading
+
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            self._flush()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _generations(self):
+        """Generations from the snapshot's on that still have a log, oldest first."""
+        found = []
+        for name in os.listdir(self.directory):
+            number = name[len("journal-"):-len(".log")]
+            if name.startswith("journal-") and name.endswith(".log") and number.isdigit():
+                found.append(int(number))
+        return sorted(generation for generation in found if generation >= self.generation)
+
+    def _records(self, generation):
+        import pickle
+
+        path = self._log_path(generation)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset + _FRAME.size <= len(data):
+            (size,) = _FRAME.unpack_from(data, offset)
+            end = offset + _FRAME.size + size
+            if end > len(data):
+                break
+            yield pickle.loads(data[offset + _FRAME.size:end])
+            offset = end
+        if offset < len(data):
+            # A torn write at the tail: drop it so new records start cleanly.
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+
+    def restore(self, namespace, ops):
+        """Load the last snapshot into `namespace`, then replay the log tail through `ops`.
+
+        The replayed calls run as if nested in another journaled call, so
+        they are not appended to the log a second time.
+        """
+        import pickle
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+            self.generation = snapshot["generation"]
+            namespace.update(snapshot["state"])
+        replayed = 0
+        token = _depth.set(_depth.get() + 1)
+        try:
+            with using(SilentSink()):
+                # A crash mid-snapshot can leave records in the logs of later generations too.
+                for generation in self._generations():
+                    for op, args, kwargs in self._records(generation):
+                        ops[op](*args, **kwargs)
+                        replayed += 1
+                    self.generation = generation
+        finally:
+            _depth.reset(token)
+        self._since_snapshot = replayed
+        return replayed
+
+
+def journaled(func):
+    """Log successful top-level calls of `func` to its module's `journal`, if one is set."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        depth = _depth.get()
+        token = _depth.set(depth + 1)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _depth.reset(token)
+        journal = func.__globals__.get("journal")
+        if journal is not None and depth == 0:
+            journal.append(func.__name__, args, kwargs)
+        return result
+
+    func.__globals__.setdefault("JOURNAL_OPS", {})[func.__name__] = wrapper
+    return wrapper
@@ -0,0 +1,36 @@
+import importlib
+
+_imported = {}
+
+
+def optional_import(name):
+    """The module `name`, imported on the first call, or None if it is not installed.
+
+    numpy takes longer to import than the rest of the package together, so the
+    columnar code paths ask for it when they first run instead of at import.
+    """
+    try:
+        return _imported[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    _imported[name] = module
+    return module
+
+
+def wraps(func):
+    """functools.wraps, which would bring functools and collections into every import of the package."""
+    def decorator(wrapper):
+        for name in ("__module__", "__name__", "__qualname__", "__doc__", "__annotations__"):
+            try:
+                setattr(wrapper, name, getattr(func, name))
+            except AttributeError:
+                pass
+        wrapper.__dict__.update(func.__dict__)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    return decorator
@@ -0,0 +1,100 @@
+# The same C locks threading hands out; threading itself, like contextlib,
+# would import functools and collections with the package.
+from _thread import RLock, allocate_lock as Lock
+
+from .lazy import wraps
+
+
+class Guarded:
+    """Give a store its own lock that is dropped when pickled and recreated on load."""
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+
+class StripedLocks:
+    """A fixed pool of re-entrant locks shared out by key hash.
+
+    Keys are small tuples such as ("patient", 183) or ("ward", "general room").
+    holding() takes every stripe a set of keys maps to in index order, so two
+    callers locking overlapping keys can never deadlock each other.
+    """
+
+    def __init__(self, stripes=64):
+        self._locks = [RLock() for _ in range(stripes)]
+
+    def __len__(self):
+        return len(self._locks)
+
+    def stripe(self, key):
+        return hash(key) % len(self._locks)
+
+    def holding(self, *keys):
+        return _Holding([self._locks[stripe] for stripe in sorted({self.stripe(key) for key in keys})])
+
+    def holding_all(self):
+        """Every stripe, so that no locked call is part-way through while it is held."""
+        return _Holding(self._locks)
+
+
+class _Holding:
+    """Take `locks` in order on entry and release them in reverse on exit."""
+
+    def __init__(self, locks):
+        self._locks = locks
+
+    def __enter__(self):
+        acquired = []
+        try:
+            for lock in self._locks:
+                lock.acquire()
+                acquired.append(lock)
+        except BaseException:
+            for lock in reversed(acquired):
+                lock.release()
+            raise
+
+    def __exit__(self, *exc_info):
+        for lock in reversed(self._locks):
+            lock.release()
+
+
+def locked(*fixed, **params):
+    """Run `func` holding its module's `locks` stripes for the named arguments.
+
+    `params` maps a key kind to the argument it comes from, e.g.
+    locked(patient="patient_id", ward="room_type"); `fixed` keys are always
+    taken. Apply it above @journaled so that calls which contend for the same
+    entity are journaled in the order they took effect.
+    """
+    def decorator(func):
+        inner = func
+        while hasattr(inner, "__wrapped__"):
+            inner = inner.__wrapped__
+        namespace = inner.__globals__
+        code = inner.__code__
+        # Where each named argument sits when it is passed positionally.
+        positions = {name: code.co_varnames.index(name) for name in params.values()
+                     if name in code.co_varnames[:code.co_argcount]}
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            keys = list(fixed)
+            for kind, name in params.items():
+                value = kwargs.get(name)
+                if name not in kwargs and positions.get(name, len(args)) < len(args):
+                    value = args[positions[name]]
+                # Ward names are matched case-insensitively everywhere else.
+                keys.append((kind, value.lower() if isinstance(value, str) else value))
+            with namespace["locks"].holding(*keys):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,228 @@
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+
+# Latency histogram bucket bounds in seconds, as Prometheus `le` labels.
+BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class OperationStats:
+    """Call and error counts plus a latency histogram for one operation.
+
+    Every thread counts into its own row, so recording never takes a lock;
+    the totals add the rows up when they are read.
+    """
+
+    __slots__ = ("_rows",)
+
+    def __init__(self):
+        self._rows = {}  # thread id -> [calls, errors, seconds, bucket counts]
+
+    def record(self, thread_id, seconds, failed):
+        row = self._rows.get(thread_id)
+        if row is None:
+            row = self._rows[thread_id] = [0, 0, 0.0, [0] * (len(BUCKETS) + 1)]
+        row[0] += 1
+        row[1] += failed
+        row[2] += seconds
+        row[3][bisect_left(BUCKETS, seconds)] += 1
+
+    @property
+    def calls(self):
+        return sum(row[0] for row in list(self._rows.values()))
+
+    @property
+    def errors(self):
+        return sum(row[1] for row in list(self._rows.values()))
+
+    @property
+    def seconds(self):
+        return sum(row[2] for row in list(self._rows.values()))
+
+    @property
+    def buckets(self):
+        totals = [0] * (len(BUCKETS) + 1)
+        for row in list(self._rows.values()):
+            for slot, count in enumerate(row[3]):
+                totals[slot] += count
+        return totals
+
+    def cumulative(self):
+        total, out = 0, []
+        for count in self.buckets:
+            total += count
+            out.append(total)
+        return out
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile call, or None before any call."""
+        cumulative = self.cumulative()
+        if not cumulative[-1]:
+            return None
+        rank = q * cumulative[-1]
+        for bound, count in zip(BUCKETS + (float("inf"),), cumulative):
+            if count >= rank:
+                return bound
+
+
+class SlowCallSampler:
+    """Capture the stack of any instrumented call still running after `threshold` seconds.
+
+    A daemon thread looks at the calls in flight every `interval` seconds and
+    keeps up to `limit` samples, newest last. `hook`, if given, is called with
+    each sample as it is taken. Each call is sampled at most once.
+    """
+
+    def __init__(self, metrics, threshold=0.1, interval=0.005, limit=256, hook=None):
+        self.metrics = metrics
+        self.threshold = threshold
+        self.interval = interval
+        self.hook = hook
+        self.samples = deque(maxlen=limit)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="slow-call-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        import traceback
+
+        seen = set()
+        while not self._stopped.wait(self.interval):
+            now = time.perf_counter()
+            frames = sys._current_frames()
+            running = dict(self.metrics._in_flight)
+            seen &= {(thread_id, started) for thread_id, (_, started) in running.items()}
+            for thread_id, (op, started) in running.items():
+                if now - started < self.threshold or (thread_id, started) in seen or thread_id not in frames:
+                    continue
+                seen.add((thread_id, started))
+                sample = {"op": op, "elapsed": round(now - started, 6), "thread": thread_id,
+                          "stack": traceback.format_stack(frames[thread_id])}
+                self.samples.append(sample)
+                if self.hook is not None:
+                    self.hook(sample)
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+
+class Metrics:
+    """Timing for a module's operations, installed by swapping its globals.
+
+    instrument() replaces each named function (and any alias or table entry
+    pointing at it) with a timing wrapper; uninstrument() puts the originals
+    back, so a module with metrics off runs exactly the code it had before.
+    Store sizes are read from `stores`, a callable returning {name: store},
+    only when a snapshot is taken.
+    """
+
+    def __init__(self, stores=None):
+        self.operations = {}
+        self.stores = stores
+        self.sampler = None
+        self._in_flight = {}
+        self._swapped = []
+
+    def _wrap(self, name, func):
+        stats = self.operations.setdefault(name, OperationStats())
+        clock = time.perf_counter
+        in_flight = self._in_flight
+        get_ident = threading.get_ident
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            thread_id = get_ident()
+            outermost = thread_id not in in_flight
+            start = clock()
+            if outermost:
+                in_flight[thread_id] = (name, start)
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.record(thread_id, clock() - start, failed)
+                if outermost:
+                    del in_flight[thread_id]
+
+        return timed
+
+    def instrument(self, namespace, names, tables=()):
+        """Time every function in `names`, also where it is aliased in `namespace` or listed in `tables`."""
+        originals = {}
+        for name in names:
+            func = namespace[name]
+            originals[id(func)] = (func, self._wrap(name, func))
+        for mapping in (namespace, *tables):
+            for key, value in list(mapping.items()):
+                swap = originals.get(id(value))
+                if swap is not None and swap[0] is value:
+                    mapping[key] = swap[1]
+                    self._swapped.append((mapping, key, value))
+
+    def uninstrument(self):
+        for mapping, key, original in reversed(self._swapped):
+            mapping[key] = original
+        self._swapped.clear()
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+
+    def sample_slow_calls(self, threshold=0.1, interval=0.005, limit=256, hook=None):
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.sampler = SlowCallSampler(self, threshold, interval, limit, hook)
+        return self.sampler
+
+    def store_sizes(self):
+        sizes = {}
+        for name, store in (self.stores() if self.stores else {}).items():
+            try:
+                sizes[name] = len(store)
+            except TypeError:
+                continue
+        return sizes
+
+    def snapshot(self):
+        operations = {}
+        for name, stats in sorted(self.operations.items()):
+            operations[name] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "seconds": round(stats.seconds, 6),
+                "p50_le": stats.quantile(0.5),
+                "p99_le": stats.quantile(0.99),
+                "buckets": dict(zip([str(bound) for bound in BUCKETS] + ["+Inf"], stats.cumulative())),
+            }
+        return {
+            "operations": operations,
+            "stores": self.store_sizes(),
+            "slow_calls": list(self.sampler.samples) if self.sampler is not None else [],
+        }
+
+    def prometheus(self, prefix="hospital"):
+        """The current metrics in the Prometheus text exposition format."""
+        lines = [f"# HELP {prefix}_calls_total Calls per operation.", f"# TYPE {prefix}_calls_total counter"]
+        for name, stats in sorted(self.operations.items()):
+            lines.append(f'{prefix}_calls_total{{op="{name}"}} {stats.calls}')
+        lines += [f"# HELP {prefix}_errors_total Calls that raised, per operation.",
+                  f"# TYPE {prefix}_errors_total counter"]
+        for name, stats in sorted(self.operations.items()):
+            lines.append(f'{prefix}_errors_total{{op="{name}"}} {stats.errors}')
+        lines += [f"# HELP {prefix}_call_seconds Call latency per operation.",
+                  f"# TYPE {prefix}_call_seconds histogram"]
+        for name, stats in sorted(self.operations.items()):
+            for bound, count in zip([repr(bound) for bound in BUCKETS] + ["+Inf"], stats.cumulative()):
+                lines.append(f'{prefix}_call_seconds_bucket{{op="{name}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_call_seconds_sum{{op="{name}"}} {stats.seconds!r}')
+            lines.append(f'{prefix}_call_seconds_count{{op="{name}"}} {stats.calls}')
+        lines += [f"# HELP {prefix}_store_size Entries per data store.", f"# TYPE {prefix}_store_size gauge"]
+        for name, size in self.store_sizes().items():
+            lines.append(f'{prefix}_store_size{{store="{name}"}} {size}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,103 @@
+from .locks import Guarded, Lock
+
+# Days the calendar first spans; it doubles to take in any date outside them.
+INITIAL_DAYS = 1024
+
+
+class _Fenwick:
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, i, delta):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        # Sum of positions 0..i; negative i means an empty prefix.
+        i += 1
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class OccupancyCounter(Guarded):
+    """Occupied beds per day, updated on admit/discharge and queried in O(log n).
+
+    Stays are stored as +1/-1 changes at day boundaries in two Fenwick trees,
+    so both "beds in use on day d" and "bed-days over [start, end]" are prefix
+    sums rather than scans over the stays themselves. The calendar is centred
+    on the first date recorded and rebuilt twice as wide whenever a change
+    falls outside it, so there is no earliest or latest date.
+    """
+
+    def __init__(self, days=INITIAL_DAYS):
+        self.size = days
+        self.start = None  # ordinal of the calendar's first day
+        self._changes = {}  # ordinal -> net change, kept to rebuild the trees
+        self._delta = _Fenwick(days)
+        self._weighted = _Fenwick(days)
+        self._lock = Lock()
+
+    def _day(self, ordinal):
+        # Position of a day in the calendar; it may fall outside [0, size) for queries.
+        return ordinal - self.start
+
+    def _fit(self, ordinal):
+        if self.start is None:
+            self.start = ordinal - self.size // 2
+        if 0 <= self._day(ordinal) < self.size:
+            return
+        low, high = min(self.start, ordinal), max(self.start + self.size, ordinal + 1)
+        size = self.size
+        while size < 2 * (high - low):
+            size *= 2
+        self.start, self.size = low - (size - (high - low)) // 2, size
+        self._delta, self._weighted = _Fenwick(size), _Fenwick(size)
+        for changed, delta in self._changes.items():
+            self._add(self._day(changed), delta)
+
+    def _add(self, day, delta):
+        self._delta.add(day, delta)
+        self._weighted.add(day, delta * day)
+
+    def _change(self, ordinal, delta):
+        with self._lock:
+            self._fit(ordinal)
+            self._changes[ordinal] = self._changes.get(ordinal, 0) + delta
+            self._add(self._day(ordinal), delta)
+
+    def admit(self, admission_date):
+        self._change(admission_date.toordinal(), 1)
+
+    def discharge(self, discharge_date):
+        # The discharge day itself still counts as an occupied bed-day.
+        self._change(discharge_date.toordinal() + 1, -1)
+
+    def record_stay(self, admission_date, discharge_date):
+        self.admit(admission_date)
+        self.discharge(discharge_date)
+
+    def _prefix(self, tree, day):
+        # Nothing changes outside the calendar, so a later day sees the full sum.
+        return tree.prefix(min(day, self.size - 1))
+
+    def occupied(self, when):
+        with self._lock:
+            if self.start is None:
+                return 0
+            return self._prefix(self._delta, self._day(when.toordinal()))
+
+    def _bed_days_through(self, day):
+        return (day + 1) * self._prefix(self._delta, day) - self._prefix(self._weighted, day)
+
+    def bed_days(self, start_date, end_date):
+        """Occupied bed-days over [start_date, end_date], both inclusive."""
+        with self._lock:
+            if self.start is None:
+                return 0
+            start, end = self._day(start_date.toordinal()), self._day(end_date.toordinal())
+            return self._bed_days_through(end) - self._bed_days_through(start - 1)
@@ -0,0 +1,112 @@
+import sys
+from contextvars import ContextVar
+
+
+class ConsoleSink:
+    """Print every message, as the modules always have."""
+
+    def emit(self, event, message, fields):
+        print(message)
+
+
+class SilentSink:
+    """Drop everything; for library callers and bulk runs."""
+
+    def emit(self, event, message, fields):
+        pass
+
+
+class BufferedSink:
+    """Collect messages in memory and write them to `stream` in large chunks."""
+
+    def __init__(self, stream=None, limit=1 << 16):
+        self.stream = stream
+        self.limit = limit
+        self._parts = []
+        self._size = 0
+
+    def emit(self, event, message, fields):
+        self._parts.append(message)
+        self._size += len(message) + 1
+        if self._size >= self.limit:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(self._parts) + "\n")
+            stream.flush()
+            self._parts.clear()
+            self._size = 0
+
+
+class EventSink:
+    """Keep structured events instead of text, e.g. for tests or log shipping."""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, message, fields):
+        self.events.append({"event": event, "message": message, **fields})
+
+    def write_jsonl(self, stream):
+        import json
+
+        for event in self.events:
+            stream.write(json.dumps(event, default=str) + "\n")
+
+
+_sink = ConsoleSink()
+# Overrides _sink for the current thread or asyncio task only.
+_scoped = ContextVar("scoped_sink", default=None)
+
+
+def emit(event, message, **fields):
+    (_scoped.get() or _sink).emit(event, message, fields)
+
+
+def get_sink():
+    return _sink
+
+
+def set_sink(sink):
+    """Route all module output to `sink`; returns the previous sink."""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def _flush(sink):
+    if hasattr(sink, "flush"):
+        sink.flush()
+
+
+# Classes rather than contextlib.contextmanager, which imports functools and collections.
+class using:
+    """Route all module output to `sink` inside a with block, then flush it."""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        self._previous = set_sink(self.sink)
+        return self.sink
+
+    def __exit__(self, *exc_info):
+        set_sink(self._previous)
+        _flush(self.sink)
+
+
+class scoped:
+    """Like using(), but only for the current thread or asyncio task."""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        self._token = _scoped.set(self.sink)
+        return self.sink
+
+    def __exit__(self, *exc_info):
+        _scoped.reset(self._token)
+        _flush(self.sink)
@@ -0,0 +1,325 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+from collections.abc import MutableMapping
+
+# One fixed-width row per patient: id, age, gender, blood type, insurer,
+# room type, attending doctor, and the offset/length of its arena blob.
+_ROW = struct.Struct("<qhBBIIqqI")
+_HEADER = struct.Struct("<4sIq")
+_INDEX_HEADER = struct.Struct("<qq")
+_SLOT = struct.Struct("<q")
+_MAGIC = b"PTBL"
+_NO_AGE = -1
+_NO_DOCTOR = -(2 ** 63)
+# Arena slots are rounded up to this many bytes, so a blob that grows a little still fits.
+_SLOT_ALIGN = 64
+
+GENDERS = ("Male", "Female", "Other")
+BLOOD_TYPES = ("A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-")
+
+
+def _code(table, value):
+    try:
+        return table.index(value) + 1
+    except ValueError:
+        return 0
+
+
+def _hash(key, mask):
+    return ((key * 11400714819323198485) >> 32) & mask
+
+
+class _Mapped:
+    """A file kept memory-mapped and grown in doubling steps."""
+
+    def __init__(self, path, initial_size):
+        exists = os.path.exists(path)
+        self.file = open(path, "r+b" if exists else "w+b")
+        if not exists or os.path.getsize(path) == 0:
+            self.file.truncate(initial_size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def __len__(self):
+        return len(self.map)
+
+    def ensure(self, size):
+        if size <= len(self.map):
+            return
+        new_size = len(self.map)
+        while new_size < size:
+            new_size *= 2
+        self.map.close()
+        self.file.truncate(new_size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def close(self):
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+
+class PatientTable(MutableMapping):
+    """Disk-backed patient registry with fixed-width rows and a side arena.
+
+    Scalar fields live in a memory-mapped row file, so opening a table costs
+    nothing until rows are touched. Everything variable-length (name, history,
+    policy number, other keys) is pickled into an append-only arena. Lookups by
+    integer patient id go through an on-disk open-addressing hash index.
+    A record's arena slot is rewritten in place while the new blob fits in it
+    (pickle ignores the padding after a shorter blob); only a blob that has
+    outgrown its slot is appended.
+
+    One table lock covers row allocation, index growth and the file remaps,
+    so readers never see a map that another thread is replacing.
+
+    Rows read back as PatientRecord views that behave like the usual patient
+    dicts. Assign whole keys to change a record; mutating a nested dict in
+    place is not written back.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._rows = _Mapped(path + ".rows", _HEADER.size + 1024 * _ROW.size)
+        magic, _, count = _HEADER.unpack_from(self._rows.map, 0)
+        if magic != _MAGIC:
+            count = 0
+            _HEADER.pack_into(self._rows.map, 0, _MAGIC, 1, count)
+        self._count = count
+        self._index = _Mapped(path + ".index", _INDEX_HEADER.size + 1024 * _SLOT.size)
+        capacity, _ = _INDEX_HEADER.unpack_from(self._index.map, 0)
+        if capacity == 0:
+            _INDEX_HEADER.pack_into(self._index.map, 0, 1024, 0)
+        arena_path = path + ".arena"
+        self._arena = open(arena_path, "r+b" if os.path.exists(arena_path) else "w+b", buffering=0)
+        self._arena_end = os.path.getsize(arena_path)
+        self._lock = threading.Lock()
+        self._strings_path = path + ".strings"
+        self._strings = []
+        if os.path.exists(self._strings_path):
+            with open(self._strings_path) as f:
+                self._strings = [json.loads(line) for line in f]
+        self._string_codes = {s: i + 1 for i, s in enumerate(self._strings)}
+
+    def __reduce__(self):
+        self.flush()
+        return (PatientTable, (self.path,))
+
+    # -- interned strings (insurers, room types) --------------------------
+
+    def _intern(self, value):
+        if value is None:
+            return 0
+        code = self._string_codes.get(value)
+        if code is None:
+            self._strings.append(value)
+            code = self._string_codes[value] = len(self._strings)
+            with open(self._strings_path, "a") as f:
+                f.write(json.dumps(value) + "\n")
+        return code
+
+    # -- hash index ---------------------------------------------------------
+
+    def _slot_offset(self, slot):
+        return _INDEX_HEADER.size + slot * _SLOT.size
+
+    def _find(self, patient_id):
+        """Return (slot, row) for patient_id; row is None if it is not stored."""
+        if not isinstance(patient_id, int):
+            raise TypeError("PatientTable only stores integer patient ids")
+        capacity, _ = _INDEX_HEADER.unpack_from(self._index.map, 0)
+        mask = capacity - 1
+        slot = _hash(patient_id, mask)
+        while True:
+            (entry,) = _SLOT.unpack_from(self._index.map, self._slot_offset(slot))
+            if entry == 0:
+                return slot, None
+            row = entry - 1
+            if _ROW.unpack_from(self._rows.map, self._row_offset(row))[0] == patient_id:
+                return slot, row
+            slot = (slot + 1) & mask
+
+    def _grow_index(self, capacity):
+        self._index.ensure(self._slot_offset(capacity))
+        self._index.map[_INDEX_HEADER.size:self._slot_offset(capacity)] = bytes(capacity * _SLOT.size)
+        _INDEX_HEADER.pack_into(self._index.map, 0, capacity, self._count)
+        mask = capacity - 1
+        for row in range(self._count):
+            slot = _hash(_ROW.unpack_from(self._rows.map, self._row_offset(row))[0], mask)
+            while _SLOT.unpack_from(self._index.map, self._slot_offset(slot))[0]:
+                slot = (slot + 1) & mask
+            _SLOT.pack_into(self._index.map, self._slot_offset(slot), row + 1)
+
+    # -- rows ---------------------------------------------------------------
+
+    def _row_offset(self, row):
+        return _HEADER.size + row * _ROW.size
+
+    def _store_blob(self, blob, row):
+        """Write blob over the row's old slot if it fits, else append; return (offset, slot length)."""
+        if row is not None:
+            offset, length = _ROW.unpack_from(self._rows.map, self._row_offset(row))[-2:]
+            if len(blob) <= length:
+                os.pwrite(self._arena.fileno(), blob, offset)
+                return offset, length
+        length = -(-len(blob) // _SLOT_ALIGN) * _SLOT_ALIGN
+        offset = self._arena_end
+        os.pwrite(self._arena.fileno(), blob.ljust(length, b"\0"), offset)
+        self._arena_end += length
+        return offset, length
+
+    def _encode(self, patient_id, data, row=None):
+        data = dict(data)
+        personal = data.get("personal_info")
+        insurance = data.get("insurance_info")
+        age, gender, blood_type, insurer = _NO_AGE, 0, 0, 0
+        if isinstance(personal, dict):
+            personal = dict(personal)
+            if isinstance(personal.get("age"), int) and 0 <= personal["age"] < 2 ** 15:
+                age = personal.pop("age")
+            gender = _code(GENDERS, personal.get("gender"))
+            if gender:
+                del personal["gender"]
+            blood_type = _code(BLOOD_TYPES, personal.get("blood_type"))
+            if blood_type:
+                del personal["blood_type"]
+            data["personal_info"] = personal
+        if isinstance(insurance, dict) and isinstance(insurance.get("company"), str):
+            insurance = dict(insurance)
+            insurer = self._intern(insurance.pop("company"))
+            data["insurance_info"] = insurance
+        room = 0
+        if isinstance(data.get("room_type"), str):
+            room = self._intern(data.pop("room_type"))
+        doctor = _NO_DOCTOR
+        if isinstance(data.get("doctor"), int):
+            doctor = data.pop("doctor")
+        offset, length = self._store_blob(pickle.dumps(data, pickle.HIGHEST_PROTOCOL), row)
+        return _ROW.pack(patient_id, age, gender, blood_type, insurer, room, doctor, offset, length)
+
+    def _decode(self, row):
+        (_, age, gender, blood_type, insurer, room, doctor,
+         offset, length) = _ROW.unpack_from(self._rows.map, self._row_offset(row))
+        data = pickle.loads(os.pread(self._arena.fileno(), length, offset))
+        personal = data.get("personal_info")
+        if isinstance(personal, dict):
+            if age != _NO_AGE:
+                personal["age"] = age
+            if gender:
+                personal["gender"] = GENDERS[gender - 1]
+            if blood_type:
+                personal["blood_type"] = BLOOD_TYPES[blood_type - 1]
+        if insurer:
+            data["insurance_info"]["company"] = self._strings[insurer - 1]
+        if room:
+            data["room_type"] = self._strings[room - 1]
+        if doctor != _NO_DOCTOR:
+            data["doctor"] = doctor
+        return data
+
+    def _write(self, patient_id, data):
+        with self._lock:
+            self._write_row(patient_id, data)
+
+    def _write_row(self, patient_id, data):
+        slot, row = self._find(patient_id)
+        packed = self._encode(patient_id, data, row)
+        if row is None:
+            row = self._count
+            self._rows.ensure(self._row_offset(row + 1))
+            self._rows.map[self._row_offset(row):self._row_offset(row + 1)] = packed
+            self._count += 1
+            _HEADER.pack_into(self._rows.map, 0, _MAGIC, 1, self._count)
+            _SLOT.pack_into(self._index.map, self._slot_offset(slot), row + 1)
+            capacity, _ = _INDEX_HEADER.unpack_from(self._index.map, 0)
+            _INDEX_HEADER.pack_into(self._index.map, 0, capacity, self._count)
+            if 2 * self._count > capacity:
+                self._grow_index(2 * capacity)
+        else:
+            self._rows.map[self._row_offset(row):self._row_offset(row + 1)] = packed
+
+    # -- mapping interface --------------------------------------------------
+
+    def __getitem__(self, patient_id):
+        if not isinstance(patient_id, int):
+            raise KeyError(patient_id)
+        with self._lock:
+            _, row = self._find(patient_id)
+            if row is None:
+                raise KeyError(patient_id)
+            data = self._decode(row)
+        return PatientRecord(self, patient_id, data)
+
+    def __setitem__(self, patient_id, data):
+        self._write(patient_id, data)
+
+    def __delitem__(self, patient_id):
+        raise TypeError("PatientTable is append-only")
+
+    def __contains__(self, patient_id):
+        if not isinstance(patient_id, int):
+            return False
+        with self._lock:
+            return self._find(patient_id)[1] is not None
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for row in range(self._count):
+            with self._lock:
+                patient_id = _ROW.unpack_from(self._rows.map, self._row_offset(row))[0]
+            yield patient_id
+
+    def flush(self):
+        with self._lock:
+            self._rows.map.flush()
+            self._index.map.flush()
+
+    def close(self):
+        with self._lock:
+            self._arena.close()
+            self._rows.close()
+            self._index.close()
+
+
+class PatientRecord(MutableMapping):
+    """Dict-like view of one PatientTable row; writes go straight back to the table."""
+
+    def __init__(self, table, patient_id, data):
+        self._table = table
+        self._patient_id = patient_id
+        self._data = data
+
+    def __getattr__(self, name):
+        # Attribute access mirrors records.Patient, where unset fields are None.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._data.get(name)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._table._write(self._patient_id, self._data)
+
+    def __delitem__(self, key):
+        del self._data[key]
+        self._table._write(self._patient_id, self._data)
+
+    def update(self, *args, **kwargs):
+        self._data.update(*args, **kwargs)
+        self._table._write(self._patient_id, self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"PatientRecord({self._patient_id!r}, {self._data!r})"
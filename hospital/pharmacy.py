@@ -0,0 +1,124 @@
+import heapq
+from datetime import timedelta
+
+from .locks import Guarded, Lock
+from .records import InventoryItem
+
+
+class MedicationInventory(Guarded):
+    """Lot-based medication stock with first-expired-first-out dispensing.
+
+    Each medication keeps a min-heap of its lots by expiry date, so the lot to
+    dispense next, and any lot that has expired, is always at the top. A
+    second heap over every lot answers "what expires in the next N days" by
+    walking only the nodes that are due.
+    """
+
+    def __init__(self):
+        self._lots = {}
+        self._on_hand = {}
+        self._thresholds = {}
+        self._all = []
+        self._dead = 0
+        self._seq = 0
+        self._lock = Lock()
+
+    def __contains__(self, medication_id):
+        return medication_id in self._lots
+
+    def on_hand(self, medication_id):
+        return self._on_hand.get(medication_id, 0)
+
+    def lots(self, medication_id):
+        with self._lock:
+            return sorted((entry[2] for entry in self._lots.get(medication_id, ()) if entry[2].quantity),
+                          key=lambda lot: lot.expiry_date)
+
+    def add_lot(self, medication_id, quantity, expiry_date, supplier=None, lot_id=None):
+        with self._lock:
+            self._seq += 1
+            lot = InventoryItem(medication_id=medication_id, lot_id=lot_id or f"{medication_id}-{self._seq}",
+                                quantity=quantity, expiry_date=expiry_date, supplier=supplier)
+            entry = (expiry_date, self._seq, lot)
+            heapq.heappush(self._lots.setdefault(medication_id, []), entry)
+            heapq.heappush(self._all, entry)
+            self._on_hand[medication_id] = self._on_hand.get(medication_id, 0) + quantity
+            return lot
+
+    def _retire(self, lot):
+        self._on_hand[lot.medication_id] -= lot.quantity
+        lot.quantity = 0
+        self._dead += 1
+        if self._dead > len(self._all) // 2:
+            self._all = [entry for entry in self._all if entry[2].quantity]
+            heapq.heapify(self._all)
+            self._dead = 0
+
+    def remove_expired(self, now):
+        """Take every lot that expired before `now` out of stock; returns those lots."""
+        with self._lock:
+            removed = []
+            for heap in self._lots.values():
+                while heap and heap[0][0] < now:
+                    lot = heapq.heappop(heap)[2]
+                    if lot.quantity:
+                        removed.append(InventoryItem(medication_id=lot.medication_id, lot_id=lot.lot_id,
+                                                     quantity=lot.quantity, expiry_date=lot.expiry_date,
+                                                     supplier=lot.supplier))
+                        self._retire(lot)
+            return removed
+
+    def dispense(self, medication_id, quantity, now):
+        """Take `quantity` from the earliest-expiring usable lots.
+
+        Returns [(lot_id, taken), ...], or None without touching stock if fewer
+        than `quantity` unexpired units are on hand.
+        """
+        with self._lock:
+            heap = self._lots.get(medication_id)
+            if heap is None:
+                return None
+            while heap and (heap[0][0] < now or not heap[0][2].quantity):
+                lot = heapq.heappop(heap)[2]
+                if lot.quantity:
+                    self._retire(lot)
+            if self._on_hand[medication_id] < quantity:
+                return None
+            taken = []
+            while quantity:
+                lot = heap[0][2]
+                step = min(quantity, lot.quantity)
+                lot.quantity -= step
+                self._on_hand[medication_id] -= step
+                quantity -= step
+                taken.append((lot.lot_id, step))
+                if not lot.quantity:
+                    heapq.heappop(heap)
+                    self._dead += 1
+            return taken
+
+    def set_threshold(self, medication_id, level):
+        self._thresholds[medication_id] = level
+
+    def is_low(self, medication_id):
+        return self.on_hand(medication_id) < self._thresholds.get(medication_id, 0)
+
+    def low_stock(self):
+        return [medication_id for medication_id in self._thresholds if self.is_low(medication_id)]
+
+    def expiring_within(self, days, now):
+        """Lots with stock left that expire within `days` of `now`, soonest first, in O(k log k)."""
+        with self._lock:
+            limit = now + timedelta(days=days)
+            heap = self._all
+            found = []
+            stack = [0] if heap else []
+            while stack:
+                i = stack.pop()
+                if i >= len(heap) or heap[i][0] > limit:
+                    continue
+                if heap[i][2].quantity:
+                    found.append(heap[i])
+                stack.append(2 * i + 1)
+                stack.append(2 * i + 2)
+            return [entry[2] for entry in sorted(found, key=lambda entry: entry[:2])]
@@ -0,0 +1,142 @@
+class Record:
+    """Dict-style access for slotted records, kept while callers migrate to attributes.
+
+    Unset fields hold None and are left out of keys(), the way the old dicts
+    simply lacked those keys. Records compare equal field by field; their
+    __init__ methods are written out rather than generated by dataclasses,
+    which would cost every import of the package.
+    """
+
+    __slots__ = ()
+    __hash__ = None
+    _aliases = {}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def _name(self, key):
+        key = self._aliases.get(key, key)
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return key
+
+    def __getitem__(self, key):
+        return getattr(self, self._name(key))
+
+    def __setitem__(self, key, value):
+        setattr(self, self._name(key), value)
+
+    def __contains__(self, key):
+        key = self._aliases.get(key, key)
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, self._aliases.get(key, key), None)
+        return default if value is None else value
+
+    def pop(self, key, *default):
+        name = self._name(key)
+        value = getattr(self, name)
+        if value is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        setattr(self, name, None)
+        return value
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def keys(self):
+        return [name for name in self.__slots__ if getattr(self, name) is not None]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+
+class Patient(Record):
+    __slots__ = ("name", "personal_info", "medical_history", "insurance_info", "records", "appointments", "vitals",
+                 "medications", "room_type", "doctor")
+
+    def __init__(self, name=None, personal_info=None, medical_history=None, insurance_info=None, records=None,
+                 appointments=None, vitals=None, medications=None, room_type=None, doctor=None):
+        self.name = name
+        self.personal_info = personal_info
+        self.medical_history = medical_history
+        self.insurance_info = insurance_info
+        self.records = records
+        self.appointments = appointments
+        self.vitals = vitals
+        self.medications = medications
+        self.room_type = room_type
+        self.doctor = doctor
+
+
+class Staff(Record):
+    __slots__ = ("name", "specialization", "shift_schedule", "contact_info")
+
+    def __init__(self, name=None, specialization=None, shift_schedule=None, contact_info=None):
+        self.name = name
+        self.specialization = specialization
+        self.shift_schedule = shift_schedule
+        self.contact_info = contact_info
+
+
+class Appointment(Record):
+    _aliases = {"date": "appointment_date", "type": "appointment_type"}
+    __slots__ = ("patient_id", "doctor_id", "appointment_date", "appointment_type", "duration")
+
+    def __init__(self, patient_id=None, doctor_id=None, appointment_date=None, appointment_type=None,
+                 duration=None):
+        self.patient_id = patient_id
+        self.doctor_id = doctor_id
+        self.appointment_date = appointment_date
+        self.appointment_type = appointment_type
+        self.duration = duration
+
+
+class Bill(Record):
+    _aliases = {"service_list": "services"}
+    __slots__ = ("patient_id", "services", "total_cost", "insurance_coverage", "amount_due")
+
+    def __init__(self, patient_id=None, services=None, total_cost=None, insurance_coverage=None, amount_due=None):
+        self.patient_id = patient_id
+        self.services = services
+        self.total_cost = total_cost
+        self.insurance_coverage = insurance_coverage
+        self.amount_due = amount_due
+
+
+class Emergency(Record):
+    _aliases = {"type": "emergency_type", "severity": "severity_level"}
+    __slots__ = ("patient_id", "emergency_type", "severity_level", "admission_date")
+
+    def __init__(self, patient_id=None, emergency_type=None, severity_level=None, admission_date=None):
+        self.patient_id = patient_id
+        self.emergency_type = emergency_type
+        self.severity_level = severity_level
+        self.admission_date = admission_date
+
+
+class InventoryItem(Record):
+    __slots__ = ("medication_id", "lot_id", "quantity", "expiry_date", "supplier")
+
+    def __init__(self, medication_id=None, lot_id=None, quantity=None, expiry_date=None, supplier=None):
+        self.medication_id = medication_id
+        self.lot_id = lot_id
+        self.quantity = quantity
+        self.expiry_date = expiry_date
+        self.supplier = supplier
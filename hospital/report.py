@@ -0,0 +1,266 @@
+from collections import OrderedDict
+from operator import itemgetter
+
+from .locks import Guarded, Lock
+
+
+class Each:
+    """Repeat `pattern` for every item of row[field].
+
+    Mapping items render as {0} key and {1} value, tuples are unpacked, and
+    anything else is {0}. `header` lines come first when there are items;
+    `empty` is written instead when there are none.
+    """
+
+    __slots__ = ("field", "pattern", "header", "empty")
+
+    def __init__(self, field, pattern, header=(), empty=None):
+        self.field = field
+        self.pattern = pattern
+        self.header = tuple(header)
+        self.empty = empty
+
+
+def _parse(pattern):
+    """The (literal, name, spec, conversion) parts of a "{name}" pattern."""
+    from string import Formatter  # string brings in re, so it waits for the first report
+
+    return Formatter().parse(pattern)
+
+
+def _compile_line(pattern):
+    """Split a "{name}" pattern into a positional format string and one getter."""
+    parts, names = [], []
+    for literal, name, spec, conversion in _parse(pattern):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if name is None:
+            continue
+        names.append(name)
+        parts.append("{" + ("!" + conversion if conversion else "") + (":" + spec if spec else "") + "}")
+    text = "".join(parts)
+    if not names:
+        return text, None
+    if len(names) == 1:
+        getter = itemgetter(names[0])
+        return text, lambda row: (getter(row),)
+    return text, itemgetter(*names)
+
+
+class Template:
+    """A report layout parsed once and rendered for any number of rows.
+
+    `layout` is a sequence of "{field}" line patterns and Each steps. Rows are
+    flat dicts that carry every field the layout names; `fields` (by default
+    every field named) is what the JSON and CSV writers output. The layout
+    is parsed on first use, so templates defined at import time cost nothing
+    until a report is actually written.
+    """
+
+    def __init__(self, name, layout, fields=None):
+        self.name = name
+        self._layout = tuple(layout)
+        self._fields = fields
+        self._steps = None
+
+    @property
+    def fields(self):
+        if self._steps is None:
+            self._compile()
+        return self._fields
+
+    def _compile(self):
+        steps, named = [], []
+        for step in self._layout:
+            if isinstance(step, Each):
+                steps.append((itemgetter(step.field), step))
+                named.append(step.field)
+            else:
+                text, getter = _compile_line(step)
+                steps.append((getter, text))
+                if getter is not None:
+                    named.extend(field for _, field, _, _ in _parse(step) if field)
+        self._fields = tuple(self._fields or dict.fromkeys(named))
+        self._steps = steps
+
+    def lines(self, row):
+        if self._steps is None:
+            self._compile()
+        out = []
+        for getter, step in self._steps:
+            if getter is None:
+                out.append(step)
+            elif isinstance(step, str):
+                out.append(step.format(*getter(row)))
+            else:
+                items = getter(row)
+                if hasattr(items, "items"):
+                    items = items.items()
+                before = len(out)
+                out.extend(step.header)
+                for item in items or ():
+                    out.append(step.pattern.format(*item) if isinstance(item, tuple) else step.pattern.format(item))
+                if len(out) == before + len(step.header):
+                    del out[before:]
+                    if step.empty is not None:
+                        out.append(step.empty)
+        return out
+
+    def render(self, row):
+        return "\n".join(self.lines(row))
+
+
+class TextWriter:
+    """Rendered reports, one after another, written in large chunks."""
+
+    def __init__(self, stream, template, limit=1 << 16):
+        self.stream = stream
+        self.template = template
+        self.limit = limit
+        self._parts = []
+        self._size = 0
+
+    def write(self, row):
+        text = self.template.render(row)
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.limit:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.stream.write("\n".join(self._parts) + "\n")
+            self._parts.clear()
+            self._size = 0
+
+
+class JSONLinesWriter:
+    """One JSON object per report holding the template's fields."""
+
+    def __init__(self, stream, template):
+        self.stream = stream
+        import json
+
+        self.fields = template.fields
+        self._encode = json.JSONEncoder(default=str).encode
+
+    def write(self, row):
+        self.stream.write(self._encode({field: row[field] for field in self.fields}) + "\n")
+
+    def flush(self):
+        pass
+
+
+class CSVWriter:
+    """One CSV row per report; list and mapping fields are joined with "; "."""
+
+    def __init__(self, stream, template):
+        import csv
+
+        self.fields = template.fields
+        self._writer = csv.writer(stream)
+        self._writer.writerow(self.fields)
+
+    def write(self, row):
+        self._writer.writerow([_cell(row[field]) for field in self.fields])
+
+    def flush(self):
+        pass
+
+
+def _cell(value):
+    if hasattr(value, "items"):
+        return "; ".join(f"{k}: {v}" for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return "; ".join(" ".join(map(str, v)) if isinstance(v, tuple) else str(v) for v in value)
+    return value
+
+
+WRITERS = {"text": TextWriter, "json": JSONLinesWriter, "csv": CSVWriter}
+
+
+def write_reports(template, rows, stream, format="text"):
+    """Stream one report per row to `stream`; returns how many were written."""
+    try:
+        writer = WRITERS[format](stream, template)
+    except KeyError:
+        raise ValueError(f"unknown report format: {format!r}") from None
+    count = 0
+    for row in rows:
+        writer.write(row)
+        count += 1
+    writer.flush()
+    return count
+
+
+class ReportCache(Guarded):
+    """Rendered reports in a bounded LRU, dropped when what they were built from changes.
+
+    Each entry is stored with the dependency tags it was rendered from, e.g.
+    ("patient", id) and ("staff", id); invalidate(tag) removes every entry
+    that carries the tag. lookup() hands out a stamp that put() checks, so a
+    report rendered while one of its sources was changing is not cached.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # key -> (text, tags)
+        self._dependents = {}  # tag -> set of keys
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key):
+        """Return (text, None) on a hit, or (None, stamp) to pass to put() on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], None
+            self.misses += 1
+            return None, self.invalidations
+
+    def put(self, key, text, tags, stamp):
+        with self._lock:
+            if stamp != self.invalidations:
+                return
+            self._drop(key)
+            self._entries[key] = (text, tuple(tags))
+            for tag in tags:
+                self._dependents.setdefault(tag, set()).add(key)
+            if len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._dependents.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[tag]
+
+    def invalidate(self, *tags):
+        with self._lock:
+            self.invalidations += 1
+            for tag in tags:
+                for key in self._dependents.pop(tag, ()):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += 1
+            self._entries.clear()
+            self._dependents.clear()
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize,
+                "evictions": self.evictions, "invalidations": self.invalidations}
@@ -0,0 +1,166 @@
+import heapq
+from bisect import bisect_left, insort
+
+from .locks import Guarded, Lock
+
+_word = None
+
+
+def _words(text):
+    global _word
+    if _word is None:
+        import re  # compiled on the first search or registration rather than at import
+
+        _word = re.compile(r"[^\W_]+")
+    return _word.findall(text)
+
+
+def tokenize(value):
+    """Lower-case word tokens from a string, or from every string inside lists and dicts."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return _words(value.casefold())
+    if hasattr(value, "values"):
+        value = value.values()
+    if hasattr(value, "__iter__"):
+        return [token for item in value for token in tokenize(item)]
+    return _words(str(value).casefold())
+
+
+def within_distance(a, b, limit):
+    """True when a and b are at most `limit` single-character edits apart."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class SearchIndex(Guarded):
+    """Inverted index from word tokens to document ids, per field.
+
+    index() replaces what a document holds in one field, so updates are
+    incremental. The vocabulary is also kept as a sorted list, which turns a
+    prefix into one bisect and a short scan; fuzzy terms are matched against
+    the vocabulary words of a similar length that share their first letter.
+
+    Postings are insertion-ordered, so results come back roughly oldest
+    first, and a query with a limit walks the rarest term's postings and
+    stops after `limit` hits instead of building the whole result set.
+    """
+
+    def __init__(self):
+        self._postings = {}  # field -> token -> {doc id: None}, in posting order
+        self._tokens = {}  # (doc id, field) -> tokens it was indexed under
+        self._counts = {}  # token -> how many (field, token) postings exist
+        self._vocabulary = []
+        self._order = {}  # doc id -> when it was first indexed
+        self._indexed = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._order)
+
+    def fields(self):
+        return list(self._postings)
+
+    def index(self, doc_id, field, value):
+        tokens = frozenset(tokenize(value))
+        with self._lock:
+            if doc_id not in self._order:
+                self._order[doc_id] = self._indexed
+                self._indexed += 1
+            postings = self._postings.setdefault(field, {})
+            old = self._tokens.get((doc_id, field), frozenset())
+            for token in old - tokens:
+                self._unpost(postings, token, doc_id)
+            for token in tokens - old:
+                docs = postings.get(token)
+                if docs is None:
+                    docs = postings[token] = {}
+                    self._counts[token] = self._counts.get(token, 0) + 1
+                    if self._counts[token] == 1:
+                        insort(self._vocabulary, token)
+                docs[doc_id] = None
+            if tokens:
+                self._tokens[(doc_id, field)] = tokens
+            else:
+                self._tokens.pop((doc_id, field), None)
+
+    def _unpost(self, postings, token, doc_id):
+        docs = postings[token]
+        docs.pop(doc_id, None)
+        if docs:
+            return
+        del postings[token]
+        self._counts[token] -= 1
+        if not self._counts[token]:
+            del self._counts[token]
+            del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def remove(self, doc_id):
+        with self._lock:
+            for field, postings in self._postings.items():
+                for token in self._tokens.pop((doc_id, field), ()):
+                    self._unpost(postings, token, doc_id)
+            self._order.pop(doc_id, None)
+
+    def _prefixed(self, prefix):
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\U0010ffff", start)
+        return self._vocabulary[start:end]
+
+    def _similar(self, token, limit):
+        if not token:
+            return []
+        return [word for word in self._prefixed(token[0]) if within_distance(token, word, limit)]
+
+    def _postings_for(self, term, fields, prefix, fuzzy):
+        """Every posting dict a term matches, across the words it expands to and the fields."""
+        words = {term}
+        if prefix:
+            words.update(self._prefixed(term))
+        if fuzzy:
+            words.update(self._similar(term, fuzzy))
+        found = []
+        for field in fields:
+            postings = self._postings.get(field, {})
+            found.extend(postings[word] for word in words if word in postings)
+        return found
+
+    def search(self, query, fields=None, prefix=True, fuzzy=0, limit=None):
+        """Doc ids holding every word of `query` in any of `fields` (default: all).
+
+        With `prefix`, a word also matches longer words it starts; with
+        `fuzzy` = n, it also matches words up to n edits away.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            fields = list(self._postings) if fields is None else [fields] if isinstance(fields, str) else fields
+            matched = [self._postings_for(term, fields, prefix, fuzzy) for term in terms]
+            if not all(matched):
+                return []
+            matched.sort(key=lambda postings: sum(map(len, postings)))
+            rarest, others = matched[0], matched[1:]
+            if len(rarest) == 1:
+                candidates = rarest[0]
+            else:
+                union = set().union(*rarest)
+                candidates = (heapq.nsmallest(limit, union, key=self._order.__getitem__) if limit is not None and not others
+                              else sorted(union, key=self._order.__getitem__))
+            result = []
+            for doc_id in candidates:
+                if all(any(doc_id in docs for docs in postings) for postings in others):
+                    result.append(doc_id)
+                    if len(result) == limit:
+                        break
+            return result
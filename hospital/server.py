@@ -0,0 +1,161 @@
+import asyncio
+import contextvars
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from .output import EventSink, scoped
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "items"):
+        return dict(value.items())
+    return str(value)
+
+
+def _encode(response):
+    return (json.dumps(response, default=_jsonable) + "\n").encode()
+
+
+class RequestServer:
+    """Line-protocol front end that runs named operations for many clients.
+
+    Each request is one JSON line, {"id": ..., "op": name, "args": {...}}, and
+    gets one JSON line back with "ok", "result" or "error", and "output" (the
+    messages the operation emitted). Requests from every connection go through
+    one bounded queue; when it is full, connections stop being read, so slow
+    processing pushes back on clients instead of growing memory. Operations
+    run on `executor`, never on the event loop, since they may wait on lock
+    stripes; those named in `heavy` get `heavy_executor` instead, so a burst of
+    reports cannot take every thread the quick operations need.
+    """
+
+    def __init__(self, ops, heavy=(), queue_size=1024, workers=8, executor=None, heavy_executor=None):
+        self.ops = ops
+        self.heavy = frozenset(heavy)
+        self.queue_size = queue_size
+        self.workers = workers
+        self.executor = executor or ThreadPoolExecutor(max_workers=4)
+        self.heavy_executor = heavy_executor or ThreadPoolExecutor(max_workers=2)
+        self._queue = None
+        self._server = None
+        self._tasks = []
+
+    def _call(self, op, args):
+        sink = EventSink()
+        with scoped(sink):
+            result = self.ops[op](**args)
+        return result, [event["message"] for event in sink.events]
+
+    async def _run(self, request):
+        op, args = request.get("op"), request.get("args") or {}
+        if not isinstance(op, str) or op not in self.ops:
+            return {"ok": False, "error": f"unknown operation: {op!r}", "output": []}
+        if not isinstance(args, dict):
+            return {"ok": False, "error": "args must be a JSON object", "output": []}
+        executor = self.heavy_executor if op in self.heavy else self.executor
+        loop = asyncio.get_running_loop()
+        call = contextvars.copy_context().run
+        try:
+            result, output = await loop.run_in_executor(executor, call, self._call, op, args)
+        except Exception as error:
+            return {"ok": False, "error": f"{type(error).__name__}: {error}", "output": []}
+        return {"ok": True, "result": result, "output": output}
+
+    async def _work(self):
+        while True:
+            request, reply = await self._queue.get()
+            try:
+                response = await self._run(request)
+            except Exception as error:
+                response = {"ok": False, "error": f"{type(error).__name__}: {error}", "output": []}
+            finally:
+                self._queue.task_done()
+            if not reply.done():
+                reply.set_result(response)
+
+    async def _handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    error = None if isinstance(request, dict) else "request must be a JSON object"
+                except ValueError:
+                    error = "request is not valid JSON"
+                if error is not None:
+                    writer.write(_encode({"id": None, "ok": False, "error": error, "output": []}))
+                    await writer.drain()
+                    continue
+                reply = loop.create_future()
+                await self._queue.put((request, reply))
+                response = await reply
+                response["id"] = request.get("id")
+                writer.write(_encode(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=4096)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        await self.start(host, port)
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self, host=DEFAULT_HOST, port=0):
+        """Run the server on a daemon thread; returns the (host, port) it listens on."""
+        ready = threading.Event()
+        address = []
+
+        async def run():
+            address.extend(await self.start(host, port))
+            ready.set()
+            await self._server.serve_forever()
+
+        threading.Thread(target=asyncio.run, args=(run(),), daemon=True).start()
+        ready.wait()
+        return tuple(address)
+
+
+class RequestError(Exception):
+    pass
+
+
+class Client:
+    """Blocking client for RequestServer; one request in flight at a time."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._socket = socket.create_connection((host, port))
+        self._file = self._socket.makefile("rwb")
+        self._next_id = 0
+
+    def call(self, op, **args):
+        """Run op on the server; returns (result, output lines) or raises RequestError."""
+        self._next_id += 1
+        self._file.write(_encode({"id": self._next_id, "op": op, "args": args}))
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise RequestError("server closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise RequestError(response["error"])
+        return response["result"], response["output"]
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
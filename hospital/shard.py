@@ -0,0 +1,319 @@
+import importlib
+import io
+import multiprocessing
+import os
+import zlib
+
+from .beds import BedAllocator
+from .output import EventSink, SilentSink, emit, scoped, set_sink
+from .tariff import rate_card
+from .triage import severity_rank
+
+# Calls whose first argument is a patient id run on that patient's shard.
+PATIENT_OPS = frozenset({
+    "register_patient", "schedule_appointment", "create_medical_record", "process_billing",
+    "manage_emergency_admission", "assign_room", "manage_discharge_process",
+    "generate_patient_report", "calculate_treatment_cost",
+})
+# Reference data every shard needs a full copy of.
+REPLICATED_OPS = frozenset({"add_medical_staff", "load_rate_card", "set_tariff"})
+# Hospital-wide stock lives on shard 0 only.
+CENTRAL_OPS = frozenset({"track_medication_inventory"})
+# Beds a ward gets when a patient is admitted to it before add_room, as in hospital.core.
+DEFAULT_ROOM_BEDS = 1
+
+
+def _ward_patients(module, room_type):
+    return module.patients_in_room(room_type)
+
+
+def _ward_reports(module, room_type, report_type, format):
+    out = io.StringIO()
+    module.write_patient_reports(_ward_patients(module, room_type), report_type, out, format)
+    return out.getvalue()
+
+
+def _triage_peek(module):
+    return module.triage.peek()
+
+
+def _beds_of(module, patient_ids):
+    return [module.beds.bed_of(patient_id) for patient_id in patient_ids]
+
+
+def _bed_state(module):
+    beds = module.beds
+    return {ward: beds.capacity(ward) for ward in beds.wards()}, dict(beds._bed_of)
+
+
+def _efficiency(module, metrics_type, time_period):
+    with scoped(SilentSink()):
+        return module.analyze_hospital_efficiency(metrics_type, time_period)
+
+
+QUERIES = {
+    "ward_patients": _ward_patients,
+    "ward_reports": _ward_reports,
+    "triage_peek": _triage_peek,
+    "beds_of": _beds_of,
+    "bed_state": _bed_state,
+    "efficiency": _efficiency,
+}
+
+
+def _worker(connection, module_name, journal_directory):
+    set_sink(SilentSink())
+    module = importlib.import_module(module_name)
+    module.reset_state()
+    if journal_directory is not None:
+        module.enable_journal(journal_directory)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        kind, name, payload = message
+        sink = EventSink()
+        try:
+            with scoped(sink):
+                if kind == "call":
+                    function = getattr(module, name)
+                    result = [function(*args, **kwargs) for args, kwargs in payload]
+                else:
+                    result = QUERIES[name](module, *payload)
+        except Exception as error:
+            connection.send((False, error, sink.events))
+        else:
+            connection.send((True, result, sink.events))
+    connection.close()
+
+
+def _patient_id(args, kwargs):
+    return args[0] if args else kwargs["patient_id"]
+
+
+def shard_of(patient_id, shards):
+    """Stable shard number for a patient id, the same in every process and run."""
+    return zlib.crc32(repr(patient_id).encode()) % shards
+
+
+class ShardedHospital:
+    """hospital.core state spread over worker processes by patient id.
+
+    Patients, their records, bills, stays and emergencies live on the shard
+    their id hashes to. Staff and tariffs are replicated to every shard, and
+    medication stock is kept on shard 0. Beds are handed out here, from one
+    hospital-wide pool, so no shard turns a patient away while another has a
+    free bed; every shard mirrors the whole ward and records the bed it is
+    told to. Hospital-wide questions are asked of every shard and the answers merged.
+    Messages the workers emit are replayed through this process's output sink.
+    With `journal`, shard i journals to and restores from journal/shard-i.
+    """
+
+    def __init__(self, shards=4, module="hospital.core", journal=None):
+        context = multiprocessing.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        for shard in range(shards):
+            parent, child = context.Pipe()
+            directory = None if journal is None else os.path.join(journal, f"shard-{shard}")
+            process = context.Process(target=_worker, args=(child, module, directory), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        self._beds = BedAllocator()
+        if journal is not None:
+            self._restore_beds()
+
+    def _restore_beds(self):
+        """Rebuild the bed pool from the wards and stays the shards restored."""
+        states = self._scatter("query", "bed_state", {shard: () for shard in range(len(self))})
+        capacities = {}
+        for wards, _ in states.values():
+            for ward, count in wards.items():
+                capacities[ward] = max(count, capacities.get(ward, 0))
+        for ward, count in capacities.items():
+            self._beds.add_ward(ward, count)
+        for _, occupied in states.values():
+            for patient_id, bed in occupied.items():
+                self._beds.claim(bed, patient_id)
+
+    def __len__(self):
+        return len(self._connections)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def shard_of(self, patient_id):
+        return shard_of(patient_id, len(self))
+
+    def _send(self, shard, kind, name, payload):
+        self._connections[shard].send((kind, name, payload))
+
+    def _receive(self, shard, echo=True):
+        ok, result, events = self._connections[shard].recv()
+        if echo:
+            for event in events:
+                emit(event.pop("event"), event.pop("message"), **event)
+        return ok, result
+
+    def _scatter(self, kind, name, payloads, echo=None):
+        """Send payloads[shard] to each listed shard at once, then gather {shard: result}.
+
+        Every shard's reply is read before the first error is raised, so the
+        pipes stay in step. Only the events of shards in `echo` (default: all)
+        are replayed.
+        """
+        for shard, payload in payloads.items():
+            self._send(shard, kind, name, payload)
+        results, error = {}, None
+        for shard in payloads:
+            ok, result = self._receive(shard, echo is None or shard in echo)
+            if ok:
+                results[shard] = result
+            elif error is None:
+                error = result
+        if error is not None:
+            raise error
+        return results
+
+    def call(self, op, *args, **kwargs):
+        """Run one hospital.core operation where its data lives."""
+        if op == "add_room":
+            return self.add_room(*args, **kwargs)
+        if op == "load_rate_card":
+            # Open files and generators cannot be sent to the shards, so they are read here.
+            args, kwargs = (rate_card(*args, **kwargs),), {}
+        if op in REPLICATED_OPS:
+            return self._scatter("call", op, {shard: [(args, kwargs)] for shard in range(len(self))})[0][0]
+        if op in CENTRAL_OPS:
+            return self._scatter("call", op, {0: [(args, kwargs)]})[0][0]
+        if op in PATIENT_OPS:
+            return self._patient_calls(op, [(args, kwargs)])[0]
+        raise ValueError(f"{op!r} has no shard routing; use a cross-shard query instead")
+
+    def call_many(self, op, calls):
+        """Run op for many patients; every shard works on its share in parallel.
+
+        `calls` holds positional argument tuples, patient id first; results
+        come back in the same order.
+        """
+        if op not in PATIENT_OPS:
+            raise ValueError(f"{op!r} is not a per-patient operation")
+        return self._patient_calls(op, [(tuple(args), {}) for args in calls])
+
+    def _patient_calls(self, op, calls):
+        """Run (args, kwargs) calls on their patients' shards; results in the same order.
+
+        Admissions take their bed from the central pool first and pass it on;
+        after discharges, failed admissions and any shard error the pool is
+        brought back in line with what the shards actually hold.
+        """
+        results = [None] * len(calls)
+        if op == "assign_room":
+            calls = [self._with_bed(position, args, kwargs, results) for position, (args, kwargs) in enumerate(calls)]
+        batches, positions = {}, {}
+        for position, call in enumerate(calls):
+            if call is None:
+                continue
+            args, kwargs = call
+            shard = self.shard_of(_patient_id(args, kwargs))
+            batches.setdefault(shard, []).append(call)
+            positions.setdefault(shard, []).append(position)
+        try:
+            for shard, shard_results in self._scatter("call", op, batches).items():
+                for position, result in zip(positions[shard], shard_results):
+                    results[position] = result
+        except Exception:
+            if op in ("assign_room", "manage_discharge_process"):
+                self._sync_beds([_patient_id(*call) for call in calls if call is not None])
+            raise
+        if op == "manage_discharge_process":
+            self._sync_beds([_patient_id(*call) for call in calls])
+        elif op == "assign_room":
+            # A shard that could not seat the patient returns None; give the bed back.
+            self._sync_beds([_patient_id(*call) for call, result in zip(calls, results)
+                             if call is not None and result is None])
+        return results
+
+    def _with_bed(self, position, args, kwargs, results):
+        """The assign_room call with a bed from the central pool, or None when there is none."""
+        patient_id = _patient_id(args, kwargs)
+        room_type = args[1] if len(args) > 1 else kwargs["room_type"]
+        if not self._beds.capacity(room_type):
+            self.add_room(room_type, DEFAULT_ROOM_BEDS)
+        bed = self._beds.allocate(room_type, patient_id)
+        if bed is None:
+            emit("room_unavailable", "Room occupancy conflict. No available rooms of this type.",
+                 patient_id=patient_id, room_type=room_type)
+            return None
+        return args, {**kwargs, "bed": bed}
+
+    def _sync_beds(self, patient_ids):
+        """Free the central beds of patients whose shard does not have them in one."""
+        if not patient_ids:
+            return
+        by_shard = {}
+        for patient_id in patient_ids:
+            by_shard.setdefault(self.shard_of(patient_id), []).append(patient_id)
+        held = self._scatter("query", "beds_of", {shard: (ids,) for shard, ids in by_shard.items()})
+        for shard, beds in held.items():
+            for patient_id, bed in zip(by_shard[shard], beds):
+                if bed is None:
+                    self._beds.release(patient_id)
+
+    def add_room(self, room_type, bed_count):
+        """Add beds to a ward's hospital-wide pool; every shard mirrors the whole ward."""
+        self._beds.add_ward(room_type, bed_count)
+        self._scatter("call", "add_room", {shard: [((room_type, bed_count), {})] for shard in range(len(self))},
+                      echo=(0,))
+
+    def next_emergency(self):
+        """Call the most severe waiting patient across every shard."""
+        peeks = self._scatter("query", "triage_peek", {shard: () for shard in range(len(self))})
+        waiting = [(-severity_rank(peek[1]), shard) for shard, peek in peeks.items() if peek is not None]
+        if not waiting:
+            emit("triage_empty", "No emergency patients waiting.")
+            return None
+        _, shard = min(waiting)
+        return self._scatter("call", "next_emergency", {shard: [((), {})]})[shard][0]
+
+    def analyze_hospital_efficiency(self, metrics_type, time_period):
+        """Sum each shard's count; the same metrics as hospital.analyze_hospital_efficiency."""
+        counts = self._scatter("query", "efficiency", {shard: (metrics_type, time_period) for shard in range(len(self))})
+        total = sum(counts.values())
+        if metrics_type in ("appointments", "admissions"):
+            emit("efficiency_metric", f"{metrics_type.capitalize()} in period: {total}", metric=metrics_type, value=total)
+        return total
+
+    def ward_patients(self, room_type):
+        found = self._scatter("query", "ward_patients", {shard: (room_type,) for shard in range(len(self))})
+        return [pid for shard in sorted(found) for pid in found[shard]]
+
+    def write_ward_reports(self, room_type, stream, report_type="dashboard", format="text"):
+        """Reports for everyone in a ward, rendered on the shards and written in shard order."""
+        parts = self._scatter("query", "ward_reports",
+                              {shard: (room_type, report_type, format) for shard in range(len(self))})
+        header_written = False
+        for shard in sorted(parts):
+            text = parts[shard]
+            if format == "csv" and text:
+                header, _, text = text.partition("\n")
+                if not header_written:
+                    stream.write(header + "\n")
+                    header_written = True
+            stream.write(text)
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections, self._processes = [], []
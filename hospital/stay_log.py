@@ -0,0 +1,42 @@
+from array import array
+
+from .lazy import optional_import
+from .locks import Guarded, Lock
+
+
+class StayLog(Guarded):
+    """Columnar log of completed stays, stored as admission/discharge day numbers."""
+
+    def __init__(self):
+        self.admissions = array("q")
+        self.discharges = array("q")
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self.admissions)
+
+    def append(self, admission_date, discharge_date):
+        with self._lock:
+            self.admissions.append(admission_date.toordinal())
+            self.discharges.append(discharge_date.toordinal())
+
+    def overlap(self, start_date, end_date):
+        """Return (stays, bed_days) for stays overlapping [start_date, end_date], both inclusive."""
+        with self._lock:
+            start, end = start_date.toordinal(), end_date.toordinal()
+            if not self.admissions:
+                return 0, 0
+            np = optional_import("numpy")  # without it, a plain loop over the same columns
+            if np is not None:
+                admissions = np.frombuffer(self.admissions, dtype=np.int64)
+                discharges = np.frombuffer(self.discharges, dtype=np.int64)
+                mask = (discharges >= start) & (admissions <= end)
+                days = np.minimum(discharges[mask], end) - np.maximum(admissions[mask], start) + 1
+                return int(days.size), int(days.sum())
+            stays = bed_days = 0
+            for admission, discharge in zip(self.admissions, self.discharges):
+                if discharge < start or admission > end:
+                    continue
+                stays += 1
+                bed_days += min(discharge, end) - max(admission, start) + 1
+            return stays, bed_days
@@ -0,0 +1,182 @@
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime
+
+from .bulk import read_rows
+from .dates import to_datetime, today
+from .locks import Guarded, Lock
+
+RATE_CARD_FIELDS = ("code", "name", "price", "insurer", "effective_from")
+_BEGINNING = date.min.toordinal()
+
+
+def room_code(room_type):
+    return f"ROOM:{room_type.lower()}"
+
+
+def _ordinal(when):
+    if when is None:
+        return today().toordinal()
+    if isinstance(when, datetime):
+        return when.date().toordinal()
+    if isinstance(when, date):
+        return when.toordinal()
+    return to_datetime(when).toordinal()
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def rate_card(source):
+    """Rows of a rate card as (code, name, price, insurer, effective_from) tuples.
+
+    A path is opened to check it can be read and is returned as it is, to be
+    read on the next lookup; any other source is read now, so open files and
+    generators can be closed or exhausted afterwards and the rows can be
+    journaled or sent to a shard.
+    """
+    if _is_path(source):
+        open(source, "rb").close()
+        return source
+    return _read(source)
+
+
+def _read(source):
+    rows = []
+    for _, row in read_rows(source, RATE_CARD_FIELDS):
+        price = row["price"]
+        if isinstance(price, str):
+            price = float(price) if "." in price else int(price)
+        effective_from = row.get("effective_from")
+        if effective_from in (None, ""):
+            effective_from = None
+        elif not isinstance(effective_from, date):
+            effective_from = to_datetime(effective_from).date()
+        rows.append((row["code"], row.get("name") or row["code"], price, row.get("insurer"), effective_from))
+    return rows
+
+
+class TariffBook(Guarded):
+    """Service codes priced per insurer and per effective date.
+
+    Rate cards are iterables or CSV/JSONL exports with RATE_CARD_FIELDS
+    columns; one given by path is only read on the first lookup after load(),
+    anything else as it is loaded. Resolved prices are kept in
+    a bounded LRU cache tagged with the book's version; any change to the book
+    bumps the version, so stale entries are never served.
+    """
+
+    def __init__(self, source=None, maxsize=4096):
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._pending = []
+        self._prices = {}  # (code, insurer) -> ([effective ordinals], [(name, price)])
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        if source is not None:
+            self.load(source)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_cache"] = OrderedDict()
+        return state
+
+    def load(self, source):
+        """Add a rate card; a path is read the next time a price is resolved."""
+        card = rate_card(source)
+        with self._lock:
+            if _is_path(card):
+                self._pending.append(card)
+            else:
+                self._add_rows(card)
+            self.version += 1
+
+    def set_price(self, code, price, name=None, insurer=None, effective_from=None):
+        with self._lock:
+            self._add(code, name or code, price, insurer, effective_from)
+            self.version += 1
+
+    def _add(self, code, name, price, insurer, effective_from):
+        start = _BEGINNING if effective_from in (None, "") else _ordinal(effective_from)
+        starts, entries = self._prices.setdefault((code, insurer or None), ([], []))
+        position = bisect_right(starts, start)
+        if position and starts[position - 1] == start:
+            entries[position - 1] = (name, price)
+        else:
+            starts.insert(position, start)
+            entries.insert(position, (name, price))
+
+    def _add_rows(self, rows):
+        for code, name, price, insurer, effective_from in rows:
+            self._add(code, name, price, insurer, effective_from)
+
+    def _load_pending(self):
+        # A card that can no longer be read (moved, or with bad rows) leaves the
+        # queue and raises once, instead of failing every later lookup.
+        while self._pending:
+            source = self._pending[0]
+            try:
+                rows = _read(source)
+            finally:
+                del self._pending[0]
+            self._add_rows(rows)
+
+    def _lookup(self, code, insurer, day):
+        for key in ((code, insurer), (code, None)):
+            card = self._prices.get(key)
+            if card is None:
+                continue
+            position = bisect_right(card[0], day)
+            if position:
+                return card[1][position - 1]
+        raise KeyError(f"no price for {code!r}" + (f" under {insurer!r}" if insurer else ""))
+
+    def resolve(self, code, insurer=None, on=None):
+        """Return (name, price) for code as billed to insurer on the given date."""
+        key = (code, insurer or None, _ordinal(on))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == self.version:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            self._load_pending()
+            result = self._lookup(key[0], key[1], key[2])
+            self._cache[key] = (self.version, result)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+            return result
+
+    def price(self, code, insurer=None, on=None):
+        return self.resolve(code, insurer, on)[1]
+
+    def price_services(self, services, insurer=None, on=None):
+        """Turn codes in a service list into {"name", "cost"} lines; priced lines pass through.
+
+        A (code, quantity) pair is billed as quantity times the unit price, and
+        a {name: cost} mapping is taken as already priced.
+        """
+        if hasattr(services, "items"):
+            return [{"name": name, "cost": cost} for name, cost in services.items()]
+        lines = []
+        for service in services:
+            if isinstance(service, str):
+                service = (service, 1)
+            if isinstance(service, tuple):
+                code, quantity = service
+                name, price = self.resolve(code, insurer, on)
+                if quantity != 1:
+                    name, price = f"{name} x{quantity}", price * quantity
+                service = {"name": name, "cost": price}
+            lines.append(service)
+        return lines
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache),
+                "maxsize": self.maxsize, "version": self.version}
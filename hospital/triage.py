@@ -0,0 +1,106 @@
+import heapq
+
+from .locks import Guarded, Lock
+
+SEVERITY_RANKS = {
+    "critical": 5,
+    "severe": 4,
+    "high": 4,
+    "serious": 3,
+    "moderate": 3,
+    "medium": 3,
+    "low": 2,
+    "minor": 1,
+}
+
+
+def severity_rank(severity_level):
+    """Numeric severity (higher is more urgent) from a number or a level name.
+
+    Raises ValueError for anything else, so callers can check a level before
+    they record the emergency.
+    """
+    if isinstance(severity_level, str):
+        level = severity_level.strip().lower()
+        if level.isdigit():
+            return int(level)
+        if level not in SEVERITY_RANKS:
+            raise ValueError(f"unknown severity level: {severity_level!r}")
+        return SEVERITY_RANKS[level]
+    if isinstance(severity_level, bool) or not isinstance(severity_level, (int, float)):
+        raise ValueError(f"unknown severity level: {severity_level!r}")
+    return severity_level
+
+
+class TriageQueue(Guarded):
+    """Waiting emergency patients, most severe first and then by arrival.
+
+    Re-prioritising marks the old heap entry dead and pushes a new one with
+    the same arrival number, so every operation stays O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._arrivals = 0
+        self._pushes = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, patient_id):
+        return patient_id in self._entries
+
+    def _push(self, patient_id, rank, severity_level, arrival):
+        # The push number breaks ties with a dead entry for the same arrival,
+        # so the heap never compares patient ids or raw levels.
+        self._pushes += 1
+        entry = [-rank, arrival, self._pushes, patient_id, severity_level, True]
+        self._entries[patient_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def admit(self, patient_id, severity_level):
+        rank = severity_rank(severity_level)
+        with self._lock:
+            if patient_id in self._entries:
+                self._reprioritize(patient_id, rank, severity_level)
+                return
+            self._arrivals += 1
+            self._push(patient_id, rank, severity_level, self._arrivals)
+
+    def _reprioritize(self, patient_id, rank, severity_level):
+        entry = self._entries.pop(patient_id)
+        entry[-1] = False
+        self._push(patient_id, rank, severity_level, entry[1])
+
+    def reprioritize(self, patient_id, severity_level):
+        rank = severity_rank(severity_level)
+        with self._lock:
+            self._reprioritize(patient_id, rank, severity_level)
+
+    def remove(self, patient_id):
+        with self._lock:
+            self._entries.pop(patient_id)[-1] = False
+
+    def _drop_dead(self):
+        while self._heap and not self._heap[0][-1]:
+            heapq.heappop(self._heap)
+
+    def peek(self):
+        """Return (patient_id, severity_level) of the next patient without removing it."""
+        with self._lock:
+            self._drop_dead()
+            if not self._heap:
+                return None
+            _, _, _, patient_id, severity_level, _ = self._heap[0]
+            return patient_id, severity_level
+
+    def pop_next(self):
+        with self._lock:
+            self._drop_dead()
+            if not self._heap:
+                raise IndexError("triage queue is empty")
+            _, _, _, patient_id, severity_level, _ = heapq.heappop(self._heap)
+            del self._entries[patient_id]
+            return patient_id, severity_level
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hospital import core as core_module  # noqa: E402
+from hospital import frontdesk as frontdesk_module  # noqa: E402
+from hospital.output import EventSink, using  # noqa: E402
+
+
+@pytest.fixture
+def events():
+    """Events emitted during the test, instead of console output."""
+    with using(EventSink()) as sink:
+        yield sink.events
+
+
+def _fresh(module):
+    module.reset_state()
+    yield module
+    if module.journal is not None:
+        module.journal.close()
+        module.journal = None
+    module.reset_state()
+
+
+@pytest.fixture
+def core(events):
+    yield from _fresh(core_module)
+
+
+@pytest.fixture
+def frontdesk(events):
+    yield from _fresh(frontdesk_module)
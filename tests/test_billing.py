@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+from hospital.billing import BillingBatch, bill_patient, coverage_bps, coverage_label
+
+
+def _discharge(frontdesk, patient_id):
+    frontdesk.register_patient(patient_id, "Romi", {"age": 21}, "Diabetes", {"company": "Star Health"})
+    frontdesk.assign_room(patient_id, "general room", "1-7-2025", 2)
+    frontdesk.manage_discharge_process(patient_id, "1-7-2025", "3-7-2025", "Rest")
+
+
+def test_each_caller_states_its_coverage_convention():
+    assert coverage_bps(1) == 10_000
+    assert coverage_bps(1, percent=True) == 100
+    assert coverage_bps(0.8) == coverage_bps(80, percent=True) == 8_000
+    assert coverage_label(1, percent=True) == "1%"
+
+
+def test_core_insurers_pay_whole_units():
+    bill = bill_patient("P1", [{"name": "Ward", "cost": Decimal("100.50")}], 0.5)
+    assert (bill.insurance_coverage, bill.amount_due) == (50, Decimal("50.50"))
+
+
+def test_frontdesk_bills_one_percent_as_one_percent(frontdesk, events):
+    _discharge(frontdesk, 123)
+    bill = frontdesk.process_billing(123, {"Consultation": 1000}, 1)
+    assert (bill.insurance_coverage, bill.amount_due) == (10, 990)
+    assert "Insurance (1%) : 10" in events[-1]["message"]
+
+
+def test_frontdesk_keeps_the_exact_insurer_share(frontdesk, events):
+    _discharge(frontdesk, 123)
+    bill = frontdesk.process_billing(123, {"Consultation": Decimal("1.50")}, 50)
+    assert (bill.insurance_coverage, bill.amount_due) == (Decimal("0.75"), Decimal("0.75"))
+    assert "You have no insurance coverage" not in events[-1]["message"]
+
+
+def test_batches_match_single_bills():
+    batch = BillingBatch(percent=True, coverage_unit=1)
+    batch.add_patient("P1", 50)
+    batch.add_services("P1", {"Ward": Decimal("100.50")})
+    batch.add_patient("P2", 0)
+    batch.add_services("P2", {"Ward": 300})
+    bills = batch.run()
+    assert bills[0] == bill_patient("P1", {"Ward": Decimal("100.50")}, 50, percent=True, coverage_unit=1)
+    assert [bill.insurance_coverage for bill in bills] == [Decimal("50.25"), 0]
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded_after(module, names):
+    code = f"import sys, {module}; print(' '.join(name for name in {names!r} if name in sys.modules))"
+    # -S keeps site's own imports out of the answer.
+    result = subprocess.run([sys.executable, "-S", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def test_importing_the_front_desk_leaves_threading_and_functools_unloaded():
+    assert _loaded_after("hospital.frontdesk", ("threading", "functools", "contextlib")) == []
+
+
+def test_a_journal_still_starts_its_flusher(frontdesk, tmp_path):
+    frontdesk.enable_journal(tmp_path)
+    assert frontdesk.journal._flusher.is_alive()
@@ -0,0 +1,75 @@
+from datetime import date
+
+from hospital.indexes import SecondaryIndex, SortedIndex
+
+
+def test_count_in_takes_a_string_as_one_key():
+    index = SecondaryIndex()
+    for key, value in (("a", 1), ("ab", 2), ("ab", 3), ("ab", 4)):
+        index.add(key, value)
+    assert index.count_in("ab") == 3
+    for key in ("b", "c"):
+        index.add(key, 5)
+    assert index.count_in("ab") == 3
+    assert index.count_in(["ab"]) == 3
+    assert index.count_in("x") == 0
+
+
+def test_count_in_agrees_whichever_side_is_smaller():
+    index = SortedIndex()
+    days = [date(2030, 1, day) for day in range(1, 11)]
+    for day in days:
+        index.add(day, day.day)
+    assert index.count_in(days[:2]) == 2
+    assert index.count_in(days + [date(2031, 1, 1)]) == 10
+
+
+def test_core_counts_admissions_on_a_single_day(core):
+    core.register_patient("P1", {"name": "P1"}, [], {})
+    core.assign_room("P1", "ward", "2030-01-01", 2)
+    assert core.analyze_hospital_efficiency("admissions", "2030-01-01") == 1
+    assert core.analyze_hospital_efficiency("admissions", ["2030-01-01", "2030-01-02"]) == 1
+
+
+def test_core_discharge_empties_the_room(core):
+    core.add_room("ward", 2)
+    for patient_id in ("P1", "P2"):
+        core.register_patient(patient_id, {"name": patient_id}, [], {})
+        core.assign_room(patient_id, "ward", "2030-01-01", 2)
+    core.manage_discharge_process("P1", "2030-01-03", "Rest")
+    assert core.patients_in_room("ward") == ["P2"]
+    core.assign_room("P1", "ward", "2030-01-05", 2)
+    assert core.patients_in_room("ward") == ["P2", "P1"]
+
+
+def test_frontdesk_discharge_moves_the_patient_to_the_ward_summaries(frontdesk):
+    for patient_id in (1, 2):
+        frontdesk.register_patient(patient_id, f"Patient {patient_id}", {"age": 30}, "Fracture", {})
+        frontdesk.assign_room(patient_id, "general room", "1-7-2025", 2)
+    frontdesk.manage_discharge_process(1, "1-7-2025", "3-7-2025", "Rest")
+    assert frontdesk.patients_in_room("general room") == [2]
+    assert frontdesk.discharges_by_room.get("general room") == [1]
+
+
+def test_buckets_keep_order_and_drop_values_in_place():
+    index = SecondaryIndex()
+    for patient_id in (3, 1, 2, 1):
+        index.add("ward", patient_id)
+    assert index.get("ward") == [3, 1, 2]
+    index.discard("ward", 1)
+    index.discard("ward", 9)
+    assert index.get("ward") == [3, 2]
+    assert index.count("ward") == 2
+
+
+def test_unhashable_records_are_kept_apart_and_found_by_equality():
+    from hospital.records import Appointment
+
+    index = SecondaryIndex()
+    first = Appointment(patient_id=1, doctor_id=2, appointment_date="d", appointment_type="x")
+    twin = Appointment(patient_id=1, doctor_id=2, appointment_date="d", appointment_type="x")
+    index.add("d", first)
+    index.add("d", twin)
+    assert index.count("d") == 2
+    index.discard("d", Appointment(patient_id=1, doctor_id=2, appointment_date="d", appointment_type="x"))
+    assert index.get("d") == [twin]
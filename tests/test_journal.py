@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+
+def _register(core, patient_id):
+    core.register_patient(patient_id, {"name": f"Patient {patient_id}"}, [], {})
+
+
+def _restart(core, directory):
+    core.journal.close()
+    core.journal = None
+    core.reset_state()
+    core.enable_journal(directory)
+
+
+def test_restarts_do_not_journal_the_replayed_calls(core, tmp_path):
+    core.enable_journal(tmp_path)
+    _register(core, "P1")
+    core.journal.close()
+    size = (tmp_path / "journal-0.log").stat().st_size
+    for _ in range(3):
+        _restart(core, tmp_path)
+        assert (tmp_path / "journal-0.log").stat().st_size == size
+    assert list(core.patients) == ["P1"]
+
+
+def test_an_idle_journal_still_reaches_disk(core, tmp_path):
+    core.enable_journal(tmp_path)
+    _register(core, "P1")
+    log = tmp_path / "journal-0.log"
+    deadline = time.monotonic() + 5
+    while not (log.exists() and log.stat().st_size) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert log.stat().st_size > 0
+
+
+def test_calls_after_a_snapshot_replay_on_top_of_it(core, tmp_path):
+    core.enable_journal(tmp_path)
+    _register(core, "P1")
+    core.journal.snapshot()
+    _register(core, "P2")
+    _restart(core, tmp_path)
+    assert sorted(core.patients) == ["P1", "P2"]
+    assert not (tmp_path / "journal-0.log").exists()
+
+
+def test_a_snapshot_waits_for_calls_holding_stripes(core, tmp_path):
+    import threading
+
+    core.enable_journal(tmp_path)
+    taken = []
+    with core.locks.holding(("patient", "P1")):
+        worker = threading.Thread(target=lambda: taken.append(core.journal.snapshot()))
+        worker.start()
+        worker.join(0.2)
+        assert worker.is_alive()
+    worker.join()
+    assert taken == [None]
+
+
+def test_the_flusher_survives_a_failed_snapshot(tmp_path, events):
+    from hospital.journal import Journal
+
+    failures = []
+
+    def state():
+        if not failures:
+            failures.append(True)
+            raise RuntimeError("dictionary changed size during iteration")
+        return {}
+
+    journal = Journal(tmp_path, state, flush_interval=0.01, snapshot_every=1)
+    journal.append("op", (), {})
+    deadline = time.monotonic() + 5
+    while not [e for e in events if e["event"] == "journal_error"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    journal.append("op", (), {})
+    while not (tmp_path / "snapshot.pickle").exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal._flusher.is_alive()
+    assert (tmp_path / "snapshot.pickle").exists()
+    journal.close()
+
+
+@pytest.mark.parametrize("module", ["core", "frontdesk"])
+def test_every_journaled_call_takes_a_stripe(module, request):
+    module = request.getfixturevalue(module)
+    unlocked = [name for name, func in module.JOURNAL_OPS.items()
+                if getattr(getattr(module, name), "__wrapped__", None) is not func]
+    assert unlocked == []
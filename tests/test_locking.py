@@ -0,0 +1,43 @@
+import threading
+
+import pytest
+
+from hospital.billing import BillingBatch
+
+SHIFTS = [{"day": day, "shift": "Full Day", "start": "08:00", "end": "20:00", "location": "OPD"}
+          for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")]
+
+
+def _blocked_by(module, key, call):
+    """Run call on another thread while this one holds key's stripe; return what it returned."""
+    done = []
+    with module.locks.holding(key):
+        thread = threading.Thread(target=lambda: done.append(call()))
+        thread.start()
+        thread.join(0.2)
+        assert not done, "ran without waiting for the stripe"
+    thread.join()
+    return done[0]
+
+
+def test_bulk_appointments_wait_for_the_doctor(frontdesk):
+    frontdesk.register_patient(1, "Romi", {"age": 21}, "Diabetes", {})
+    frontdesk.add_medical_staff(101, "Dr. Rao", "General Doctor", SHIFTS, 99)
+    result = _blocked_by(frontdesk, ("doctor", 101), lambda: frontdesk.schedule_appointments_bulk(
+        [(1, 101, "1-7-2025 9:00", "Consultation", 30)]))
+    assert result.accepted == 1
+
+
+@pytest.mark.parametrize("key, call", [
+    (("patient", 5), lambda fd: fd.register_patients_bulk([(5, "Alex", {"age": 27}, "Fracture", {})])),
+    (("staff", 7), lambda fd: fd.add_medical_staff_bulk([(7, "Dr. Jay", "Surgeon", SHIFTS, 88)])),
+    (("pharmacy",), lambda fd: fd.track_medication_inventory_bulk([(3, 10, "1-1-2099", "Acme")])),
+    (("beds",), lambda fd: fd.rebill_discharged({}, {})),
+    (("tariffs",), lambda fd: fd.set_tariff("XRAY", 800)),
+], ids=["patients", "staff", "stock", "rebill", "tariffs"])
+def test_shared_store_writers_take_their_stripes(frontdesk, key, call):
+    _blocked_by(frontdesk, key, lambda: call(frontdesk))
+
+
+def test_core_billing_batches_take_the_billing_stripe(core):
+    _blocked_by(core, ("billing",), lambda: core.process_billing_batch(BillingBatch()))
@@ -0,0 +1,53 @@
+from datetime import date
+
+import pytest
+
+from hospital.occupancy import OccupancyCounter
+
+
+def test_the_calendar_grows_to_any_date():
+    counter = OccupancyCounter(days=4)
+    counter.record_stay(date(2025, 7, 1), date(2025, 7, 3))
+    counter.record_stay(date(1999, 7, 1), date(1999, 7, 2))
+    counter.admit(date(2140, 1, 1))
+    assert counter.occupied(date(1999, 7, 2)) == 1
+    assert counter.occupied(date(1999, 7, 3)) == 0
+    assert counter.bed_days(date(1900, 1, 1), date(2100, 1, 1)) == 5
+    assert counter.occupied(date(2200, 1, 1)) == 1
+
+
+def test_an_empty_calendar_has_no_occupancy():
+    counter = OccupancyCounter()
+    assert counter.occupied(date(1999, 1, 1)) == 0
+    assert counter.bed_days(date(1999, 1, 1), date(1999, 12, 31)) == 0
+
+
+def test_frontdesk_admits_and_analyses_stays_before_2000(frontdesk):
+    frontdesk.register_patient(1, "Romi", {"age": 21}, "Diabetes", {})
+    assert frontdesk.assign_room(1, "general room", "01-07-1999", 2) is not None
+    assert frontdesk.patient[1]["room_type"] == "general room"
+    frontdesk.manage_discharge_process(1, "01-07-1999", "03-07-1999", "Rest")
+    metrics = frontdesk.analyze_hospital_efficiency("all", ("01-07-1999", "03-07-1999"))
+    assert metrics["patient_throughput"] == 1
+    assert metrics["bed_occupancy_rate"] == 3 * 100 / (3 * frontdesk.TOTAL_BEDS)
+
+
+def test_frontdesk_takes_no_bed_for_an_unknown_patient(frontdesk):
+    free = frontdesk.beds.free_count("general room")
+    with pytest.raises(KeyError):
+        frontdesk.assign_room(404, "general room", "01-07-2025", 2)
+    assert frontdesk.beds.free_count("general room") == free
+    assert 404 not in frontdesk.assigned_rooms
+
+
+def test_the_occupancy_rate_does_not_read_the_stay_log(frontdesk, monkeypatch):
+    frontdesk.register_patient(1, "Romi", {"age": 21}, "Diabetes", {})
+    frontdesk.assign_room(1, "general room", "01-07-2025", 2)
+    frontdesk.manage_discharge_process(1, "01-07-2025", "02-07-2025", "Rest")
+
+    def overlap(*args):
+        raise AssertionError("scanned the stay log")
+
+    monkeypatch.setattr(frontdesk.stay_log, "overlap", overlap)
+    rate = frontdesk.analyze_hospital_efficiency("bed_occupancy_rate", ("01-07-2025", "02-07-2025"))
+    assert rate == 100 / frontdesk.TOTAL_BEDS
@@ -0,0 +1,47 @@
+import os
+import threading
+
+from hospital.patient_table import PatientTable
+
+
+def _patient(name, history="Diabetes"):
+    return {"name": name, "personal_info": {"age": 40, "gender": "Female", "blood_type": "O+"},
+            "medical_history": history, "insurance_info": {"company": "Star Health", "policy_no": 1}}
+
+
+def test_updates_reuse_the_arena_slot(tmp_path):
+    path = str(tmp_path / "patients")
+    table = PatientTable(path)
+    table[1] = _patient("Romi")
+    size = os.path.getsize(path + ".arena")
+    record = table[1]
+    for doctor in range(100):
+        record["doctor"] = doctor
+        record["room_type"] = "general room"
+    record["medical_history"] = "Flu"
+    assert os.path.getsize(path + ".arena") == size
+    record["medical_history"] = "x" * 500
+    assert os.path.getsize(path + ".arena") > size
+    table.close()
+    reopened = PatientTable(path)
+    assert reopened[1]["medical_history"] == "x" * 500
+    assert reopened[1]["doctor"] == 99
+    assert reopened[1]["personal_info"] == {"age": 40, "gender": "Female", "blood_type": "O+"}
+
+
+def test_threads_can_add_patients_while_the_files_grow(tmp_path):
+    table = PatientTable(str(tmp_path / "patients"))
+
+    def add(start):
+        for patient_id in range(start, 6000, 4):
+            table[patient_id] = _patient(f"Patient {patient_id}")
+            assert table[patient_id]["name"] == f"Patient {patient_id}"
+
+    threads = [threading.Thread(target=add, args=(start,)) for start in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(table) == 6000
+    assert sorted(table) == list(range(6000))
+    assert table[4321]["name"] == "Patient 4321"
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+SHIFTS = [{"day": day, "shift": "Full Day", "start": "08:00", "end": "20:00", "location": "OPD"}
+          for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")]
+
+
+def _restart_on(module, directory, monkeypatch, day):
+    module.journal.close()
+    module.journal = None
+    module.reset_state()
+    monkeypatch.setattr(module, "today", lambda: day)
+    module.enable_journal(directory)
+
+
+def test_frontdesk_stock_replays_as_it_was_received_and_dispensed(frontdesk, tmp_path, monkeypatch):
+    monkeypatch.setattr(frontdesk, "today", lambda: datetime(2025, 7, 1))
+    frontdesk.enable_journal(tmp_path)
+    frontdesk.register_patient(1, "Romi", {"age": 21}, "Fever", {})
+    frontdesk.add_medical_staff(101, "Dr. Rao", "General Doctor", SHIFTS, 99)
+    frontdesk.schedule_appointment(1, 101, "1-7-2025 9:00", "Consultation")
+    frontdesk.track_medication_inventory("Paracetamol", 10, "10-7-2025", "Acme")
+    frontdesk.track_medication_inventory_bulk([("Paracetamol", 5, "20-7-2025", "Acme")])
+    frontdesk.create_medical_record(1, "Fever", "Rest", [{"medicine": "Paracetamol", "dosage": "500mg",
+                                                          "frequency": "Twice a day", "quantity": 4}], 101)
+    lots = [(lot.quantity, lot.expiry_date) for lot in frontdesk.pharmacy.lots("Paracetamol")]
+    assert lots == [(6, datetime(2025, 7, 10)), (5, datetime(2025, 7, 20))]
+    _restart_on(frontdesk, tmp_path, monkeypatch, datetime(2025, 8, 1))
+    assert [(lot.quantity, lot.expiry_date) for lot in frontdesk.pharmacy.lots("Paracetamol")] == lots
+
+
+def test_core_bills_replay_at_the_prices_of_their_day(core, tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "today", lambda: datetime(2025, 7, 1))
+    core.enable_journal(tmp_path)
+    core.set_tariff("CONSULT", 500)
+    core.set_tariff("CONSULT", 700, effective_from="1-8-2025")
+    core.process_billing("P1", ["CONSULT"], 0.5)
+    _restart_on(core, tmp_path, monkeypatch, datetime(2025, 9, 1))
+    assert core.billings[0].total_cost == 500
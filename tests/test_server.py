@@ -0,0 +1,50 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from hospital.server import Client, RequestError, RequestServer
+
+
+@pytest.fixture
+def address():
+    ops = {"echo": lambda value=None: value, "fail": lambda: 1 / 0}
+    return RequestServer(ops, heavy=("fail",), workers=2).start_in_thread()
+
+
+def _send_raw(address, line):
+    with socket.create_connection(address, timeout=5) as connection:
+        stream = connection.makefile("rwb")
+        stream.write(line + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+@pytest.mark.parametrize("line", [b"[1, 2]", b"3", b"null", b'"op"', b"{not json"])
+def test_requests_that_are_not_objects_get_an_error_reply(address, line):
+    response = _send_raw(address, line)
+    assert response["ok"] is False
+
+
+def test_bad_requests_do_not_stall_the_workers(address):
+    for line in (b"[1, 2]", b"[3, 4]", b'{"op": "echo", "args": [1]}', b'{"op": ["echo"]}'):
+        assert _send_raw(address, line)["ok"] is False
+    assert Client(*address).call("echo", value=5) == (5, [])
+
+
+def test_a_failing_operation_is_reported(address):
+    with pytest.raises(RequestError, match="ZeroDivisionError"):
+        Client(*address).call("fail")
+
+
+def test_operations_do_not_run_on_the_event_loop():
+    gate = threading.Lock()
+    ops = {"blocked": lambda: gate.acquire() and gate.release(), "echo": lambda value=None: value}
+    address = RequestServer(ops, workers=2).start_in_thread()
+    with gate:
+        stuck = threading.Thread(target=lambda: Client(*address).call("blocked"), daemon=True)
+        stuck.start()
+        stuck.join(0.1)
+        assert Client(*address).call("echo", value=1) == (1, [])
+    stuck.join(5)
@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+from hospital.shard import ShardedHospital, shard_of
+
+
+@pytest.fixture
+def hospital(events):
+    with ShardedHospital(2) as sharded:
+        yield sharded
+
+
+def _one_per_shard():
+    ids = {}
+    n = 0
+    while len(ids) < 2:
+        ids.setdefault(shard_of(f"P{n}", 2), f"P{n}")
+        n += 1
+    return ids[0], ids[1]
+
+
+def _register(hospital, *patient_ids):
+    hospital.call_many("register_patient", [(pid, {"name": pid}, [], {}) for pid in patient_ids])
+
+
+def test_a_failure_on_one_shard_keeps_the_other_replies_in_step(hospital):
+    first, second = _one_per_shard()
+    with pytest.raises(AttributeError):
+        hospital.call_many("calculate_treatment_cost", [(first, [], None), (second, [], {})])
+    cost = hospital.call("calculate_treatment_cost", second, [{"name": "X-Ray", "cost": 900}], {})
+    assert cost == {"total": 900, "covered": 0, "due": 900}
+
+
+def test_a_bed_is_never_handed_out_twice_across_shards(hospital):
+    first, second = _one_per_shard()
+    _register(hospital, first, second)
+    hospital.add_room("icu", 1)
+    assert hospital.call_many("assign_room", [(first, "icu", "2030-01-01", 2), (second, "icu", "2030-01-01", 2)]) \
+        == ["icu/1", None]
+    assert hospital.ward_patients("icu") == [first]
+
+
+def test_any_shard_can_use_a_bed_another_shard_freed(hospital):
+    first, second = _one_per_shard()
+    _register(hospital, first, second)
+    hospital.add_room("icu", 1)
+    hospital.call("assign_room", first, "icu", "2030-01-01", 2)
+    hospital.call("manage_discharge_process", first, "2030-01-03", "Rest")
+    assert hospital.call("assign_room", second, "icu", "2030-01-03", 2) == "icu/1"
+
+def test_discharged_patients_leave_the_ward_reports(hospital):
+    first, second = _one_per_shard()
+    _register(hospital, first, second)
+    hospital.add_room("general room", 4)
+    hospital.call_many("assign_room", [(first, "general room", "2030-01-01", 2),
+                                       (second, "general room", "2030-01-01", 2)])
+    hospital.call("manage_discharge_process", first, "2030-01-03", "Rest")
+    out = io.StringIO()
+    hospital.write_ward_reports("general room", out, format="csv")
+    rows = out.getvalue().splitlines()[1:]
+    assert [row.split(",")[1] for row in rows] == [second]
@@ -0,0 +1,55 @@
+import pytest
+
+from hospital.tariff import TariffBook
+
+CARD = "code,name,price,insurer,effective_from\nXRAY,X-Ray,800,,\nXRAY,X-Ray,650,Star Health,01-01-2025\n"
+
+
+def test_an_open_file_is_read_before_it_is_closed(tmp_path):
+    path = tmp_path / "card.csv"
+    path.write_text(CARD)
+    book = TariffBook()
+    with open(path, newline="") as f:
+        book.load(f)
+    assert book.price("XRAY") == 800
+    assert book.price("XRAY", "Star Health", "01-06-2025") == 650
+
+
+def test_a_missing_path_is_refused_at_load(core, tmp_path):
+    core.enable_journal(tmp_path / "journal")
+    core.set_tariff("XRAY", 800)
+    version = core.tariffs.version
+    with pytest.raises(FileNotFoundError):
+        core.load_rate_card(str(tmp_path / "missing.csv"))
+    assert core.tariffs.version == version
+    assert core.tariffs.price("XRAY") == 800
+
+
+def test_a_card_that_breaks_after_load_fails_one_lookup(tmp_path):
+    path = tmp_path / "card.csv"
+    path.write_text(CARD)
+    book = TariffBook([("MRI", "MRI", 4000, None, None)])
+    book.load(path)
+    path.write_text(CARD + "CT,CT,lots,,\n")
+    with pytest.raises(ValueError):
+        book.price("MRI")
+    assert book.price("MRI") == 4000
+
+
+def test_a_bad_card_leaves_the_book_unchanged():
+    book = TariffBook([("XRAY", "X-Ray", 800, None, None)])
+    with pytest.raises(ValueError):
+        book.load(iter([("MRI", "MRI", 4000, None, None), ("CT", "CT", "lots", None, None)]))
+    assert book.version == 1
+    with pytest.raises(KeyError):
+        book.price("MRI")
+
+
+def test_a_generator_card_is_journaled_as_rows(core, tmp_path):
+    core.enable_journal(tmp_path)
+    core.load_rate_card(row for row in [("XRAY", "X-Ray", 800, None, None)])
+    core.journal.close()
+    core.journal = None
+    core.reset_state()
+    core.enable_journal(tmp_path)
+    assert core.tariffs.price("XRAY") == 800
@@ -0,0 +1,60 @@
+import pytest
+
+from hospital.triage import TriageQueue, severity_rank
+
+
+@pytest.mark.parametrize("level", ["Level 2", None, "", True])
+def test_unknown_levels_are_rejected(level):
+    with pytest.raises(ValueError):
+        severity_rank(level)
+
+
+def test_a_rejected_level_keeps_the_patient_waiting():
+    queue = TriageQueue()
+    queue.admit("P1", "low")
+    with pytest.raises(ValueError):
+        queue.reprioritize("P1", "Level 2")
+    assert queue.peek() == ("P1", "low")
+
+
+@pytest.mark.parametrize("level", ["Level 2", None])
+def test_core_records_nothing_for_an_unknown_level(core, level):
+    with pytest.raises(ValueError):
+        core.manage_emergency_admission("P1", "Trauma", level)
+    assert core.emergencies == []
+    assert "P1" not in core.patients
+    assert not core.triage
+
+
+@pytest.mark.parametrize("level", ["Level 2", None])
+def test_frontdesk_records_nothing_for_an_unknown_level(frontdesk, level):
+    with pytest.raises(ValueError):
+        frontdesk.manage_emergency_admission(7, "1-7-2025", "Trauma", level)
+    assert frontdesk.emergency == {}
+    assert 7 not in frontdesk.patient
+    assert not frontdesk.triage
+
+
+@pytest.mark.parametrize("first, second", [("high", 4), (4, "high")])
+def test_a_name_and_a_number_of_the_same_rank_can_follow_each_other(first, second):
+    queue = TriageQueue()
+    queue.admit("p", first)
+    queue.reprioritize("p", second)
+    queue.admit("q", "critical")
+    assert queue.pop_next() == ("q", "critical")
+    assert queue.pop_next() == ("p", second)
+    assert not queue
+
+
+def test_core_reprioritises_a_repeat_admission_given_as_a_number(core):
+    core.manage_emergency_admission("P1", "Trauma", "high")
+    core.manage_emergency_admission("P1", "Trauma", 4)
+    assert core.next_emergency() == "P1"
+    assert not core.triage
+
+
+def test_frontdesk_reprioritises_between_a_name_and_a_number(frontdesk, monkeypatch):
+    monkeypatch.setattr(frontdesk.beds, "allocate_first", lambda *args: None)  # no free bed, so they wait
+    frontdesk.manage_emergency_admission(7, "1-7-2025", "Trauma", "high")
+    frontdesk.reprioritize_emergency(7, 4)
+    assert frontdesk.triage.peek() == (7, 4)